@@ -0,0 +1,116 @@
+import math
+import threading
+import time
+from collections import deque
+
+
+# 自适应并发控制器
+class AdaptiveController:
+    """
+    按近期请求的 p95 延迟和限流/服务端错误率动态调整并发数和请求间隔（AIMD）：
+    一个调整周期内 p95 与错误率都在阈值内时并发数加 increase、间隔按 0.8 倍缩短；
+    任一超出阈值时并发数乘以 decrease、间隔加倍。并发数和间隔始终限制在配置范围内
+
+    用法：每次请求前调用 acquire()（占用并发名额并按间隔排队），请求结束后调用 release(latency, throttled)
+    """
+
+    def __init__(self, min_concurrency=1, max_concurrency=10, initial_concurrency=None, target_p95=3.0,
+                 max_error_rate=0.05, min_delay=0.5, max_delay=10.0, initial_delay=0.5, window=50,
+                 adjust_interval=5.0, increase=1, decrease=0.5):
+        """
+        :param min_concurrency: 并发数下限
+        :param max_concurrency: 并发数上限
+        :param initial_concurrency: 初始并发数（默认为下限）
+        :param target_p95: 目标 p95 延迟（秒），超出视为过载
+        :param max_error_rate: 允许的限流（429）/服务端错误（5xx、超时）比例，超出视为过载
+        :param min_delay: 相邻请求的最小间隔（秒）
+        :param max_delay: 相邻请求的最大间隔（秒）
+        :param initial_delay: 初始请求间隔（秒）
+        :param window: 统计 p95 和错误率的最近请求数
+        :param adjust_interval: 两次调整之间的最短时间（秒）
+        :param increase: 每次加性增加的并发数
+        :param decrease: 过载时并发数的乘性减少系数
+        """
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.limit = min(max(initial_concurrency or self.min_concurrency, self.min_concurrency), self.max_concurrency)
+        self.target_p95 = target_p95
+        self.max_error_rate = max_error_rate
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.delay = min(max(initial_delay, min_delay), max_delay)
+        self.adjust_interval = adjust_interval
+        self.increase = increase
+        self.decrease = decrease
+        self.samples = deque(maxlen=window)  # (延迟, 是否限流/服务端错误)
+        self.in_flight = 0
+        self.adjustments = 0  # 调整次数
+        self._condition = threading.Condition()
+        self._next_start = time.monotonic()  # 下一个请求最早的开始时间
+        self._last_adjust = time.monotonic()
+        self._new_samples = 0  # 上次调整后新增的样本数
+
+    def acquire(self):
+        """等待并发名额，再按当前请求间隔排队到自己的开始时间"""
+        with self._condition:
+            while self.in_flight >= self.limit:
+                self._condition.wait()
+            self.in_flight += 1
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.delay
+        if start > now:
+            time.sleep(start - now)
+
+    def release(self, latency, throttled=False):
+        """
+        归还并发名额并记录本次请求结果
+        :param latency: 请求耗时（秒）
+        :param throttled: 是否为限流（429）、服务端错误（5xx）或超时
+        """
+        with self._condition:
+            self.in_flight -= 1
+            self.samples.append((latency, throttled))
+            self._new_samples += 1
+            self._maybe_adjust()
+            self._condition.notify_all()
+
+    def p95(self):
+        """窗口内请求延迟的 p95（秒）"""
+        latencies = sorted(latency for latency, _ in self.samples)
+        if not latencies:
+            return 0.0
+        return latencies[math.ceil(0.95 * len(latencies)) - 1]
+
+    def error_rate(self):
+        """窗口内限流/服务端错误的比例"""
+        if not self.samples:
+            return 0.0
+        return sum(1 for _, throttled in self.samples if throttled) / len(self.samples)
+
+    def _maybe_adjust(self):
+        """到达调整周期且有足够新样本时按 AIMD 调整（调用方需持有锁）"""
+        now = time.monotonic()
+        if now - self._last_adjust < self.adjust_interval or self._new_samples < self.limit:
+            return
+        self._last_adjust = now
+        self._new_samples = 0
+        self.adjustments += 1
+        if self.error_rate() > self.max_error_rate or self.p95() > self.target_p95:
+            self.limit = max(self.min_concurrency, math.floor(self.limit * self.decrease))
+            self.delay = min(self.max_delay, max(self.delay * 2, 0.1))
+        else:
+            self.limit = min(self.max_concurrency, self.limit + self.increase)
+            self.delay = max(self.min_delay, self.delay * 0.8)
+
+    def snapshot(self):
+        """当前控制状态"""
+        with self._condition:
+            return {
+                'concurrency': self.limit,
+                'delay': self.delay,
+                'in_flight': self.in_flight,
+                'p95': self.p95(),
+                'error_rate': self.error_rate(),
+                'adjustments': self.adjustments,
+            }
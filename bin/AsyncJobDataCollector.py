@@ -0,0 +1,269 @@
+import asyncio
+import json
+import time
+
+try:
+    import aiohttp
+except ImportError:  # 未安装 aiohttp 时只能使用多线程采集器
+    aiohttp = None
+
+from bin.JobDataCollector import JobDataCollector, TRANSIENT_STATUS
+
+
+# 令牌桶限速器
+class TokenBucket:
+    """
+    全局令牌桶：以 rate 个/秒的速度补充令牌，最多积攒 capacity 个，每个请求消耗一个令牌
+    rate <= 0 表示不限速
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate: 每秒补充的令牌数（即平均每秒请求数）
+        :param capacity: 桶容量（允许的突发请求数），默认与 rate 相同且不小于 1
+        """
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """取得一个令牌，令牌不足时等待"""
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# 异步数据获取模块
+class AsyncJobDataCollector(JobDataCollector):
+    """
+    基于 asyncio + aiohttp 的职位采集器：所有职位共享一个保持长连接的连接池，
+    全局最多 concurrency 个页面同时请求，并由令牌桶统一限速（取代每个线程各自 sleep）。
+    输出格式、去重逻辑与 JobDataCollector 相同
+    """
+
+    def __init__(self, output_file='jobs_data.jsonl', city_code='736', concurrency=8, rate=2.0,
+                 burst=None, prefetch_pages=2, timeout=10, base_url=None, max_retries=3, backoff_base=1.0,
+                 backoff_max=30.0, checkpoint_file=None, writer_batch_size=50, writer_buffer_size=1 << 20,
+                 fsync_interval=5.0, storage='jsonl', segment_records=5000, codec='auto', metrics=None):
+        """
+        :param output_file: 输出文件名
+        :param city_code: 城市代码(默认736)
+        :param concurrency: 全局同时请求的页面数上限
+        :param rate: 全局限速（每秒请求数），<= 0 表示不限速
+        :param burst: 令牌桶容量（允许的突发请求数）
+        :param prefetch_pages: 响应中没有总条数时每个职位预取的页数（同一职位最多同时请求的页面数）
+        :param timeout: 单次请求超时时间（秒）
+        :param base_url: 职位搜索接口地址（默认 API_URL，测试时可指向本地桩服务）
+        :param max_retries: 临时错误的最大重试次数
+        :param backoff_base: 指数退避基数（秒）
+        :param backoff_max: 单次退避等待上限（秒）
+        :param checkpoint_file: 断点文件路径（默认为 输出文件名.checkpoint.json）
+        :param writer_batch_size: 写入线程每批最多合并的页数
+        :param writer_buffer_size: 输出文件写缓冲区大小（字节）
+        :param fsync_interval: 输出文件 fsync 间隔（秒）
+        :param storage: 输出格式 jsonl / segments（压缩分段）
+        :param segment_records: segments 格式下每个分段的记录数
+        :param codec: segments 格式的压缩方式 gzip / zstd / auto
+        :param metrics: 采集指标配置（CrawlerMetrics 参数）
+        """
+        if aiohttp is None:
+            raise ImportError("异步采集需要安装 aiohttp：pip install aiohttp")
+        super().__init__(output_file=output_file, city_code=city_code, max_workers=concurrency,
+                         base_url=base_url, max_retries=max_retries, backoff_base=backoff_base,
+                         backoff_max=backoff_max, timeout=timeout, checkpoint_file=checkpoint_file,
+                         writer_batch_size=writer_batch_size, writer_buffer_size=writer_buffer_size,
+                         fsync_interval=fsync_interval, storage=storage, segment_records=segment_records,
+                         codec=codec, metrics=metrics)
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.prefetch_pages = max(1, prefetch_pages)
+        # 单元（城市:职位） -> {'pages': 已爬页数, 'count': 已爬条数, 'total_pages': 总页数（未知为 None）,
+        #         'end_page': 总页数未知时首个空页页码, 'failed': 是否出错, 'started': 本轮是否需要爬取,
+        #         'done_pages': 总页数未知时上次运行已完成的页码}
+        self.title_state = {}
+
+    async def _post_with_retry_async(self, session, city, title, page):
+        """
+        请求单页数据，超时、连接错误及 429/5xx 按指数退避重试
+        :return: 响应 JSON
+        :raises aiohttp.ClientError | asyncio.TimeoutError: 非临时错误，或重试次数用尽
+        """
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                async with session.post(self.api_url, json=self._page_payload(city, title, page)) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+                data = json.loads(body)
+                self._record_request(time.perf_counter() - start, nbytes=len(body))
+                return data
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                status = getattr(e, 'status', None)
+                transient = status in TRANSIENT_STATUS if isinstance(e, aiohttp.ClientResponseError) else True
+                retry = transient and attempt < self.max_retries
+                self._record_request(time.perf_counter() - start, failed=True, retried=retry)
+                if not retry:
+                    raise
+                headers = getattr(e, 'headers', None) or {}
+                delay = self._backoff_delay(attempt, headers.get('Retry-After'))
+                print(f"请求异常（{self._cell_key(city, title)} 第 {page} 页）：{str(e)}，{delay:.1f} 秒后重试"
+                      f"({attempt + 1}/{self.max_retries})")
+                await asyncio.sleep(delay)
+
+    async def _fetch_page_async(self, session, city, title, page):
+        """
+        获取单页数据
+        :return: (职位信息列表, 总页数)；该页确实没有数据时列表为 None，响应中没有总条数时总页数为 None
+        :raises aiohttp.ClientError | asyncio.TimeoutError: 重试后仍失败
+        """
+        data = await self._post_with_retry_async(session, city, title, page)
+        return self._parse_page(data, title)
+
+    async def _page_worker(self, session, queue, limiter):
+        """
+        从队列中取 (城市, 职位, 页码) 任务执行：第一页得到总页数后把其余页全部加入队列；
+        总页数未知时按 prefetch_pages 逐步预取后续页，直到遇到空页
+        """
+        while True:
+            city, title, page = await queue.get()
+            key = self._cell_key(city, title)
+            try:
+                state = self.title_state[key]
+                # 已知该单元在更早的页就没有数据了，跳过预取的多余页
+                if state['end_page'] is not None and page > state['end_page']:
+                    continue
+                if page in state['done_pages']:
+                    # 上次运行中已完成的页不再请求，只继续预取后续页
+                    queue.put_nowait((city, title, page + self.prefetch_pages))
+                    continue
+                await limiter.acquire()
+                job_infos, total_pages = await self._fetch_page_async(session, city, title, page)
+                if page == 1 and total_pages:
+                    state['total_pages'] = total_pages
+                    self._set_total_pages(key, total_pages)
+                    for next_page in range(2, total_pages + 1):
+                        queue.put_nowait((city, title, next_page))
+                if not job_infos:
+                    if state['total_pages'] is None:
+                        if state['end_page'] is None or page < state['end_page']:
+                            state['end_page'] = page
+                        continue
+                    job_infos = []  # 总页数范围内的空页（总条数在爬取期间减少）同样记为已完成
+
+                # 交给写入线程保存，数据写入后再记录断点
+                state['pages'] += 1
+                state['count'] += len(job_infos)
+                self.metrics.observe_page(key, len(job_infos))
+                self._save_unique_jobs(job_infos, on_written=lambda _, k=key, p=page, c=len(job_infos):
+                                       self.checkpoint.mark_page(k, p, c))
+                print(f"正在爬取 {key} 第 {page} 页，获取 {len(job_infos)} 条，累计 {state['count']} 条")
+
+                if state['total_pages'] is None:
+                    next_pages = range(2, 2 + self.prefetch_pages) if page == 1 else [page + self.prefetch_pages]
+                    for next_page in next_pages:
+                        if state['end_page'] is None or next_page < state['end_page']:
+                            queue.put_nowait((city, title, next_page))
+            except Exception as e:
+                # 请求失败不视为该单元已爬完，记为失败单元
+                print(f"处理 {key} 第 {page} 页时发生异常: {str(e)}")
+                self.title_state[key]['failed'] = True
+            finally:
+                queue.task_done()
+
+    async def collect_jobs_async(self, cells):
+        """
+        异步爬取 (城市, 职位) 单元
+        :param cells: (城市代码, 职位名称) 列表
+        :return: 失败的单元数
+        """
+        queue = asyncio.Queue()
+        for city, title in cells:
+            key = self._cell_key(city, title)
+            progress = self.checkpoint.get(key)
+            done_pages = progress['pages']
+            self.title_state[key] = {'pages': len(done_pages), 'count': progress['count'], 'end_page': None,
+                                     'total_pages': progress['total_pages'] if 1 in done_pages else None,
+                                     'failed': False, 'started': not progress['done'], 'done_pages': set()}
+            if progress['done']:
+                print(f"\n{key} 已在上次运行中爬完（{len(done_pages)} 页，{progress['count']} 条），跳过")
+                continue
+            total_pages = self.title_state[key]['total_pages']
+            if total_pages:
+                # 总页数已知，只补爬未完成的页
+                print(f"\n从断点继续爬取: {key}（已完成 {len(done_pages)}/{total_pages} 页）")
+                pages = [page for page in range(2, total_pages + 1) if page not in done_pages]
+            elif done_pages:
+                # 总页数未知，从第一个未完成的页继续预取，已完成的页跳过
+                first_page = self._first_missing_page(done_pages)
+                print(f"\n从第 {first_page} 页继续爬取: {key}")
+                self.title_state[key]['done_pages'] = done_pages
+                pages = range(first_page, first_page + self.prefetch_pages)
+            else:
+                print(f"\n开始爬取: {key}")
+                pages = [1]
+            for page in pages:
+                queue.put_nowait((city, title, page))
+
+        limiter = TokenBucket(self.rate, self.burst)
+        connector = aiohttp.TCPConnector(limit=self.concurrency, keepalive_timeout=30)
+        async with aiohttp.ClientSession(connector=connector, headers=self.HEADERS,
+                                         timeout=aiohttp.ClientTimeout(total=self.timeout)) as session:
+            workers = [asyncio.create_task(self._page_worker(session, queue, limiter))
+                       for _ in range(self.concurrency)]
+            await queue.join()
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+        failed = 0
+        for city, title in cells:
+            key = self._cell_key(city, title)
+            state = self.title_state[key]
+            if not state['started']:
+                continue  # 上次运行中已爬完，本轮未请求
+            print(f"{key} 共爬取 {state['pages']} 页，{state['count']} 条数据")
+            if state['failed']:
+                failed += 1
+                self.metrics.finish_cell(key, failed=True)
+            else:
+                self._mark_done(key)
+        self.stats['failed_jobs'] += failed
+        return failed
+
+    def collect_jobs(self, job_titles, city_codes=None):
+        """
+        异步爬取 城市 × 职位 的全部单元（同步入口，与 JobDataCollector.collect_jobs 接口一致）。
+        所有单元的页面共用一个任务队列，由令牌桶统一限速
+
+        :param job_titles: 职位名称列表
+        :param city_codes: 城市代码列表（默认只爬取 city_code）
+        """
+        print("===== 开始爬取数据 =====")
+        cells = [(str(city), title) for city in (city_codes or [self.city_code]) for title in job_titles]
+        self.stats['total_jobs'] = len(cells)
+        self.stats['start_time'] = time.time()
+        self.metrics.reset()
+        self.metrics.start()
+
+        self._start_writer()
+        try:
+            failed = asyncio.run(self.collect_jobs_async(cells))
+        finally:
+            written = self._stop_writer()
+        self.existing_jobs.save()
+        self._finish_checkpoint(failed, written)
+        self.metrics.stop()
+
+        # 打印统计信息
+        self._print_stats()
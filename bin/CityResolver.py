@@ -0,0 +1,189 @@
+import re
+
+# 无效的工作地点（不参与地区统计）
+INVALID_LOCATIONS = {'全国', '其他'}
+
+# 城市映射文件的一行："石家庄市": "河北省",（个别行缺少引号也能识别）
+_MAPPING_LINE = re.compile(r'^\s*"?([^":]+?)"?\s*:\s*"?([^":,]+?)"?\s*,?\s*$')
+
+# 省级行政区名称的后缀，去掉后作为简称（如 "广西壮族自治区" -> "广西"）
+_PROVINCE_SUFFIX = re.compile(r'(省|市|特别行政区|壮族自治区|回族自治区|维吾尔自治区|自治区)$')
+
+# 城市名称的后缀，去掉后作为简称（如 "广州市" -> "广州"、"兴安盟" -> "兴安"）
+_CITY_SUFFIX = re.compile(r'(市|地区|盟|自治州)$')
+
+# 原始工作地点中城市与区县之间的分隔符（"广州-天河区"、"杭州·西湖"）
+_SEPARATORS = {'-', '·', ' '}
+
+_AMBIGUOUS = object()  # 子树中含有多个省份
+_MISSING = object()
+
+
+def normalize_location(location):
+    """
+    将工作地点统一为城市名（去除"-区县"、"·区县"后缀），入库时写入 job_listings.city 列
+    :param location: 原始工作地点
+    :return: 城市名；外国数据、'全国'、'其他' 及空值返回 None
+    """
+    if not location:
+        return None
+    if '-' in location:
+        location = location.split('-')[0]
+    elif '·' in location:
+        location = location.split('·')[0]
+    # 过滤掉外国数据、'全国' 和 '其他' 数据
+    if not location or location.lower() == 'nan' or location in INVALID_LOCATIONS:
+        return None
+    return location
+
+
+class _TrieNode:
+    __slots__ = ('children', 'province', 'subtree')
+
+    def __init__(self):
+        self.children = {}
+        self.province = None  # 以该节点结尾的名称对应的省份
+        self.subtree = None  # 子树中所有名称对应的唯一省份，不唯一时为 _AMBIGUOUS
+
+
+# 城市 -> 省份解析器
+class CityResolver:
+    """
+    以字符前缀树保存 城市/地区名称（含去掉"市""地区"等后缀的简称） -> 省份 的映射，
+    对原始工作地点（如 "广州-天河区"、"哈尔滨·南岗"）做最长前缀匹配；地点本身是某些名称的前缀（被截断的名称，如 "哈尔"、"石家"、"克孜勒苏柯尔克孜"）
+    且这些名称属于同一省份时也能解析，无需手工维护截断前缀。解析结果按地点缓存
+    """
+
+    def __init__(self, mapping=None, min_prefix=2):
+        """
+        :param mapping: {名称: 省份}
+        :param min_prefix: 按截断名称解析时地点的最少字数
+        """
+        self.root = _TrieNode()
+        self.min_prefix = min_prefix
+        self.entries = {}  # 名称 -> 省份（已加入前缀树的全部映射）
+        self._cache = {}  # 地点 -> 省份（解析缓存）
+        self.hits = 0
+        self.misses = 0
+        for name, province in (mapping or {}).items():
+            self.add(name, province)
+
+    @classmethod
+    def from_file(cls, mapping_file, overrides=None, min_prefix=2):
+        """
+        从城市映射文件加载，再叠加手工映射
+        :param mapping_file: 城市映射文件（每行 "城市": "省份",）
+        :param overrides: 补充或覆盖的 {名称: 省份}（如县级市）
+        :param min_prefix: 按截断名称解析时地点的最少字数
+        """
+        resolver = cls(min_prefix=min_prefix)
+        resolver.load_file(mapping_file)
+        for name, province in (overrides or {}).items():
+            resolver.add(name, province)
+        return resolver
+
+    def load_file(self, mapping_file):
+        """
+        读取城市映射文件；城市的简称（"广州" -> "广东省"）、省份名称及其简称（"广东" -> "广东省"）也加入映射，
+        简称与已有名称冲突时保留已有映射
+        :return: 读取的映射条数
+        """
+        count = 0
+        with open(mapping_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = _MAPPING_LINE.match(line)
+                if not match:
+                    continue
+                name, province = match.group(1).strip(), match.group(2).strip()
+                self.add(name, province)
+                count += 1
+        aliases = [(_CITY_SUFFIX.sub('', name), province) for name, province in self.entries.items()]
+        for province in set(self.entries.values()):
+            self.add(province, province)
+            aliases.append((_PROVINCE_SUFFIX.sub('', province), province))
+        for short_name, province in aliases:
+            if len(short_name) >= self.min_prefix and short_name not in self.entries:
+                self.add(short_name, province)
+        return count
+
+    def add(self, name, province):
+        """加入（或覆盖）一条 名称 -> 省份 映射"""
+        name = name.strip()
+        if not name:
+            return
+        replaced = self.entries.get(name)
+        self.entries[name] = province
+        self._cache.clear()
+        if replaced is not None and replaced != province:
+            self._rebuild()  # 覆盖已有名称时重建，保证子树省份正确
+            return
+        node = self.root
+        for char in name:
+            node = node.children.setdefault(char, _TrieNode())
+            if node.subtree is None:
+                node.subtree = province
+            elif node.subtree != province:
+                node.subtree = _AMBIGUOUS
+        node.province = province
+
+    def _rebuild(self):
+        entries = self.entries
+        self.root = _TrieNode()
+        self.entries = {}
+        for name, province in entries.items():
+            self.add(name, province)
+
+    def _lookup(self, location):
+        node = self.root
+        best = None  # 最长的、作为地点前缀的名称对应的省份
+        depth = 0
+        for char in location:
+            if char in _SEPARATORS:
+                break  # 分隔符之前为城市名
+            child = node.children.get(char)
+            if child is None:
+                return best
+            node = child
+            depth += 1
+            if node.province is not None:
+                best = node.province
+        # 地点（或分隔符前的城市名）完整落在前缀树内：按截断名称处理，子树只属于一个省份时取该省份
+        if node.province is None and depth >= self.min_prefix and node.subtree is not _AMBIGUOUS:
+            return node.subtree
+        return best
+
+    def resolve(self, location):
+        """
+        解析工作地点所属省份
+        :param location: 原始工作地点
+        :return: 省份名称，无法解析时为 None
+        """
+        if not location:
+            return None
+        province = self._cache.get(location, _MISSING)
+        if province is not _MISSING:
+            self.hits += 1
+            return province
+        self.misses += 1
+        province = self._lookup(location.strip())
+        self._cache[location] = province
+        return province
+
+    def resolve_many(self, locations):
+        """
+        批量解析工作地点
+        :param locations: 工作地点的可迭代对象
+        :return: 省份列表（与输入一一对应，无法解析的为 None）
+        """
+        return [self.resolve(location) for location in locations]
+
+    def stats(self):
+        """映射条数及缓存命中统计"""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self.entries),
+            'cached': len(self._cache),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+        }
@@ -3,6 +3,7 @@ from pathlib import Path
 import logging
 from logging.handlers import TimedRotatingFileHandler
 import os
+import threading
 from datetime import datetime
 from typing import Dict, List, Any
 
@@ -23,6 +24,13 @@ class ConfigLoader:
         self.global_db_config = self.config.get('database', {})  # 全局数据库配置（字典）
         self.module_db_config = self.config.get('data_analyzer', {}).get('database', {})  # 模块级数据库配置（字典）
         self.db_config = {**self.global_db_config, **self.module_db_config}  # 合并后的字典
+        # 数据库连接池配置（分析模块和 GUI 共享同一个连接池，首次使用时创建）
+        self.db_pool_config: Dict[str, Any] = self.config.get('db_pool', {})
+        self._db_pool = None
+        self._shared_lock = threading.Lock()  # 连接池、城市解析器等共享对象的创建锁
+        # 城市 -> 省份解析配置（入库和分析共享同一个解析器，首次使用时加载）
+        self.city_resolver_config: Dict[str, Any] = self.config.get('city_resolver', {})
+        self._city_resolver = None
         # 职位列表
         self.positions: List[str] = self.config.get('positions', [])
 
@@ -41,6 +49,12 @@ class ConfigLoader:
         # 数据文件路径配置
         self.data_files: Dict[str, Any] = self.config.get('data_files', {})
 
+        # 数据采集配置
+        self.collector_config: Dict[str, Any] = self.config.get('collector', {})
+
+        # 数据存储配置
+        self.storage_config: Dict[str, Any] = self.config.get('data_storage', {})
+
         # 确保日志目录存在
         self._ensure_log_dir_exists()
 
@@ -110,7 +124,11 @@ class ConfigLoader:
         Returns:
             对应年份的文件路径列表，不存在时返回空列表
         """
-        return self.data_files.get(str(year), [])
+        # YAML 中的数字年份键会被解析为 int，需同时兼容两种键类型
+        files = self.data_files.get(str(year))
+        if files is None and str(year).isdigit():
+            files = self.data_files.get(int(year))
+        return files if files is not None else []
 
     def get_image_path(self, chart_type: str, year: int or str) -> str:
         """
@@ -128,4 +146,58 @@ class ConfigLoader:
     def get_analyzer_config(self, key: str = None) -> Dict[str, Any]:
         """获取数据分析模块的配置（支持键值获取或全部获取）"""
         analyzer_config = self.config.get('data_analyzer', {})
-        return analyzer_config[key] if key else analyzer_config
\ No newline at end of file
+        return analyzer_config[key] if key else analyzer_config
+
+    def get_db_pool(self):
+        """
+        获取共享的数据库连接池（首次调用时按 db_config 和 db_pool 配置创建）
+
+        Returns:
+            ConnectionPool 实例
+        """
+        with self._shared_lock:
+            if self._db_pool is None:
+                from bin.ConnectionPool import ConnectionPool  # 延迟导入，不使用数据库时无需 pymysql
+                connect_params = {
+                    'host': self.db_config.get('host', 'localhost'),
+                    'user': self.db_config.get('user', ''),
+                    'password': self.db_config.get('password', ''),
+                    'database': self.db_config.get('database', ''),
+                    'charset': self.db_config.get('charset', 'utf8mb4'),
+                }
+                if 'port' in self.db_config:
+                    connect_params['port'] = int(self.db_config['port'])
+                self._db_pool = ConnectionPool(
+                    connect_params,
+                    max_size=self.db_pool_config.get('max_size', 5),
+                    max_idle_time=self.db_pool_config.get('max_idle_time', 300),
+                    health_check_interval=self.db_pool_config.get('health_check_interval', 30),
+                    acquire_timeout=self.db_pool_config.get('acquire_timeout', 30)
+                )
+            return self._db_pool
+
+    def close_db_pool(self) -> None:
+        """关闭共享的数据库连接池（程序退出前调用）"""
+        with self._shared_lock:
+            if self._db_pool is not None:
+                self._db_pool.close()
+                self._db_pool = None
+
+    def get_city_resolver(self):
+        """
+        获取共享的城市 -> 省份解析器（首次调用时加载城市映射文件和 overrides）
+
+        Returns:
+            CityResolver 实例
+        """
+        with self._shared_lock:
+            if self._city_resolver is None:
+                from bin.CityResolver import CityResolver
+                mapping_file = self.city_resolver_config.get('mapping_file', 'scripts/城市映射.csv')
+                overrides = self.city_resolver_config.get('overrides') or {}
+                try:
+                    self._city_resolver = CityResolver.from_file(mapping_file, overrides=overrides)
+                except OSError as e:
+                    print(f"警告：城市映射文件 {mapping_file} 读取失败 ({e})，仅使用 overrides")
+                    self._city_resolver = CityResolver(overrides)
+            return self._city_resolver
@@ -0,0 +1,157 @@
+import threading
+import time
+
+import pymysql
+
+
+# 连接池中取出的连接
+class PooledConnection:
+    """
+    包装从连接池取出的 pymysql 连接，属性和方法均转发给原连接；
+    close() 不真正断开，而是把连接归还连接池，原有的 try/finally: connection.close() 写法无需修改
+    """
+
+    def __init__(self, pool, connection):
+        self._pool = pool
+        self._connection = connection
+
+    def __getattr__(self, name):
+        if self._connection is None:
+            raise pymysql.InterfaceError("连接已归还连接池")
+        return getattr(self._connection, name)
+
+    def close(self):
+        """归还连接池（重复调用无影响）"""
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            self._pool.release(connection)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+# 数据库连接池
+class ConnectionPool:
+    """
+    线程安全的 pymysql 连接池：最多同时存在 max_size 个连接，用尽时等待其他线程归还。
+    取出时对空闲超过 health_check_interval 秒的连接先 ping 检查，失效的直接丢弃并换一个；
+    空闲超过 max_idle_time 秒的连接在取出/归还时被关闭（避免被服务端 wait_timeout 断开后才发现）。
+    归还时回滚未提交的事务，下次取出时读到的是最新数据
+    """
+
+    def __init__(self, connect_params, max_size=5, max_idle_time=300, health_check_interval=30,
+                 acquire_timeout=30):
+        """
+        :param connect_params: pymysql.connect 的参数
+        :param max_size: 最大连接数
+        :param max_idle_time: 空闲连接的最长保留时间（秒），0 表示不淘汰
+        :param health_check_interval: 连接空闲超过该秒数时，取出前先 ping 检查（0 表示每次都检查）
+        :param acquire_timeout: 连接用尽时的最长等待时间（秒），None 表示一直等待
+        """
+        self.connect_params = connect_params
+        self.max_size = max(1, int(max_size))
+        self.max_idle_time = max_idle_time
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+        self.size = 0  # 已创建且未关闭的连接数（含已取出的）
+        self.stats = {'created': 0, 'reused': 0, 'discarded': 0, 'evicted': 0}
+        self._idle = []  # [(连接, 归还时间)]，按归还时间升序，取出时优先用最近归还的
+        self._closed = False
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    def _discard(self, connection, reason='discarded'):
+        """关闭连接并释放名额（调用方需持有锁）"""
+        try:
+            connection.close()
+        except pymysql.Error:
+            pass
+        self.size -= 1
+        self.stats[reason] += 1
+        self._available.notify()
+
+    def _evict_idle(self):
+        """关闭空闲过久的连接（调用方需持有锁）"""
+        if not self.max_idle_time:
+            return
+        deadline = time.monotonic() - self.max_idle_time
+        while self._idle and self._idle[0][1] < deadline:
+            connection, _ = self._idle.pop(0)
+            self._discard(connection, 'evicted')
+
+    def get_connection(self, timeout=None):
+        """
+        取出一个连接
+        :param timeout: 连接用尽时的最长等待时间（秒），默认使用 acquire_timeout
+        :return: PooledConnection，用完调用 close() 归还
+        :raises pymysql.OperationalError: 连接池已关闭、等待超时或无法建立新连接
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                while True:
+                    if self._closed:
+                        raise pymysql.OperationalError("数据库连接池已关闭")
+                    self._evict_idle()
+                    if self._idle:
+                        connection, released = self._idle.pop()
+                        break
+                    if self.size < self.max_size:
+                        self.size += 1
+                        connection, released = None, None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise pymysql.OperationalError(f"等待数据库连接超时（{timeout} 秒）")
+                    self._available.wait(remaining)
+
+            if connection is None:
+                try:
+                    connection = pymysql.connect(**self.connect_params)
+                except Exception:
+                    with self._lock:
+                        self.size -= 1
+                        self._available.notify()
+                    raise
+                with self._lock:
+                    self.stats['created'] += 1
+                return PooledConnection(self, connection)
+
+            if time.monotonic() - released >= self.health_check_interval:
+                try:
+                    connection.ping(reconnect=False)
+                except Exception:
+                    with self._lock:
+                        self._discard(connection)
+                    continue
+            with self._lock:
+                self.stats['reused'] += 1
+            return PooledConnection(self, connection)
+
+    def release(self, connection):
+        """归还连接（由 PooledConnection.close 调用）"""
+        try:
+            connection.rollback()  # 结束未提交的事务，失败说明连接已不可用
+            healthy = True
+        except Exception:
+            healthy = False
+        with self._lock:
+            if not healthy or self._closed:
+                self._discard(connection)
+                return
+            self._idle.append((connection, time.monotonic()))
+            self._evict_idle()
+            self._available.notify()
+
+    def close(self):
+        """关闭所有空闲连接，之后不能再取出（已取出的连接归还时关闭）"""
+        with self._lock:
+            self._closed = True
+            while self._idle:
+                connection, _ = self._idle.pop()
+                self._discard(connection)
+            self._available.notify_all()
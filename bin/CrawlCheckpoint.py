@@ -0,0 +1,153 @@
+import json
+import os
+import threading
+
+
+# 爬取断点记录
+class CrawlCheckpoint:
+    """
+    按 (城市, 职位) 单元记录已完成的页码集合、总页数和累计条数，采集中断后重新运行 collect_jobs
+    可从断点继续，只请求尚未完成的页面（页面可乱序完成）。
+
+    断点由两部分组成：快照文件（JSON，结构为 {"城市代码:职位": {"pages": [已完成页码], "total_pages": 总页数（未知为 null），
+    "count": 累计条数, "done": 是否已爬完}}）和追加写入的日志文件（快照文件名.journal，每行一条变更）。
+    每完成一页只向日志追加一行，开销与已完成的页数无关；加载时把日志合并进快照（compact），
+    整轮采集结束时也会合并一次
+    """
+
+    def __init__(self, checkpoint_file, legacy_city=None):
+        """
+        :param checkpoint_file: 断点文件路径
+        :param legacy_city: 旧格式断点（只按职位记录）所属的城市代码，读取时转换为该城市的单元
+        """
+        self.checkpoint_file = checkpoint_file
+        self.journal_file = f"{checkpoint_file}.journal"
+        self.legacy_city = legacy_city
+        self.lock = threading.Lock()
+        self._journal = None  # 日志文件句柄（首次写入时打开）
+        self.entries = {}
+        self._load()
+        if os.path.exists(self.journal_file):
+            self.compact()
+
+    @staticmethod
+    def _new_entry():
+        return {'pages': set(), 'total_pages': None, 'count': 0, 'done': False}
+
+    def _load(self):
+        """读取快照文件并重放日志，不存在或损坏时从头开始"""
+        try:
+            with open(self.checkpoint_file, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            entries = {}
+        except ValueError as e:
+            print(f"断点文件解析失败，将从头开始爬取: {e}")
+            entries = {}
+        converted = {}
+        for key, entry in entries.items():
+            if 'last_page' in entry:
+                # 旧格式只记录连续完成的最后一页
+                entry = {'pages': list(range(1, entry['last_page'] + 1)), 'total_pages': None,
+                         'count': entry.get('count', 0), 'done': entry.get('done', False)}
+            if ':' not in key and self.legacy_city is not None:
+                key = f"{self.legacy_city}:{key}"
+            converted[key] = dict(entry, pages=set(entry['pages']))
+        self.entries = converted
+        self._replay()
+
+    def _replay(self):
+        """把日志中的变更应用到内存中的断点（末尾写了一半的行忽略）"""
+        try:
+            f = open(self.journal_file, 'r', encoding='utf-8')
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    continue
+                self._apply(change)
+
+    def _apply(self, change):
+        """应用一条变更：{"k": 单元, "p": 页码, "c": 条数} / {"k", "t": 总页数} / {"k", "d": 1}"""
+        entry = self.entries.setdefault(change['k'], self._new_entry())
+        if 'p' in change:
+            # 页码已记录时不重复累加条数（合并中断后重放日志仍然正确）
+            if change['p'] not in entry['pages']:
+                entry['pages'].add(change['p'])
+                entry['count'] += change.get('c', 0)
+        if 't' in change:
+            entry['total_pages'] = change['t']
+        if change.get('d'):
+            entry['done'] = True
+
+    def _log(self, change):
+        """应用变更并追加到日志（调用方需持有锁）"""
+        self._apply(change)
+        if self._journal is None:
+            self._journal = open(self.journal_file, 'a', encoding='utf-8')
+        self._journal.write(json.dumps(change, ensure_ascii=False) + '\n')
+        self._journal.flush()
+
+    def _close_journal(self):
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+
+    def compact(self):
+        """把当前断点原子写入快照文件并清空日志"""
+        with self.lock:
+            self._close_journal()
+            tmp_file = f"{self.checkpoint_file}.tmp"
+            data = {key: dict(entry, pages=sorted(entry['pages'])) for key, entry in self.entries.items()}
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_file, self.checkpoint_file)
+            if os.path.exists(self.journal_file):
+                os.remove(self.journal_file)
+
+    def get(self, key):
+        """
+        获取单元的断点
+        :return: {"pages": 已完成页码集合, "total_pages", "count", "done"}，没有断点时 pages 为空集合
+        """
+        with self.lock:
+            entry = self.entries.get(key) or self._new_entry()
+            return dict(entry, pages=set(entry['pages']))
+
+    def set_total_pages(self, key, total_pages):
+        """
+        记录单元的总页数（由第一页响应中的总条数算出）
+        :param key: 单元标识（城市代码:职位）
+        :param total_pages: 总页数
+        """
+        with self.lock:
+            self._log({'k': key, 't': total_pages})
+
+    def mark_page(self, key, page, count):
+        """
+        记录单元的第 page 页已完成
+        :param key: 单元标识（城市代码:职位）
+        :param page: 完成的页码
+        :param count: 该页条数
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or page not in entry['pages']:
+                self._log({'k': key, 'p': page, 'c': count})
+
+    def mark_done(self, key):
+        """记录单元已爬完"""
+        with self.lock:
+            self._log({'k': key, 'd': 1})
+
+    def remove(self):
+        """整轮采集完成后删除断点文件和日志"""
+        with self.lock:
+            self._close_journal()
+            self.entries = {}
+            for path in (self.checkpoint_file, self.journal_file):
+                if os.path.exists(path):
+                    os.remove(path)
@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+
+# 工作窃取任务队列
+class WorkStealingQueue:
+    """
+    每个工作线程一个双端队列：线程从自己队列的尾部取任务（刚拆分出的同一职位的页面优先由本线程处理），
+    自己的队列为空时从任务最多的其他队列头部窃取最早放入的任务（通常是尚未探测的 (城市, 职位) 单元）。
+    接口与 queue.Queue 一致（put / get / task_done / join），get 需传入工作线程编号
+    """
+
+    def __init__(self, workers):
+        """
+        :param workers: 工作线程数
+        """
+        self.deques = [deque() for _ in range(workers)]
+        self.unfinished = 0  # 已放入但尚未 task_done 的任务数
+        self.steals = 0  # 窃取次数
+        self._next = 0  # 未指定归属时轮流分配的下一个队列
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._all_done = threading.Condition(self._lock)
+
+    def put(self, item, owner=None):
+        """
+        放入任务
+        :param item: 任务
+        :param owner: 放入哪个工作线程的队列（默认轮流分配）
+        """
+        with self._lock:
+            if owner is None:
+                owner = self._next
+                self._next = (self._next + 1) % len(self.deques)
+            self.deques[owner].append(item)
+            self.unfinished += 1
+            self._not_empty.notify()
+
+    def get(self, worker):
+        """
+        取出一个任务，所有队列都为空时等待
+        :param worker: 工作线程编号
+        """
+        with self._lock:
+            while True:
+                own = self.deques[worker]
+                if own:
+                    return own.pop()
+                victim = max(self.deques, key=len)
+                if victim:
+                    self.steals += 1
+                    return victim.popleft()
+                self._not_empty.wait()
+
+    def task_done(self):
+        """标记一个任务已处理完"""
+        with self._lock:
+            self.unfinished -= 1
+            if self.unfinished == 0:
+                self._all_done.notify_all()
+
+    def join(self):
+        """等待所有任务（包括处理过程中新放入的任务）处理完"""
+        with self._all_done:
+            while self.unfinished:
+                self._all_done.wait()
+
+
+# 按主机限速器
+class HostRateLimiter:
+    """
+    按请求主机分别维护令牌桶：每个主机以 rate 个/秒的速度补充令牌，最多积攒 burst 个，
+    所有工作线程对同一主机的请求共享一个令牌桶。rate <= 0 表示不限速
+    """
+
+    def __init__(self, rate, burst=None):
+        """
+        :param rate: 每个主机每秒请求数
+        :param burst: 令牌桶容量（允许的突发请求数），默认与 rate 相同且不小于 1
+        """
+        self.rate = rate
+        self.capacity = burst or max(1.0, rate)
+        self._buckets = {}  # 主机 -> (令牌数, 上次补充时间)
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        """
+        为请求 url 取得一个令牌，令牌不足时等待
+        :param url: 请求地址
+        """
+        if self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                tokens, updated = self._buckets.get(host, (self.capacity, now))
+                tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self._buckets[host] = (tokens - 1, now)
+                    return
+                self._buckets[host] = (tokens, now)
+                wait = (1 - tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,255 @@
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 请求延迟直方图的桶上界（秒）
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label(value):
+    """转义 Prometheus 标签值"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+# 采集指标
+class CrawlerMetrics:
+    """
+    采集过程的结构化指标：请求数、重试/失败数、下载字节数、请求延迟直方图，
+    页面与记录的吞吐量（每秒页数、每秒记录数）、去重命中率，以及每个 (城市, 职位) 单元的进度。
+    通过 snapshot() 随时读取；可选定期写出 Prometheus 文本格式文件（供 node_exporter textfile 采集），
+    或在本地端口提供 /metrics（Prometheus 文本）和 /snapshot（JSON）
+    """
+
+    def __init__(self, prom_file=None, http_port=None, http_host='127.0.0.1', export_interval=10.0):
+        """
+        :param prom_file: Prometheus 文本格式指标文件路径（为空不写出）
+        :param http_port: 本地 HTTP 指标端口（为空不启动）
+        :param http_host: HTTP 指标服务监听地址
+        :param export_interval: 指标文件写出间隔（秒）
+        """
+        self.prom_file = prom_file
+        self.http_port = http_port
+        self.http_host = http_host
+        self.export_interval = export_interval
+        self.lock = threading.Lock()
+        self._stop = threading.Event()
+        self._exporter = None  # 定期写出指标文件的线程
+        self._server = None  # HTTP 指标服务
+        self.reset()
+
+    def reset(self):
+        """清零所有指标并重新开始计时"""
+        with self.lock:
+            self.start_time = time.time()
+            self.end_time = None  # stop() 后固定吞吐量的计算区间
+            self.requests = 0
+            self.failed_requests = 0
+            self.retries = 0
+            self.bytes_downloaded = 0
+            self.latency_sum = 0.0
+            self.latency_buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # 最后一个为 +Inf
+            self.pages = 0
+            self.records = 0  # 解析出的记录数
+            self.records_received = 0  # 进入去重的记录数
+            self.records_written = 0  # 去重后写入的记录数
+            self.cells = {}  # 单元 -> {'pages', 'records', 'total_pages', 'state'}
+
+    def _cell(self, key):
+        """获取单元进度，没有时新建（调用方需持有锁）"""
+        return self.cells.setdefault(key, {'pages': 0, 'records': 0, 'total_pages': None, 'state': 'running'})
+
+    def observe_request(self, latency, nbytes=0, failed=False, retried=False):
+        """
+        记录一次请求
+        :param latency: 请求耗时（秒）
+        :param nbytes: 响应体字节数
+        :param failed: 是否失败
+        :param retried: 失败后是否重试
+        """
+        with self.lock:
+            self.requests += 1
+            self.latency_sum += latency
+            self.latency_buckets[bisect_left(LATENCY_BUCKETS, latency)] += 1
+            self.bytes_downloaded += nbytes
+            if failed:
+                self.failed_requests += 1
+            if retried:
+                self.retries += 1
+
+    def set_total_pages(self, key, total_pages):
+        """记录单元的总页数"""
+        with self.lock:
+            self._cell(key)['total_pages'] = total_pages
+
+    def observe_page(self, key, records):
+        """
+        记录单元完成一页
+        :param key: 单元标识（城市代码:职位）
+        :param records: 该页解析出的记录数
+        """
+        with self.lock:
+            self.pages += 1
+            self.records += records
+            cell = self._cell(key)
+            cell['pages'] += 1
+            cell['records'] += records
+
+    def observe_written(self, received, written):
+        """
+        记录一次去重写入
+        :param received: 进入去重的记录数
+        :param written: 去重后实际写入的记录数
+        """
+        with self.lock:
+            self.records_received += received
+            self.records_written += written
+
+    def finish_cell(self, key, failed=False):
+        """记录单元结束（done / failed）"""
+        with self.lock:
+            self._cell(key)['state'] = 'failed' if failed else 'done'
+
+    def snapshot(self):
+        """当前指标快照（可直接 JSON 序列化）"""
+        with self.lock:
+            elapsed = max((self.end_time or time.time()) - self.start_time, 1e-9)
+            dedup_hits = self.records_received - self.records_written
+            return {
+                'elapsed': elapsed,
+                'requests': self.requests,
+                'failed_requests': self.failed_requests,
+                'retries': self.retries,
+                'bytes_downloaded': self.bytes_downloaded,
+                'latency_avg': self.latency_sum / self.requests if self.requests else 0.0,
+                'latency_histogram': dict(zip([str(b) for b in LATENCY_BUCKETS] + ['+Inf'], self.latency_buckets)),
+                'pages': self.pages,
+                'records': self.records,
+                'records_written': self.records_written,
+                'pages_per_sec': self.pages / elapsed,
+                'records_per_sec': self.records / elapsed,
+                'dedup_hits': dedup_hits,
+                'dedup_hit_rate': dedup_hits / self.records_received if self.records_received else 0.0,
+                'cells': {key: dict(cell) for key, cell in self.cells.items()},
+            }
+
+    def to_prometheus(self):
+        """以 Prometheus 文本格式输出指标"""
+        snap = self.snapshot()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{labels} {value}")
+
+        metric('crawler_requests_total', 'counter', '请求次数（含重试）', [('', snap['requests'])])
+        metric('crawler_failed_requests_total', 'counter', '失败的请求次数', [('', snap['failed_requests'])])
+        metric('crawler_retries_total', 'counter', '重试次数', [('', snap['retries'])])
+        metric('crawler_downloaded_bytes_total', 'counter', '下载的响应体字节数', [('', snap['bytes_downloaded'])])
+
+        buckets = []
+        cumulative = 0
+        for bound, count in snap['latency_histogram'].items():
+            cumulative += count
+            buckets.append((f'{{le="{bound}"}}', cumulative))
+        lines.append("# HELP crawler_request_latency_seconds 单次请求耗时")
+        lines.append("# TYPE crawler_request_latency_seconds histogram")
+        for labels, value in buckets:
+            lines.append(f"crawler_request_latency_seconds_bucket{labels} {value}")
+        lines.append(f"crawler_request_latency_seconds_sum {snap['latency_avg'] * snap['requests']}")
+        lines.append(f"crawler_request_latency_seconds_count {snap['requests']}")
+
+        metric('crawler_pages_total', 'counter', '已完成页数', [('', snap['pages'])])
+        metric('crawler_records_total', 'counter', '解析出的记录数', [('', snap['records'])])
+        metric('crawler_records_written_total', 'counter', '去重后写入的记录数', [('', snap['records_written'])])
+        metric('crawler_dedup_hits_total', 'counter', '去重命中（重复）的记录数', [('', snap['dedup_hits'])])
+        metric('crawler_pages_per_second', 'gauge', '平均每秒完成页数', [('', snap['pages_per_sec'])])
+        metric('crawler_records_per_second', 'gauge', '平均每秒解析记录数', [('', snap['records_per_sec'])])
+        metric('crawler_dedup_hit_ratio', 'gauge', '去重命中率', [('', snap['dedup_hit_rate'])])
+
+        cells = sorted(snap['cells'].items())
+        metric('crawler_cell_pages', 'gauge', '单元已完成页数',
+               [(f'{{cell="{_label(key)}"}}', cell['pages']) for key, cell in cells])
+        metric('crawler_cell_total_pages', 'gauge', '单元总页数',
+               [(f'{{cell="{_label(key)}"}}', cell['total_pages']) for key, cell in cells
+                if cell['total_pages'] is not None])
+        metric('crawler_cell_records', 'gauge', '单元已解析记录数',
+               [(f'{{cell="{_label(key)}"}}', cell['records']) for key, cell in cells])
+        return '\n'.join(lines) + '\n'
+
+    def write_prom_file(self):
+        """原子写出 Prometheus 文本格式指标文件"""
+        if not self.prom_file:
+            return
+        directory = os.path.dirname(self.prom_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.prom_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp_file, self.prom_file)
+
+    def _export_loop(self):
+        while not self._stop.wait(self.export_interval):
+            try:
+                self.write_prom_file()
+            except OSError as e:
+                print(f"写出采集指标失败: {str(e)}")
+
+    def _make_handler(self):
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.startswith('/metrics'):
+                    body, content_type = metrics.to_prometheus(), 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path.startswith('/snapshot'):
+                    body, content_type = json.dumps(metrics.snapshot(), ensure_ascii=False), 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+                data = body.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass  # 不输出访问日志
+
+        return Handler
+
+    def start(self):
+        """启动指标文件定期写出和 HTTP 指标服务（按配置）"""
+        with self.lock:
+            self.end_time = None
+        self._stop.clear()
+        if self.prom_file and self._exporter is None:
+            self._exporter = threading.Thread(target=self._export_loop, name='CrawlerMetricsExporter', daemon=True)
+            self._exporter.start()
+        if self.http_port and self._server is None:
+            self._server = ThreadingHTTPServer((self.http_host, self.http_port), self._make_handler())
+            threading.Thread(target=self._server.serve_forever, name='CrawlerMetricsServer', daemon=True).start()
+            print(f"采集指标: http://{self.http_host}:{self._server.server_port}/metrics")
+
+    def stop(self):
+        """停止定期写出和 HTTP 服务，并写出最终指标"""
+        with self.lock:
+            self.end_time = time.time()
+        self._stop.set()
+        if self._exporter is not None:
+            self._exporter.join()
+            self._exporter = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        try:
+            self.write_prom_file()
+        except OSError as e:
+            print(f"写出采集指标失败: {str(e)}")
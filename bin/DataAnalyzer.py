@@ -2,10 +2,9 @@ import os
 import time
 
 import pymysql
+import pymysql.cursors
 import logging
 import matplotlib.pyplot as plt
-import re
-import math
 import numpy as np
 from datetime import datetime
 import jieba
@@ -17,19 +16,54 @@ from pyecharts import options as opts
 from pyecharts.charts import Geo, Map
 from pyecharts.globals import ChartType
 
+from bin.CityResolver import normalize_location
+from bin.SalaryParser import default_parser
 
 
 
 
 
+
+# 年份数据快照
+class YearSnapshot:
+    """
+    某一年份分析所需的岗位数据：以一条 SELECT 流式读出，词云、热力图、薪资分布图共用，
+    多年综合报告直接复用各年份的快照而不再查询数据库
+    """
+
+    def __init__(self, year):
+        """
+        :param year: 数据年份
+        """
+        self.year = year
+        self.rows = 0  # 读取的岗位数
+        self.word_counts = Counter()  # 职位要求的词频（流式分词累计，不保留原文）
+        self.provinces = []  # (省份, 招聘人数)，数据库端按省份汇总
+        self.salaries = []  # 薪资范围字符串
+
+
 # 数据分析模块
 class DataAnalyzer:
+    # 薪资解析引擎（类属性，子类 DataAnalyzerApp 未调用 __init__ 也可使用，解析缓存全局共享）
+    salary_parser = default_parser
+
     def __init__(self, config_loader):
         self.config_loader = config_loader
         # 直接访问 config_loader 的 db_config 属性（非方法）
         self.db_config = config_loader.db_config  # 替换原有行
         self.wordcloud_config = config_loader.get_analyzer_config().get('wordcloud', {})
+        self.stop_words = set(self.wordcloud_config.get('stop_words', []))
+        self.chunk_rows = self.wordcloud_config.get('chunk_rows', 500)  # 流式分词每块条数
         self.heatmap_config = config_loader.get_analyzer_config().get('heatmap', {})
+        # 薪资解析缓存配置（容量及可选的持久化文件）
+        self.salary_cache_config = config_loader.get_analyzer_config().get('salary_cache', {})
+        self.salary_parser.cache.configure(
+            max_size=self.salary_cache_config.get('max_size'),
+            cache_file=self.salary_cache_config.get('cache_file')
+        )
+
+        # 年份数据快照缓存（年份 -> YearSnapshot）
+        self.snapshots = {}
 
         # 初始化日志
         self.logger = logging.getLogger(__name__)
@@ -37,21 +71,15 @@ class DataAnalyzer:
         self.logger.info("数据分析模块初始化完成")
 
     def get_db_connection(self):
-        """建立数据库连接（确保所有必要参数存在）"""
+        """
+        从共享连接池取出数据库连接（连接池由 config_loader 持有，分析模块与 GUI 共用）
+        :return: 连接对象，用完调用 close() 归还连接池；取不到连接时返回 None
+        """
         try:
-            # 确保所有必要的连接参数都存在
-            connection_params = {
-                'host': self.db_config.get('host', 'localhost'),
-                'user': self.db_config.get('user', ''),
-                'password': self.db_config.get('password', ''),
-                'database': self.db_config.get('database', ''),
-                'charset': self.db_config.get('charset', 'utf8mb4'),
-            }
-
-            print(f"尝试连接数据库: {connection_params}")
-            return pymysql.connect(**connection_params)
+            return self.config_loader.get_db_pool().get_connection()
         except pymysql.Error as e:
-            self.logger.error(f"数据库连接出错: {e}")
+            # 子类 DataAnalyzerApp 未调用 __init__，没有 self.logger
+            logging.getLogger(__name__).error(f"数据库连接出错: {e}")
             return None
 
     # jieba分词统计词频并去除无效词语
@@ -60,15 +88,31 @@ class DataAnalyzer:
         if not text:
             self.logger.warning("没有获取到任何数据")
             return ""
+        return self.top_words(self.count_words([text]))
 
-        stop_words = self.wordcloud_config.get('stop_words', [])
-        seg_list = jieba.cut(text, cut_all=False)
-        words_list = [word for word in seg_list if word not in stop_words and len(word) > 1]
+    def count_words(self, texts, counter=None):
+        """
+        对一块文本分词并累计词频（过滤无效词语和单字）
+        :param texts: 文本列表（如一块职位要求）
+        :param counter: 累加到的 Counter，默认新建
+        :return: 词频 Counter
+        """
+        counter = Counter() if counter is None else counter
+        stop_words = self.stop_words
+        counter.update(word for word in jieba.cut("\n".join(texts), cut_all=False)
+                       if len(word) > 1 and word not in stop_words)
+        return counter
 
-        # 限制词云数量（从配置获取max_words）
-        word_counts = Counter(words_list)
-        top_words = [word for word, _ in word_counts.most_common(self.wordcloud_config.get('max_words', 100))]
-        return " ".join(top_words)
+    def top_words(self, word_counts):
+        """
+        取词频最高的词语（数量从配置获取max_words）
+        :param word_counts: 词频 Counter
+        :return: 空格分隔的词语字符串
+        """
+        if not word_counts:
+            self.logger.warning("没有获取到任何数据")
+            return ""
+        return " ".join(word for word, _ in word_counts.most_common(self.wordcloud_config.get('max_words', 100)))
 
     # 根据分词结果绘制词云图
     def generate_wordcloud(self, words, filename=None):
@@ -125,40 +169,51 @@ class DataAnalyzer:
         )
         map_chart.render(output_file)
         self.logger.info(f"热力图已保存至: {output_file}")
-    # 从数据库获取对应年份的职位要求数据，返回字符串
-    def get_field_from_db(self, data_year):
+    # 流式读取对应年份的职位要求数据
+    def iter_requirements(self, data_year, chunk_rows=None):
+        """
+        以服务端游标（SSCursor）分块读取指定年份的职位要求，结果集不会整体载入内存
+        :param data_year: 数据年份
+        :param chunk_rows: 每块条数，默认使用配置的 chunk_rows
+        :return: 生成器，每次产出一块非空职位要求文本的列表
+        """
         connection = self.get_db_connection()
-        field_text = ""
+        if not connection:
+            return
         try:
-            with connection.cursor() as cursor:
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
                 sql = "SELECT requirements FROM job_listings WHERE data_year = %s"
                 cursor.execute(sql, (data_year,))
-                results = cursor.fetchall()
-                self.logger.info(f"查询 {data_year} 年数据，返回 {len(results)} 条记录")
-
-                # 输出前3条记录的前100个字符
-                for i, row in enumerate(results[:3]):
-                    if row[0]:
-                        self.logger.debug(f"记录 {i + 1}: {row[0][:100]}...")
-
-                for row in results:
-                    if row[0]:
-                        field_text += row[0] + "\n"
-
-                # 检查最终拼接的文本长度
-                self.logger.info(f"{data_year}年职位要求文本总长度: {len(field_text)}")
-                if len(field_text) > 0:
-                    self.logger.debug(f"职位要求文本前100个字符: {field_text[:100]}...")
-                else:
-                    self.logger.warning(f"{data_year}年职位要求文本为空")
-
-            return field_text
-        except Exception as e:
+                while True:
+                    rows = cursor.fetchmany(chunk_rows or self.chunk_rows)
+                    if not rows:
+                        break
+                    yield [row[0] for row in rows if row[0]]
+        except pymysql.Error as e:
             self.logger.error(f"查询错误: {e}")
-            return ""
         finally:
-            if connection:
-                connection.close()
+            connection.close()
+
+    # 从数据库获取对应年份的职位要求数据，返回字符串
+    def get_field_from_db(self, data_year):
+        texts = [text for chunk in self.iter_requirements(data_year) for text in chunk]
+        self.logger.info(f"查询 {data_year} 年数据，返回 {len(texts)} 条职位要求")
+        field_text = "\n".join(texts) + "\n" if texts else ""
+        if not field_text:
+            self.logger.warning(f"{data_year}年职位要求文本为空")
+        return field_text
+
+    # 流式分词统计对应年份的职位要求词频
+    def get_word_counts_from_db(self, data_year):
+        """
+        分块读取指定年份的职位要求并逐块分词，内存占用与块大小相关而与数据量无关
+        :param data_year: 数据年份
+        :return: 词频 Counter
+        """
+        word_counts = Counter()
+        for chunk in self.iter_requirements(data_year):
+            self.count_words(chunk, word_counts)
+        return word_counts
 
 
 
@@ -180,14 +235,8 @@ class DataAnalyzer:
                 results = cursor.fetchall()
                 data = []
                 for row in results:
-                    location = row[0]
-                    if '-' in location:
-                        location = location.split('-')[0]
-                    elif '·' in location:
-                        location = location.split('·')[0]
-                    # 过滤掉外国数据、'全国' 和 '其他' 数据
-                    if location and location.lower() != 'nan' and location not in ['全国',
-                                                                                   '其他']:
+                    location = normalize_location(row[0])
+                    if location:
                         data.append((location, int(row[1])))
             return data
         except pymysql.Error as e:
@@ -220,34 +269,12 @@ class DataAnalyzer:
         :param processed_data: 处理后的工作地点及招聘人数数据
         :return: 映射后的工作地点及招聘人数数据
         """
-        # 从数据库获取映射关系进行二次映射
-        connection = self.get_db_connection()
-        if not connection:
-            return processed_data
-        try:
-            with connection.cursor() as cursor:
-                # 从数据库中查询城市到省份的映射关系
-                sql = "SELECT short_name, full_name FROM city_mapping"
-                cursor.execute(sql)
-                city_province_mapping = {row[0]: row[1] for row in cursor.fetchall()}
-
-            second_mapped_data = []
-            for location, count in processed_data:
-                new_location = city_province_mapping.get(location, location)
-                # 去除引号
-                new_location = new_location.strip('"')
-                second_mapped_data.append((new_location, count))
-
-            return second_mapped_data
-        except pymysql.Error as e:
-            logging.error(f"数据库映射出错: {e}")
-            return processed_data
-        finally:
-            if connection:
-                connection.close()
-
-
-
+        # 前缀树解析省份（映射只在首次使用时加载一次，不再查询 city_mapping 表）
+        resolver = self.config_loader.get_city_resolver()
+        provinces = resolver.resolve_many(location for location, _ in processed_data)
+        # 无法解析的地点保留原名；同一省份的多个城市合并
+        return self.process_data([(province or location, count)
+                                  for (location, count), province in zip(processed_data, provinces)])
 
     # 绘制热力图
     def generate_job_distribution_heatmap(self, data, output_file="job_distribution_heatmap.heatmap"):
@@ -326,196 +353,16 @@ class DataAnalyzer:
         :param salary_str: 薪资格式字符串
         :return: 月薪数值或 None（无法解析时）
         """
-        # 空值处理
-        if isinstance(salary_str, float) and math.isnan(salary_str):
-            return None
-        salary_str = str(salary_str).strip()
-        if salary_str == 'nan' or salary_str == "":
-            return None
+        return self.salary_parser.parse(salary_str)
 
-        # 预设参数
-        work_days_per_month = 21.75  # 月平均工作日
-        work_hours_per_day = 8  # 每日工作时长
-
-        # 处理 "面议" 的情况
-        if salary_str == "面议":
-            return None
-
-        # 解析优先级从高到低排列
-
-        # 1. 处理时薪（如"21元/小时"）
-        if '元/小时' in salary_str:
-            if match := re.match(r'(\d+\.?\d*)元/小时', salary_str):
-                hourly = float(match.group(1))
-                monthly = hourly * work_hours_per_day * work_days_per_month
-                return round(monthly, 2)
-
-        # 处理新的时薪格式（如 "10-25元/时" 和单个金额的 "300元/时"）
-        if '元/时' in salary_str:
-            if re.search(r'(\d+\.?\d*)-(\d+\.?\d*)元/时', salary_str):
-                match = re.match(r'(\d+\.?\d*)-(\d+\.?\d*)元/时', salary_str)
-                lower = float(match.group(1))
-                upper = float(match.group(2))
-                monthly = (lower + upper) / 2 * work_hours_per_day * work_days_per_month
-                return round(monthly, 2)
-            elif match := re.match(r'(\d+\.?\d*)元/时', salary_str):
-                hourly = float(match.group(1))
-                monthly = hourly * work_hours_per_day * work_days_per_month
-                return round(monthly, 2)
-
-        # 2. 处理日薪（如"200元/天"）
-        if '元/天' in salary_str:
-            if match := re.match(r'(\d+\.?\d*)元/天', salary_str):
-                daily = float(match.group(1))
-                return daily * work_days_per_month
-
-        # 处理新的日薪格式（如 "60-100元/天"、"150-200元/天" 等）
-        if re.search(r'\d+-\d+元/天', salary_str):
-            if match := re.match(r'(\d+\.?\d*)-(\d+\.?\d*)元/天', salary_str):
-                lower = float(match.group(1))
-                upper = float(match.group(2))
-                return (lower + upper) / 2 * work_days_per_month
-
-        # 3. 处理特殊月薪（如"10万以上/月"）
-        if '以上/月' in salary_str:
-            if match := re.match(r'(\d+\.?\d*)(万|千)以上/月', salary_str):
-                value, unit = match.groups()
-                multiplier = 10000 if unit == '万' else 1000
-                return float(value) * multiplier
-
-        # 处理特殊年薪（如"100万以上/年"）
-        if '以上/年' in salary_str:
-            if match := re.match(r'(\d+\.?\d*)(万|千)以上/年', salary_str):
-                value, unit = match.groups()
-                multiplier = 10000 if unit == '万' else 1000
-                return float(value) * multiplier / 12
-
-        # 4. 处理带年终奖的复合格式（如"1.5-2.5万·13薪"）
-        if '·' in salary_str:
-            parts = salary_str.split('·')
-            if len(parts) == 2 and '薪' in parts[1]:
-                main_salary = self.parse_salary(parts[0])
-                if main_salary is not None:
-                    if bonus_match := re.match(r'(\d+)薪', parts[1]):
-                        return main_salary * int(bonus_match.group(1)) / 12
-
-        # 处理新的带年终奖且单位为元的格式（如 "8000-16000元·13薪"）
-        if re.search(r'\d+-\d+元·\d+薪', salary_str):
-            parts = salary_str.split('·')
-            if len(parts) == 2 and '薪' in parts[1]:
-                if match := re.match(r'(\d+)-(\d+)元', parts[0]):
-                    lower = float(match.group(1))
-                    upper = float(match.group(2))
-                    main_salary = (lower + upper) / 2
-                    if bonus_match := re.match(r'(\d+)薪', parts[1]):
-                        return main_salary * int(bonus_match.group(1)) / 12
-
-        # 5. 处理带时间单位的范围薪资（如"1.1-1.8万/月"）
-        range_pattern_month = r'''
-            ^
-            ([\d.]+)    # 起始值
-            -
-            ([\d.]+)    # 结束值
-            (万|千)     # 单位
-            /月
-        '''
-        if match := re.match(range_pattern_month, salary_str, re.VERBOSE):
-            lower, upper, unit = match.groups()
-            multiplier = 10000 if unit == '万' else 1000
-            return (float(lower) * multiplier + float(upper) * multiplier) / 2
-
-        # 处理新的月薪格式（如 "10000-15000元/月"）
-        if re.search(r'\d+-\d+元/月', salary_str):
-            if match := re.match(r'(\d+)-(\d+)元/月', salary_str):
-                lower = float(match.group(1))
-                upper = float(match.group(2))
-                return (lower + upper) / 2
-
-        # 处理无时间单位且单位为元的薪资范围（如 "6000-10000元"）
-        if re.search(r'\d+-\d+元', salary_str):
-            if match := re.match(r'(\d+)-(\d+)元', salary_str):
-                lower = float(match.group(1))
-                upper = float(match.group(2))
-                return (lower + upper) / 2
-
-        # 处理固定金额的薪资，单位为“元”或“万”（如 "1万"、"5000元"）
-        if re.search(r'\d+万', salary_str):
-            if match := re.match(r'(\d+)万', salary_str):
-                value = float(match.group(1))
-                return value * 10000
-        elif re.search(r'\d+元', salary_str):
-            if match := re.match(r'(\d+)元', salary_str):
-                return float(match.group(1))
-
-        # 处理带有上下限描述的固定金额薪资（如 "1000元以下"）
-        if re.search(r'\d+元(以下|以上)', salary_str):
-            if match := re.match(r'(\d+)元(以下|以上)', salary_str):
-                value = float(match.group(1))
-                direction = match.group(2)
-                if direction == "以下":
-                    return value * 0.8
-                elif direction == "以上":
-                    return value * 1.2
-
-        # 6. 处理按年计算的范围薪资（如 "15-25万/年"）
-        range_pattern_year = r'''
-            ^
-            ([\d.]+)    # 起始值
-            -
-            ([\d.]+)    # 结束值
-            (万|千)     # 单位
-            /年
-        '''
-        if match := re.match(range_pattern_year, salary_str, re.VERBOSE):
-            lower, upper, unit = match.groups()
-            multiplier = 10000 if unit == '万' else 1000
-            return (float(lower) * multiplier + float(upper) * multiplier) / 12
-
-        # 7. 处理无时间单位的范围薪资（如"1.5-3万"）
-        range_pattern_no_time = r'''
-            ^
-            ([\d.]+)    # 起始值
-            -
-            ([\d.]+)    # 结束值
-            (万|千)     # 单位
-            (?!/)       # 排除有时间单位的情况
-        '''
-        if match := re.match(range_pattern_no_time, salary_str, re.VERBOSE):
-            lower, upper, unit = match.groups()
-            multiplier = 10000 if unit == '万' else 1000
-            return (float(lower) * multiplier + float(upper) * multiplier) / 2
-
-        # 处理以K为单位的薪资范围（如 "3-4K"）
-        k_range_pattern = r'^(\d+\.?\d*)-(\d+\.?\d*)K$'
-        if match := re.match(k_range_pattern, salary_str):
-            lower = float(match.group(1)) * 1000
-            upper = float(match.group(2)) * 1000
-            return (lower + upper) / 2
-
-        # 处理不同单位的范围薪资（如 "8千 - 1.6万"）
-        diff_unit_range_pattern = r'^(\d+\.?\d*)(千)-(\d+\.?\d*)(万)$'
-        if match := re.match(diff_unit_range_pattern, salary_str):
-            lower = float(match.group(1)) * 1000
-            upper = float(match.group(3)) * 10000
-            return (lower + upper) / 2
-
-        # 8. 处理上下限薪资（如"1.5千以下/月"）
-        limit_pattern = r'''
-            ^
-            ([\d.]+)    # 数值
-            (万|千)     # 单位
-            (以下|以上)  # 限定方向
-            /月
-        '''
-        if match := re.match(limit_pattern, salary_str, re.VERBOSE):
-            value, unit, direction = match.groups()
-            multiplier = 10000 if unit == '万' else 1000
-            base = float(value) * multiplier
-            # 根据方向调整估值
-            return base * (0.8 if direction == '以下' else 1.2)
-
-        logging.warning(f"无法识别的薪资格式: {salary_str}")
-        return None
+    # 批量处理薪资数据
+    def parse_salaries(self, salaries):
+        """
+        批量解析薪资
+        :param salaries: 薪资字符串的可迭代对象
+        :return: numpy float 数组，无法解析的位置为 NaN
+        """
+        return self.salary_parser.parse_salaries(salaries)
 
     # 生成薪资分布直方图
     # def salary_distribution(self, salaries, year, should_plot_kde=True):
@@ -595,13 +442,13 @@ class DataAnalyzer:
     # 生成薪资分布扇形图
     def plot_salary_distribution(self, salaries, year):
         """增强版可视化函数"""
-        # 数据清洗
-        parsed = [s for s in (self.parse_salary(x) for x in salaries) if s is not None]
+        # 数据清洗（批量解析，无法解析的为 NaN）
+        parsed = self.parse_salaries(salaries)
 
-        # 薪资合理性过滤
-        valid = [s for s in parsed if 1500 <= s <= 150000]  # 扩展合理范围
+        # 薪资合理性过滤（NaN 比较结果为 False，会被一并过滤）
+        valid = parsed[(parsed >= 1500) & (parsed <= 150000)]  # 扩展合理范围
 
-        if not valid:
+        if valid.size == 0:
             print("无有效数据可供可视化")
             return
 
@@ -667,23 +514,92 @@ class DataAnalyzer:
         plt.savefig(f"result/salary/{year}_salary_distribution.png", dpi=300)
         #plt.show()
 
+    # 数据库端按省份汇总招聘人数
+    def get_province_openings(self, year, connection=None):
+        """
+        按入库时解析的 province 列（带 (data_year, province, openings) 索引）在数据库端汇总招聘人数，
+        只返回各省份一行
+        :param year: 数据年份
+        :param connection: 复用的数据库连接；为空时从连接池取出
+        :return: [(省份, 招聘人数), ...]；province 列不存在（尚未运行入库迁移）时回退到逐行读取后在本地解析汇总
+        """
+        sql = """
+            SELECT province, SUM(openings) FROM job_listings
+            WHERE data_year = %s AND province IS NOT NULL
+            GROUP BY province
+        """
+        own_connection = connection is None
+        if own_connection:
+            connection = self.get_db_connection()
+            if not connection:
+                return []
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, (year,))
+                return [(province, int(openings or 0)) for province, openings in cursor.fetchall()]
+        except pymysql.Error as e:
+            self.logger.warning(f"{year}年省份汇总查询失败（{e}），改为逐行读取工作地点")
+            return self.map_data(self.process_data(self.get_data_from_db(year)))
+        finally:
+            if own_connection:
+                connection.close()
+
+    # 一次查询取得年份数据快照
+    def get_year_snapshot(self, year, refresh=False):
+        """
+        获取指定年份的数据快照（职位要求词频、各省份招聘人数、薪资范围），同一年份只查询一次
+        :param year: 数据年份
+        :param refresh: 是否忽略缓存重新查询
+        :return: YearSnapshot，查询失败时为空快照（不缓存）
+        """
+        if not refresh and year in self.snapshots:
+            return self.snapshots[year]
+
+        snapshot = YearSnapshot(year)
+        connection = self.get_db_connection()
+        if not connection:
+            return snapshot
+        try:
+            snapshot.provinces = self.get_province_openings(year, connection)
+            # 服务端游标逐行读取，不在客户端缓存整个结果集
+            with connection.cursor(pymysql.cursors.SSCursor) as cursor:
+                sql = "SELECT requirements, salary_range FROM job_listings WHERE data_year = %s"
+                cursor.execute(sql, (year,))
+                chunk = []  # 待分词的职位要求，满 chunk_rows 条分词一次后丢弃原文
+                for requirements, salary_range in cursor:
+                    snapshot.rows += 1
+                    if requirements:
+                        chunk.append(requirements)
+                        if len(chunk) >= self.chunk_rows:
+                            self.count_words(chunk, snapshot.word_counts)
+                            chunk.clear()
+                    snapshot.salaries.append(salary_range)
+                if chunk:
+                    self.count_words(chunk, snapshot.word_counts)
+        except pymysql.Error as e:
+            self.logger.error(f"{year}年数据查询出错: {e}")
+            return YearSnapshot(year)
+        finally:
+            connection.close()
+
+        self.logger.info(f"查询 {year} 年数据，返回 {snapshot.rows} 条记录")
+        self.snapshots[year] = snapshot
+        return snapshot
+
     # 控制生成2022到2025的词云图及热力图
     def process_year(self, year):
         """
         处理指定年份的数据，生成词云图、省份招聘热力图和薪资分布图
         :param year: 数据年份
         """
+        snapshot = self.get_year_snapshot(year)
         # 绘制词云图
-        field_data1 = self.get_field_from_db(year)
-        words = self.perform_word_segmentation(field_data1)
+        words = self.top_words(snapshot.word_counts)
         self.generate_wordcloud(words, f"{year}_wordcloud.png")
-        # 绘制热力图
-        data = self.get_data_from_db(year)
-        #print(type(data))
-        processed_data = self.process_data(data)
-        mapped_data = self.map_data(processed_data)
-        self.generate_province_recruitment_map(mapped_data, year, f"result/heatmap/{year}.html")
+        # 绘制热力图（数据库端已按省份汇总）
+        self.generate_province_recruitment_map(snapshot.provinces, year, f"result/heatmap/{year}.html")
         # 绘制薪资分布图
-        salary = self.get_salary_data(year)
+        salary = snapshot.salaries
         if salary:
             self.plot_salary_distribution(salary, year)
+            self.logger.info(f"薪资解析缓存统计: {self.salary_parser.cache.stats()}")
@@ -241,30 +241,17 @@ class DataAnalyzerApp(DataAnalyzer):
         salary_max = self.salary_max.get()
 
         try:
-            min_value = float(salary_min) if salary_min else float('-inf')
-            max_value = float(salary_max) if salary_max else float('inf')
+            min_value = float(salary_min) if salary_min else None
+            max_value = float(salary_max) if salary_max else None
         except ValueError:
             self.status_var.set("薪资输入格式错误，请输入数字")
             return
 
         self.status_var.set("正在查询岗位信息...")
 
-        db_results = self.query_job_listings(location, search_keyword)
-
-        self.sample_data = []
-        for job in db_results:
-            job_title, company_name, salary_str, job_location = job  # 避免变量名冲突
-            parsed_salary = super().parse_salary(salary_str)
-
-            try:
-                salary_val = float(parsed_salary)
-            except (ValueError, TypeError):
-                # 如果转换失败，跳过该岗位
-                continue
-
-            # 判断薪资是否在用户指定范围内
-            if min_value <= salary_val <= max_value:
-                self.sample_data.append(job)
+        # 薪资范围筛选在 SQL 中基于入库时计算的 salary_monthly 完成
+        self.sample_data = list(self.query_job_listings(location, search_keyword,
+                                                        min_salary=min_value, max_salary=max_value) or [])
 
         # 清空现有数据并插入新数据
         self.job_tree.delete(*self.job_tree.get_children())
@@ -273,11 +260,19 @@ class DataAnalyzerApp(DataAnalyzer):
 
         self.status_var.set(f"找到 {len(self.sample_data)} 条符合条件的岗位信息")
 
-    def query_job_listings(self,location="", search_keyword="", salary_range="", data_year=2025):
+    def query_job_listings(self,location="", search_keyword="", salary_range="", data_year=2025,
+                           min_salary=None, max_salary=None):
+        """
+        查询岗位信息
+        :param min_salary: 最低月薪（基于 salary_monthly 列筛选），None 表示不限
+        :param max_salary: 最高月薪，None 表示不限；两者都为 None 时只返回薪资可解析的岗位
+        """
+        connection = None
         try:
-            # 建立数据库连接
-            # 建立数据库连接
+            # 从共享连接池取出连接（close() 时归还）
             connection = super().get_db_connection()
+            if connection is None:
+                return []
 
             # 创建游标对象
             with connection.cursor() as cursor:
@@ -303,11 +298,30 @@ class DataAnalyzerApp(DataAnalyzer):
 
                 # 构建 SQL 查询语句，仅选择所需的列
                 query = "SELECT job_title, company_name, salary_range, location FROM job_listings"
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
+                query += " WHERE " + " AND ".join(conditions)
+
+                salary_conditions = []
+                salary_values = []
+                if min_salary is not None and max_salary is not None:
+                    salary_conditions.append("salary_monthly BETWEEN %s AND %s")
+                    salary_values.extend([min_salary, max_salary])
+                elif min_salary is not None:
+                    salary_conditions.append("salary_monthly >= %s")
+                    salary_values.append(min_salary)
+                elif max_salary is not None:
+                    salary_conditions.append("salary_monthly <= %s")
+                    salary_values.append(max_salary)
+                else:
+                    salary_conditions.append("salary_monthly IS NOT NULL")
 
                 # 执行查询
-                cursor.execute(query, values)
+                try:
+                    cursor.execute(query + " AND " + " AND ".join(salary_conditions), values + salary_values)
+                except pymysql.Error as e:
+                    # salary_monthly 列不存在（尚未运行入库迁移）时，取出其余条件的结果后在本地解析薪资筛选
+                    print(f"按数值薪资列查询失败（{e}），改为本地解析薪资筛选")
+                    cursor.execute(query, values)
+                    return self.filter_by_salary(cursor.fetchall(), min_salary, max_salary)
 
                 # 获取查询结果
                 results = cursor.fetchall()
@@ -319,6 +333,22 @@ class DataAnalyzerApp(DataAnalyzer):
             if connection:
                 connection.close()
 
+    def filter_by_salary(self, rows, min_salary=None, max_salary=None):
+        """
+        按折算月薪在本地筛选查询结果（与 salary_monthly 列的筛选条件一致）
+        :param rows: 查询结果，薪资字符串在第3列
+        :param min_salary: 最低月薪，None 表示不限
+        :param max_salary: 最高月薪，None 表示不限
+        :return: 薪资可解析且在范围内的行
+        """
+        salaries = super().parse_salaries(row[2] for row in rows)
+        keep = ~np.isnan(salaries)
+        if min_salary is not None:
+            keep &= salaries >= min_salary
+        if max_salary is not None:
+            keep &= salaries <= max_salary
+        return tuple(row for row, matched in zip(rows, keep) if matched)
+
     import statistics
 
     def show_salary_stats(self):
@@ -328,15 +358,11 @@ class DataAnalyzerApp(DataAnalyzer):
             self.status_var.set("薪资统计失败：无查询数据")
             return
 
-        # 提取薪资数据
-        salaries = []
-        for job in self.sample_data:
-            salary_str = job[2]  # 假设薪资信息在元组的第3个位置
-            parsed_salary = super().parse_salary(salary_str)
-            if parsed_salary is not None:
-                salaries.append(parsed_salary)
+        # 提取薪资数据（薪资信息在元组的第3个位置）
+        salaries = super().parse_salaries(job[2] for job in self.sample_data)
+        salaries = salaries[~np.isnan(salaries)]
 
-        if not salaries:
+        if salaries.size == 0:
             messagebox.showwarning("提示", "未找到有效的薪资数据")
             self.status_var.set("薪资统计失败：无有效数据")
             return
@@ -362,13 +388,10 @@ class DataAnalyzerApp(DataAnalyzer):
         fig = Figure(figsize=(7, 5), dpi=100)
         ax = fig.add_subplot(111)
 
-        # 数据清洗
-        parsed = [s for s in salaries if s is not None]
-
         # 薪资合理性过滤
-        valid = [s for s in parsed if 1500 <= s <= 150000]  # 扩展合理范围
+        valid = salaries[(salaries >= 1500) & (salaries <= 150000)]  # 扩展合理范围
 
-        if not valid:
+        if valid.size == 0:
             messagebox.showwarning("提示", "无有效数据可供可视化")
             self.status_var.set("薪资统计失败：无有效数据")
             return
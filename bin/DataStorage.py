@@ -1,68 +1,167 @@
 import pandas as pd
 from pymysql import Error
+import hashlib
 import json
+from itertools import islice
 from tqdm import tqdm
 import pymysql
 import re
-import math
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from bin.CityResolver import normalize_location
+from bin.ConfigLoader import ConfigLoader
+from bin.IngestManifest import IngestManifest
+from bin.SegmentStore import SegmentStore
+from bin.SalaryParser import default_parser
+
+# 服务器/客户端禁止 LOAD DATA LOCAL INFILE 时的错误码
+LOCAL_INFILE_ERRORS = {1148, 2068, 3948, 3950}
+
+# LOAD DATA 默认格式的转义序列（读回临时 TSV 文件时还原）
+TSV_ESCAPES = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r', '0': '\0'}
+_TSV_ESCAPE = re.compile(r'\\(.)', re.S)
+
+# clean_text 的正则替换步骤（按顺序执行，None 表示此处去除首尾空白）
+CLEAN_TEXT_STEPS = [
+    # 第一阶段：处理特殊转义字符和空白符
+    (re.compile(r'\\[rnt"]'), ' '),  # 处理 \r \n \t \" 等转义符
+    (re.compile(r'[\r\n\t]+'), ' '),  # 再次确保无换行符
+    (re.compile(r'\s+'), ' '),  # 合并连续空格
+    None,
+    # 第二阶段：清理引号和逗号
+    (re.compile(r"\s*'\s*"), "'"),  # 引号周围空格
+    (re.compile(r"\s*,\s*"), ", "),  # 逗号规范化
+    # 第三阶段：清除空元素和边界符号
+    (re.compile(r",\s*''\s*"), ""),  # 移除空元素
+    (re.compile(r"\[\s*'?"), "["),  # 处理开头 [ 和 ['
+    (re.compile(r"'\s*\]"), "]"),  # 处理结尾 ']
+    (re.compile(r"\[\s*\]"), "[]"),  # 确保空列表标识保留
+    # 第四阶段：最终修正
+    (re.compile(r"'\s*,\s*'"), "', '"),  # 统一列表分隔符格式
+    (re.compile(r",\s*,"), ","),  # 移除连续逗号
+]
+
+# job_listings 写入字段（顺序与 _record_values 返回的元组一致）
+INSERT_COLUMNS = (
+    "job_title", "company_name", "salary_range", "location", "openings",
+    "requirements", "search_keyword", "data_year",
+    "salary_min", "salary_max", "salary_monthly", "city", "province", "fingerprint",
+)
+
+# 参与内容指纹计算的字段：同一年份下职位名称、公司、地点相同视为同一条职位
+FINGERPRINT_FIELDS = ("job_title", "company_name", "location", "data_year")
+
+# 指纹冲突时用新数据覆盖已有记录（MySQL 5.7 兼容写法）
+UPSERT_CLAUSE = " ON DUPLICATE KEY UPDATE " + ", ".join(
+    f"{column} = VALUES({column})" for column in INSERT_COLUMNS if column != "fingerprint"
+)
 
 
 # 数据存储模块
 class DataStorage:
-    class DataStorage:
-        def __init__(self, config_loader):  # 新增config_loader参数
-            self.config_loader = config_loader  # 保存配置加载器
+    def __init__(self, config_loader=None):  # 新增config_loader参数
+        self.config_loader = config_loader or ConfigLoader()  # 保存配置加载器
+        self.db_config = self.config_loader.db_config
+        self._init_options(self.config_loader.storage_config)
+        self._table_ready = False  # 数据表是否已创建（每个实例只建一次）
+        # 入库清单：记录已入库文件的哈希，增量入库时跳过未变化的文件
+        self.manifest = IngestManifest(self.storage_config.get('manifest_file', 'data/ingest_manifest.json'))
+        self.source_rows = {}  # 最近一次 iter_all_records 中各数据文件产出的记录数
+        self.failed_batches = 0  # 最近一次分批写入中失败跳过的批次数
+
+    def _init_options(self, storage_config):
+        """按存储配置设置批次大小、写入模式等"""
+        self.storage_config = storage_config
+        self.batch_size = storage_config.get('batch_size', 1000)
+        self.max_retries = storage_config.get('max_retries', 3)
+        # row: 逐行写入；bulk: 多行 VALUES 批量写入；infile: 清空后 LOAD DATA LOCAL INFILE 全量重建
+        self.insert_mode = storage_config.get('insert_mode', 'bulk')
+        self.bulk_rows = storage_config.get('bulk_rows', 500)  # bulk 模式下单条 INSERT 包含的行数
+        self.chunk_size = storage_config.get('chunk_size', 1000)  # 流式读取数据文件时每块行数
+        self.workers = storage_config.get('workers', 1)  # 数据文件解析进程数，1 表示在主进程中顺序流式处理
+
+    @classmethod
+    def for_parsing(cls, storage_config):
+        """
+        只用于解析数据文件的实例（不读取配置文件、不连接数据库、不加载入库清单），供进程池子进程使用
+        :param storage_config: data_storage 配置字典
+        """
+        storage = cls.__new__(cls)
+        storage.config_loader = None
+        storage.db_config = {}
+        storage._init_options(storage_config)
+        return storage
 
     # 数据清理·
     def clean_text(self,text: str) -> str:
         """终极清理：彻底去除转义字符、多余符号和空元素"""
-        # 第一阶段：处理特殊转义字符和空白符
-        text = re.sub(r'\\[rnt"]', ' ', text)  # 处理 \r \n \t \" 等转义符
-        text = re.sub(r'[\r\n\t]+', ' ', text)  # 再次确保无换行符
-        text = re.sub(r'\s+', ' ', text).strip()  # 合并连续空格
-
-        # 第二阶段：清理引号和逗号
-        text = re.sub(r"\s*'\s*", "'", text)  # 引号周围空格
-        text = re.sub(r"\s*,\s*", ", ", text)  # 逗号规范化
-
-        # 第三阶段：清除空元素和边界符号
-        text = re.sub(r",\s*''\s*", "", text)  # 移除空元素
-        text = re.sub(r"\[\s*'?", "[", text)  # 处理开头 [ 和 ['
-        text = re.sub(r"'\s*\]", "]", text)  # 处理结尾 ']
-        text = re.sub(r"\[\s*\]", "[]", text)  # 确保空列表标识保留
-
-        # 第四阶段：最终修正
-        text = re.sub(r"'\s*,\s*'", "', '", text)  # 统一列表分隔符格式
-        text = re.sub(r",\s*,", ",", text)  # 移除连续逗号
+        for step in CLEAN_TEXT_STEPS:
+            if step is None:
+                text = text.strip()
+            else:
+                pattern, repl = step
+                text = pattern.sub(repl, text)
         return text
 
+    # 数据清理（按列向量化）
+    def clean_text_series(self, series: pd.Series) -> pd.Series:
+        """与 clean_text 规则相同，对整列文本执行"""
+        for step in CLEAN_TEXT_STEPS:
+            if step is None:
+                series = series.str.strip()
+            else:
+                pattern, repl = step
+                series = series.str.replace(pattern, repl, regex=True)
+        return series
+
+    @staticmethod
+    def _text_column(df, column):
+        """取出文本列（等价于逐行 str(row.get(column, ""))），列不存在时返回空字符串列"""
+        if column in df.columns:
+            values = df[column]
+            # 新版 pandas 的 astype(str) 保留缺失值为 NaN，这里与 str(nan) 一致转为 'nan'
+            return values.astype(str).where(values.notna(), 'nan')
+        return pd.Series("", index=df.index, dtype=object)
+
+    # 处理2022年招聘数据（单个数据块）
+    def _process_2022_frame(self, df):
+        """按列处理2022年数据块，返回记录列表"""
+        processed = pd.DataFrame({
+            "job_title": self._text_column(df, "岗位名称"),
+            "company_name": self._text_column(df, "公司名称"),
+            "salary_range": self._text_column(df, "薪资"),
+            "location": self._text_column(df, "城市"),
+            "openings": "1",
+            "requirements": self.clean_text_series(
+                self._text_column(df, "职位详情") + self._text_column(df, "基本要求")),
+            "search_keyword": self._text_column(df, "公司行业"),
+            "data_year": 2022
+        }, index=df.index)
+        return processed.to_dict('records')
+
     # 处理2022年招聘数据
     def load_and_process_2022_data(self,csv_file):
         """
-        数据加载和处理函数
+        数据加载和处理函数（按列向量化处理）
         :param csv_file: CSV文件路径
         :return: 处理后的数据列表
         """
+        return list(self.iter_2022_data(csv_file, chunk_size=None))
 
-        def process_row(row):
-            """内部函数：处理单行数据"""
-            return {
-                "job_title": str(row.get("岗位名称", "")),
-                "company_name": str(row.get("公司名称", "")),
-                "salary_range": str(row.get("薪资", "")),
-                "location": str(row.get("城市", "")),
-                "openings": "1",
-                "requirements": self.clean_text(str(row.get('职位详情', '')) + str(row.get('基本要求', ''))),
-                "search_keyword": str(row.get("公司行业", "")),
-                "data_year": 2022
-            }
-
+    # 分块流式处理2022年招聘数据
+    def iter_2022_data(self, csv_file, chunk_size=None):
+        """
+        分块读取2022年CSV并逐条产出处理后的记录
+        :param csv_file: CSV文件路径
+        :param chunk_size: 每块行数（None 表示一次读完）
+        """
         try:
             # 读取数据
-            df = pd.read_csv(csv_file)
-
-            # 处理并返回数据
-            return [process_row(row) for _, row in df.iterrows()]
+            for chunk in self._read_csv_chunks(csv_file, chunk_size):
+                yield from self._process_2022_frame(chunk)
 
         except FileNotFoundError:
             raise Exception(f"文件未找到: {csv_file}")
@@ -71,10 +170,43 @@ class DataStorage:
         except Exception as e:
             raise Exception(f"数据处理失败: {str(e)}")
 
+    # 分块读取CSV
+    def _read_csv_chunks(self, csv_file, chunk_size, **kwargs):
+        """chunk_size 为 None 时一次读完，否则按块读取"""
+        if chunk_size is None:
+            yield pd.read_csv(csv_file, **kwargs)
+        else:
+            yield from pd.read_csv(csv_file, chunksize=chunk_size, **kwargs)
+
+    # 处理2023年招聘数据（单个数据块）
+    def _process_2023_frame(self, df):
+        """按列处理2023年数据块（空值填充为空字符串），返回记录列表"""
+        df = df.fillna('')
+        # 合并关键词和行业信息（行业信息只取第一部分）
+        keywords = self._text_column(df, "关键词").str.replace("\n", ", ", regex=False)
+        industry = self._text_column(df, "int")
+        first_part = industry.str.split().str[0].fillna("")
+        requirements = keywords.where(first_part == "", keywords + ", 行业: " + first_part)
+
+        # 处理地点字段（只取第一部分，空字符串得到空地点）
+        location = self._text_column(df, "d").str.split().str[0].fillna("")
+
+        processed = pd.DataFrame({
+            "job_title": self._text_column(df, "名称"),  # 强制转为字符串
+            "company_name": self._text_column(df, "名称3"),  # 强制转为字符串
+            "salary_range": self._text_column(df, "sal"),  # 强制转为字符串
+            "location": location,
+            "openings": 1,
+            "requirements": requirements,
+            "search_keyword": industry,  # 强制转为字符串
+            "data_year": 2023
+        }, index=df.index)
+        return processed.to_dict('records')
+
     # 处理2023年招聘数据
     def load_and_process_2023_data(self,file_path):
         """
-        使用pandas从Excel文件读取数据并处理成所需格式（修复NaN问题）
+        使用pandas从Excel文件读取数据并处理成所需格式（修复NaN问题，按列向量化处理）
 
         参数:
             file_path: Excel文件路径
@@ -82,78 +214,61 @@ class DataStorage:
         返回:
             处理后的数据列表，每个元素是一个字典
         """
+        return list(self.iter_2023_data(file_path, chunk_size=None))
+
+    # 流式处理2023年招聘数据
+    def iter_2023_data(self, file_path, chunk_size=None):
+        """
+        读取2023年Excel并分块产出处理后的记录
+        Excel 不支持分块读取，单个文件会整体读入，处理与产出按块进行
+        :param file_path: Excel文件路径
+        :param chunk_size: 每块行数（None 表示整体处理）
+        """
         # 读取数据并填充空值为空字符串，避免NaN
         df = pd.read_excel(file_path).fillna('')
-
-        processed = []
-        for _, row in df.iterrows():
-            # 合并关键词和行业信息
-            keywords = str(row.get("关键词", "")).replace("\n", ", ")
-            industry = str(row.get("int", ""))
-
-            # 提取行业信息的第一部分
-            if industry:
-                first_part = industry.split()[0] if industry else ""
-                requirements = f"{keywords}, 行业: {first_part}" if first_part else keywords
-            else:
-                requirements = keywords
-
-            # 处理地点字段（避免空字符串split报错）
-            d_value = str(row.get("d", ""))
-            d_parts = d_value.split()
-            location = d_parts[0] if d_parts else ""
-
-            processed_item = {
-                "job_title": str(row.get("名称", "")),  # 强制转为字符串
-                "company_name": str(row.get("名称3", "")),  # 强制转为字符串
-                "salary_range": str(row.get("sal", "")),  # 强制转为字符串
-                "location": location,
-                "openings": 1,
-                "requirements": requirements,
-                "search_keyword": str(row.get("int", "")),  # 强制转为字符串
-                "data_year": 2023
-            }
-            processed.append(processed_item)
-
-        return processed
+        step = chunk_size or max(len(df), 1)
+        for start in range(0, len(df), step):
+            yield from self._process_2023_frame(df.iloc[start:start + step])
+
+    # 处理2024年招聘数据（单个数据块）
+    def _process_2024_frame(self, df):
+        """按列处理2024年数据块，返回记录列表"""
+        df = df.fillna('')
+        processed = pd.DataFrame({
+            "job_title": self._text_column(df, "职业名称"),
+            "company_name": self._text_column(df, "公司名称"),
+            # 薪资处理（示例：15-25K·13薪 -> 15-25K）
+            "salary_range": self._text_column(df, "薪资").str.split("·").str[0],
+            # 从地址字段提取城市（取前两个字符）
+            "location": self._text_column(df, "地址").str[:2],
+            "openings": "1",
+            "requirements": (self._text_column(df, "资历") + "|" + self._text_column(df, "学历要求")
+                             + "|" + self._text_column(df, "职业简介")),
+            "search_keyword": self._text_column(df, "公司类型"),
+            "data_year": 2024
+        }, index=df.index)
+        return processed.to_dict('records')
 
     # 处理2024年招聘数据
     def load_and_process_2024_data(self,csv_file):
         """
-        2024版招聘数据处理函数
+        2024版招聘数据处理函数（按列向量化处理）
         :param csv_file: CSV文件路径
         :return: 处理后的数据列表
         """
+        return list(self.iter_2024_data(csv_file, chunk_size=None))
 
-        def process_row(row):
-            """处理单行数据"""
-            # 薪资处理（示例：15-25K·13薪 -> 15-25K）
-            salary = row.get("薪资", "").split("·")[0]
-
-            return {
-                "job_title": row.get("职业名称", ""),
-                "company_name": row.get("公司名称", ""),
-                "salary_range": salary,
-                "location": extract_city(row.get("地址", "")),  # 提取城市
-                "openings": "1",
-                "requirements": f"{row.get('资历', '')}|{row.get('学历要求', '')}|{row.get('职业简介', '')}",
-                "search_keyword": row.get("公司类型", ""),
-                "data_year": 2024
-            }
-
-        def extract_city(address):
-            """从地址字段提取城市"""
-            if not address:
-                return ""
-            # 示例处理逻辑（可根据实际情况调整）
-            return address[:2] if len(address) >= 2 else address
-
+    # 分块流式处理2024年招聘数据
+    def iter_2024_data(self, csv_file, chunk_size=None):
+        """
+        分块读取2024年CSV并逐条产出处理后的记录
+        :param csv_file: CSV文件路径
+        :param chunk_size: 每块行数（None 表示一次读完）
+        """
         try:
             # 读取数据（指定编码格式）
-            df = pd.read_csv(csv_file, encoding='gbk')
-
-            # 处理并返回数据
-            return [process_row(row) for _, row in df.iterrows()]
+            for chunk in self._read_csv_chunks(csv_file, chunk_size, encoding='gbk'):
+                yield from self._process_2024_frame(chunk)
 
         except FileNotFoundError:
             raise Exception(f"文件未找到: {csv_file}")
@@ -173,44 +288,127 @@ class DataStorage:
         返回:
             处理后的数据列表
         """
-        processed_data = []
+        return list(self.iter_2025_data(file_path))
 
-        # 加载并处理JSON数据
+    # 逐行流式处理2025年招聘数据
+    def iter_2025_data(self, file_path):
+        """
+        逐行读取JSONL文件（或采集器输出的分段压缩存储目录）并产出处理后的记录
+
+        参数:
+            file_path: JSON文件路径或分段存储目录
+        """
+        for line in self._iter_2025_lines(file_path):
+            try:
+                item = json.loads(line.strip())
+            except json.JSONDecodeError as e:
+                print(f"解析JSON出错: {e}，行内容: {line}")
+                continue
+            yield self._process_2025_item(item)
+
+    @staticmethod
+    def _iter_2025_lines(file_path):
+        """按行读取2025年数据，分段存储目录透明解压"""
+        if SegmentStore.is_store(file_path):
+            yield from SegmentStore(file_path, recover=False).iter_lines()
+            return
         with open(file_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    item = json.loads(line.strip())
-
-                    # 处理工作地点 - 只取第一个字段
-                    location = item.get("工作地点", "").split()[0] if item.get("工作地点") else ""
-
-                    # 合并职位要求为一个字符串
-                    requirements = ""
-                    if "职位要求" in item:
-                        req_parts = []
-                        if "职位描述" in item["职位要求"]:
-                            req_parts.append(item["职位要求"]["职位描述"])
-                        if "技能标签" in item["职位要求"]:
-                            req_parts.append("技能标签: " + ", ".join(item["职位要求"]["技能标签"]))
-                        if "专业技能" in item["职位要求"]:
-                            req_parts.append("专业技能: " + ", ".join(item["职位要求"]["专业技能"]))
-                        requirements = "\n".join(req_parts)
-
-                    processed_data.append({
-                        "job_title": item.get("职位名称", ""),
-                        "company_name": item.get("公司名称", ""),
-                        "salary_range": item.get("薪资范围", ""),
-                        "location": location,
-                        "openings": item.get("招聘人数", 0),
-                        "requirements": requirements,
-                        "search_keyword": item.get("搜索职位", ""),
-                        "data_year": 2025
-                    })
-
-                except json.JSONDecodeError as e:
-                    print(f"解析JSON出错: {e}，行内容: {line}")
-
-        return processed_data
+            yield from f
+
+    # 处理2025年单条数据
+    def _process_2025_item(self, item):
+        """将爬取的单条职位数据转换为入库记录"""
+        # 处理工作地点 - 只取第一个字段
+        location = item.get("工作地点", "").split()[0] if item.get("工作地点") else ""
+
+        # 合并职位要求为一个字符串
+        requirements = ""
+        if "职位要求" in item:
+            req_parts = []
+            if "职位描述" in item["职位要求"]:
+                req_parts.append(item["职位要求"]["职位描述"])
+            if "技能标签" in item["职位要求"]:
+                req_parts.append("技能标签: " + ", ".join(item["职位要求"]["技能标签"]))
+            if "专业技能" in item["职位要求"]:
+                req_parts.append("专业技能: " + ", ".join(item["职位要求"]["专业技能"]))
+            requirements = "\n".join(req_parts)
+
+        return {
+            "job_title": item.get("职位名称", ""),
+            "company_name": item.get("公司名称", ""),
+            "salary_range": item.get("薪资范围", ""),
+            "location": location,
+            "openings": item.get("招聘人数", 0),
+            "requirements": requirements,
+            "search_keyword": item.get("搜索职位", ""),
+            "data_year": 2025
+        }
+
+    # 按配置列出所有数据文件
+    def data_sources(self):
+        """
+        按年份顺序列出配置中的数据文件
+        :return: [(年份, 文件路径), ...]，2023年的多个文件各占一项
+        """
+        sources = []
+        for year in (2022, 2023, 2024, 2025):
+            files = self.config_loader.get_data_file(year)
+            if isinstance(files, str):
+                files = [files]
+            sources.extend((year, path) for path in files or [])
+        return sources
+
+    # 按年份分派到对应的流式处理函数
+    def _iter_source(self, year, path, chunk_size=None):
+        if year == 2022:
+            return self.iter_2022_data(path, chunk_size)
+        if year == 2023:
+            return self.iter_2023_data(path, chunk_size)
+        if year == 2024:
+            return self.iter_2024_data(path, chunk_size)
+        if year == 2025:
+            return self.iter_2025_data(path)
+        raise ValueError(f"不支持的数据年份: {year}")
+
+    # 按配置依次流式产出所有年份的记录
+    def iter_all_records(self, workers=None, sources=None):
+        """
+        生成器流水线：按年份依次分块读取各数据文件，逐条产出规范化后的记录
+        内存占用只与块大小有关，与数据总量无关
+        :param workers: 解析进程数（默认取配置 data_storage.workers），大于1时各文件在进程池中并行解析
+        :param sources: 要读取的 [(年份, 文件路径), ...]（默认为配置中的全部数据文件）
+        """
+        workers = self.workers if workers is None else workers
+        sources = self.data_sources() if sources is None else sources
+        self.source_rows = {}
+        if workers > 1:
+            yield from self._iter_records_parallel(workers, sources)
+            return
+        for year, path in sources:
+            self.source_rows[path] = 0
+            for record in self._iter_source(year, path, self.chunk_size):
+                self.source_rows[path] += 1
+                yield record
+
+    # 多进程并行解析各数据文件
+    def _iter_records_parallel(self, workers, sources):
+        """
+        每个数据文件作为一个任务提交到进程池（Excel解析、文本清洗为CPU密集型），
+        按完成顺序产出记录，由调用方在主进程中统一写入数据库。
+        并行模式下单个文件的结果会整体驻留内存，直到被写入
+        """
+        if not sources:
+            return
+        with ProcessPoolExecutor(max_workers=min(workers, len(sources))) as executor:
+            # 只提交可序列化的参数：DataStorage 持有的 ConfigLoader 含线程锁，无法传给子进程
+            futures = {executor.submit(_load_source, year, path, self.chunk_size, self.storage_config): (year, path)
+                       for year, path in sources}
+            for future in as_completed(futures):
+                year, path = futures[future]
+                records = future.result()
+                print(f"{year}年数据解析完成: {path}，共 {len(records)} 条")
+                self.source_rows[path] = len(records)
+                yield from records
 
     # 创建数据库中的表
     def create_job_listings_table(self,connection):
@@ -226,7 +424,17 @@ class DataStorage:
             requirements TEXT,
             search_keyword VARCHAR(100),
             data_year INT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            salary_min DOUBLE NULL COMMENT '最低月薪',
+            salary_max DOUBLE NULL COMMENT '最高月薪',
+            salary_monthly DOUBLE NULL COMMENT '折算月薪（与旧版 parse_salary 一致；年薪范围为 (下限+上限)/12，大于 salary_max）',
+            city VARCHAR(100) NULL,
+            province VARCHAR(50) NULL,
+            fingerprint CHAR(40) NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_year_salary (data_year, salary_monthly),
+            INDEX idx_year_city (data_year, city, openings),
+            INDEX idx_year_province (data_year, province, openings),
+            UNIQUE KEY uk_fingerprint (fingerprint)
         ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci
         """
         try:
@@ -237,115 +445,556 @@ class DataStorage:
         except Error as e:
             print(f"创建表失败: {e}")
             raise
+        self.ensure_salary_columns(connection)
+        self.ensure_fingerprint_column(connection)
+        self.ensure_city_column(connection)
+        self.ensure_province_column(connection)
+
+    # 旧表补充数值薪资列
+    def ensure_salary_columns(self, connection):
+        """
+        为早期创建的 job_listings 表补充 salary_min/salary_max/salary_monthly 列及索引，
+        新增列后回填已有数据
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'job_listings'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            if 'salary_monthly' in existing:
+                return
+            cursor.execute("""
+                ALTER TABLE job_listings
+                    ADD COLUMN salary_min DOUBLE NULL COMMENT '最低月薪',
+                    ADD COLUMN salary_max DOUBLE NULL COMMENT '最高月薪',
+                    ADD COLUMN salary_monthly DOUBLE NULL
+                        COMMENT '折算月薪（与旧版 parse_salary 一致；年薪范围为 (下限+上限)/12，大于 salary_max）',
+                    ADD INDEX idx_year_salary (data_year, salary_monthly)
+            """)
+        connection.commit()
+        self.backfill_salary_columns(connection)
+
+    # 回填已有数据的数值薪资列
+    def backfill_salary_columns(self, connection, batch_size=1000):
+        """
+        解析已有记录的 salary_range，回填数值薪资列
+        :param connection: 数据库连接
+        :param batch_size: 每批更新条数
+        """
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id, salary_range FROM job_listings WHERE salary_monthly IS NULL")
+            rows = cursor.fetchall()
+            updates = []
+            for row_id, salary_range in rows:
+                salary_min, salary_max, salary_monthly = default_parser.parse_range(salary_range) or (None, None, None)
+                if salary_monthly is not None:
+                    updates.append((salary_min, salary_max, salary_monthly, row_id))
+            sql = "UPDATE job_listings SET salary_min = %s, salary_max = %s, salary_monthly = %s WHERE id = %s"
+            for i in range(0, len(updates), batch_size):
+                cursor.executemany(sql, updates[i:i + batch_size])
+                connection.commit()
+        print(f"已回填 {len(updates)} 条记录的数值薪资列")
+
+    # 旧表补充内容指纹列
+    def ensure_fingerprint_column(self, connection, batch_size=1000):
+        """
+        为早期创建的 job_listings 表补充 fingerprint 列：回填已有记录的指纹，
+        删除指纹重复的旧记录（保留 id 最大的一条），再建立唯一索引
+        :param connection: 数据库连接
+        :param batch_size: 每批更新/删除条数
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'job_listings'"
+            )
+            if 'fingerprint' in {row[0] for row in cursor.fetchall()}:
+                return
+            cursor.execute("ALTER TABLE job_listings ADD COLUMN fingerprint CHAR(40) NULL")
+            connection.commit()
+
+            cursor.execute(f"SELECT id, {', '.join(FINGERPRINT_FIELDS)} FROM job_listings ORDER BY id")
+            latest = {}  # 指纹 -> 最新记录 id
+            duplicates = []
+            for row in cursor.fetchall():
+                fingerprint = self.record_fingerprint(dict(zip(FINGERPRINT_FIELDS, row[1:])))
+                if fingerprint in latest:
+                    duplicates.append(latest[fingerprint])
+                latest[fingerprint] = row[0]
+
+            for i in range(0, len(duplicates), batch_size):
+                chunk = duplicates[i:i + batch_size]
+                cursor.execute(f"DELETE FROM job_listings WHERE id IN ({', '.join(['%s'] * len(chunk))})", chunk)
+                connection.commit()
+            updates = [(fingerprint, row_id) for fingerprint, row_id in latest.items()]
+            for i in range(0, len(updates), batch_size):
+                cursor.executemany("UPDATE job_listings SET fingerprint = %s WHERE id = %s", updates[i:i + batch_size])
+                connection.commit()
+            cursor.execute("ALTER TABLE job_listings ADD UNIQUE KEY uk_fingerprint (fingerprint)")
+        connection.commit()
+        print(f"已回填 {len(updates)} 条记录的内容指纹，删除重复记录 {len(duplicates)} 条")
+
+    # 旧表补充规范化城市列
+    def ensure_city_column(self, connection, batch_size=1000):
+        """
+        为早期创建的 job_listings 表补充 city 列（规范化后的城市名）及 (data_year, city, openings) 索引，
+        新增列后按 location 回填已有数据，热力图据此在数据库端按省份汇总
+        :param connection: 数据库连接
+        :param batch_size: 每批更新条数
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'job_listings'"
+            )
+            if 'city' in {row[0] for row in cursor.fetchall()}:
+                return
+            cursor.execute("""
+                ALTER TABLE job_listings
+                    ADD COLUMN city VARCHAR(100) NULL AFTER salary_monthly,
+                    ADD INDEX idx_year_city (data_year, city, openings)
+            """)
+            connection.commit()
+
+            cursor.execute("SELECT id, location FROM job_listings")
+            updates = [(city, row_id) for row_id, city in
+                       ((row_id, normalize_location(location)) for row_id, location in cursor.fetchall())
+                       if city is not None]
+            for i in range(0, len(updates), batch_size):
+                cursor.executemany("UPDATE job_listings SET city = %s WHERE id = %s", updates[i:i + batch_size])
+                connection.commit()
+        print(f"已回填 {len(updates)} 条记录的城市列")
+
+    # 旧表补充省份列
+    def ensure_province_column(self, connection, batch_size=1000):
+        """
+        为早期创建的 job_listings 表补充 province 列（CityResolver 解析出的省份）及
+        (data_year, province, openings) 索引，新增列后按 location 回填已有数据
+        :param connection: 数据库连接
+        :param batch_size: 每批更新条数
+        """
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT COLUMN_NAME FROM information_schema.COLUMNS "
+                "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'job_listings'"
+            )
+            if 'province' in {row[0] for row in cursor.fetchall()}:
+                return
+            cursor.execute("""
+                ALTER TABLE job_listings
+                    ADD COLUMN province VARCHAR(50) NULL AFTER city,
+                    ADD INDEX idx_year_province (data_year, province, openings)
+            """)
+            connection.commit()
+
+            cursor.execute("SELECT id, location FROM job_listings")
+            rows = cursor.fetchall()
+            provinces = self.config_loader.get_city_resolver().resolve_many(
+                normalize_location(location) for _, location in rows)
+            updates = [(province, row[0]) for row, province in zip(rows, provinces) if province is not None]
+            for i in range(0, len(updates), batch_size):
+                cursor.executemany("UPDATE job_listings SET province = %s WHERE id = %s", updates[i:i + batch_size])
+                connection.commit()
+        print(f"已回填 {len(updates)} 条记录的省份列")
+
+    # 解析薪资，补充数值薪资字段
+    def add_salary_columns(self, data):
+        """
+        为每条记录补充 salary_min、salary_max、salary_monthly 数值字段（无法解析为 None）
+        :param data: 待存储的数据列表
+        :return: 补充字段后的数据列表
+        """
+        for item in data:
+            item["salary_min"], item["salary_max"], item["salary_monthly"] = (
+                default_parser.parse_range(item["salary_range"]) or (None, None, None)
+            )
+        return data
+
+    @staticmethod
+    def record_fingerprint(item):
+        """计算记录的内容指纹（FINGERPRINT_FIELDS 拼接后的 SHA-1）"""
+        key = "\x1f".join("" if item.get(field) is None else str(item.get(field)) for field in FINGERPRINT_FIELDS)
+        return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+    # 入库前补充派生字段
+    def prepare_records(self, data):
+        """
+        为每条记录补充数值薪资列、规范化城市名、所属省份和内容指纹
+        :param data: 待存储的数据列表
+        :return: 补充字段后的数据列表
+        """
+        self.add_salary_columns(data)
+        resolver = self.config_loader.get_city_resolver()
+        for item in data:
+            item["city"] = normalize_location(item["location"])
+            item["province"] = resolver.resolve(item["city"])
+            item["fingerprint"] = self.record_fingerprint(item)
+        return data
+
+    # 建立数据库连接
+    def connect(self):
+        """根据配置建立数据库连接"""
+        return pymysql.connect(**self.db_config)
+
+    # 确保数据表存在（每个实例只执行一次建表语句）
+    def ensure_table(self, connection):
+        if not self._table_ready:
+            self.create_job_listings_table(connection)
+            self._table_ready = True
+
+    @staticmethod
+    def _record_values(item):
+        """将一条记录转换为与 INSERT_COLUMNS 对应的参数元组"""
+        return (
+            item["job_title"],
+            item["company_name"],
+            item["salary_range"],
+            item["location"],
+            item["openings"],
+            item["requirements"],
+            item["search_keyword"],
+            item["data_year"],
+            item.get("salary_min"),
+            item.get("salary_max"),
+            item.get("salary_monthly"),
+            item.get("city"),
+            item.get("province"),
+            item.get("fingerprint")
+        )
+
+    # 多行 VALUES 批量插入
+    def _insert_bulk(self, cursor, data):
+        """
+        每 bulk_rows 行拼成一条 INSERT ... VALUES (...), (...) 语句执行，指纹已存在的记录就地更新
+        :param cursor: 数据库游标
+        :param data: 要存储的数据列表
+        """
+        placeholder = "(" + ", ".join(["%s"] * len(INSERT_COLUMNS)) + ")"
+        base_sql = f"INSERT INTO job_listings ({', '.join(INSERT_COLUMNS)}) VALUES "
+        for start in range(0, len(data), self.bulk_rows):
+            chunk = data[start:start + self.bulk_rows]
+            params = [value for item in chunk for value in self._record_values(item)]
+            cursor.execute(base_sql + ", ".join([placeholder] * len(chunk)) + UPSERT_CLAUSE, params)
 
     # 数据写入数据库，
-    def save_to_database(self, data, db_config):
+    def save_to_database(self, data, db_config=None, connection=None):
         """
         :param data: 要存储的数据列表
-        param db_config: 数据库配置字典
+        param db_config: 数据库配置字典（默认使用配置文件中的数据库配置）
+        :param connection: 复用的数据库连接；为空时新建连接并在写入后关闭
         """
-        connection = None
+        own_connection = connection is None
         try:
             # 建立数据库连接
-            connection = pymysql.connect(**db_config)
+            if own_connection:
+                connection = pymysql.connect(**(db_config or self.db_config))
             # 创建数据表
-            self.create_job_listings_table(connection)
+            self.ensure_table(connection)
 
             # 执行数据插入
             with connection.cursor() as cursor:
-                sql = """INSERT INTO job_listings 
-                         (job_title, company_name, salary_range, location, openings, 
-                          requirements, search_keyword, data_year) 
-                         VALUES (%s, %s, %s, %s, %s, %s, %s, %s)"""
-
-                for item in data:
-                    cursor.execute(sql, (
-                        item["job_title"],
-                        item["company_name"],
-                        item["salary_range"],
-                        item["location"],
-                        item["openings"],
-                        item["requirements"],
-                        item["search_keyword"],
-                        item["data_year"]
-                    ))
+                if self.insert_mode == 'bulk':
+                    self._insert_bulk(cursor, data)
+                else:
+                    sql = f"""INSERT INTO job_listings ({', '.join(INSERT_COLUMNS)})
+                             VALUES ({', '.join(['%s'] * len(INSERT_COLUMNS))}){UPSERT_CLAUSE}"""
+                    for item in data:
+                        cursor.execute(sql, self._record_values(item))
 
             connection.commit()
-            print(f"成功插入 {len(data)} 条数据")
+            if self.insert_mode != 'bulk':
+                print(f"成功插入 {len(data)} 条数据")
 
         except Error as e:
+            if not own_connection:
+                try:
+                    connection.rollback()
+                except Error:
+                    pass
             raise Exception(f"数据库操作失败: {str(e)}")
         finally:
-            if connection:
+            if own_connection and connection:
                 connection.close()
 
     # 所有数据分批次存储
-    def batch_save_to_database(self,data, batch_size=1000, max_retries=3):
+    def batch_save_to_database(self,data, batch_size=None, max_retries=None):
         """
         分批次存储数据到数据库
-        :param data: 待存储的数据列表
-        :param batch_size: 每批数据量（默认100条）
-        :param max_retries: 失败最大重试次数
+        bulk 模式下所有批次复用同一个连接；row 模式每批新建连接逐行写入
+        :param data: 待存储的数据列表或记录生成器（流式写入，每凑满一批即写入）
+        :param batch_size: 每批数据量（默认取配置 data_storage.batch_size）
+        :param max_retries: 失败最大重试次数（默认取配置 data_storage.max_retries）
+        :return: 成功写入的条数（失败跳过的批次数记录在 self.failed_batches）
         """
+        batch_size = batch_size or self.batch_size
+        max_retries = self.max_retries if max_retries is None else max_retries
+        connection = self.connect() if self.insert_mode == 'bulk' else None
 
         def save_batch(batch_data, attempt=1):
             """单批次存储函数"""
             try:
-                self.save_to_database(batch_data)
+                self.save_to_database(batch_data, connection=connection)
                 return True
             except Exception as e:
                 if attempt <= max_retries:
                     print(f"批次存储失败，正在重试({attempt}/{max_retries})...")
+                    if connection:
+                        try:
+                            connection.ping(reconnect=True)  # 连接断开时自动重连
+                        except Error:
+                            pass
                     return save_batch(batch_data, attempt + 1)
                 print(f"最终存储失败: {str(e)}")
                 return False
 
-        # 计算总批次数
-        total_batches = math.ceil(len(data) / batch_size)
         success_count = 0  # 成功写入的条数计数器
-        # 使用进度条可视化
-        with tqdm(total=len(data), desc="数据存储进度") as pbar:
-            for i in range(total_batches):
-                start_idx = i * batch_size
-                end_idx = min((i + 1) * batch_size, len(data))
-                batch = data[start_idx:end_idx]
-
-                if save_batch(batch):
-                    pbar.update(len(batch))
-                    success_count += len(batch)
-                else:
-                    # 失败处理（可记录到日志或错误列表）
-                    print(f"批次 {i + 1} 存储失败，跳过该批次")
-            # 打印总数据写入条数
-        print(f"数据存储完成，成功写入 {success_count} 条数据")
+        self.failed_batches = 0
+        start_time = time.time()
+        try:
+            # 使用进度条可视化（数据为生成器时总数未知）
+            total = len(data) if hasattr(data, '__len__') else None
+            with tqdm(total=total, desc="数据存储进度") as pbar:
+                for i, batch in enumerate(self._iter_batches(data, batch_size)):
+                    # 入库前一次性解析薪资、计算内容指纹
+                    self.prepare_records(batch)
+
+                    if save_batch(batch):
+                        pbar.update(len(batch))
+                        success_count += len(batch)
+                    else:
+                        # 失败处理（可记录到日志或错误列表）
+                        print(f"批次 {i + 1} 存储失败，跳过该批次")
+                        self.failed_batches += 1
+        finally:
+            if connection:
+                connection.close()
+        # 打印总数据写入条数及写入速度
+        elapsed = time.time() - start_time
+        rate = success_count / elapsed if elapsed > 0 else 0
+        print(f"数据存储完成，成功写入 {success_count} 条数据，耗时 {elapsed:.2f} 秒（{rate:.0f} 条/秒）")
+        return success_count
+
+    @staticmethod
+    def _iter_batches(data, batch_size):
+        """将列表或生成器按 batch_size 切分为批次列表"""
+        iterator = iter(data)
+        while batch := list(islice(iterator, batch_size)):
+            yield batch
+
+    @staticmethod
+    def _tsv_field(value):
+        """按 LOAD DATA 默认格式转义单个字段（None 写为 \\N）"""
+        if value is None:
+            return '\\N'
+        return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+                .replace('\n', '\\n').replace('\r', '\\r').replace('\0', '\\0'))
+
+    # 导出二级索引定义并删除
+    def _drop_secondary_indexes(self, cursor):
+        """
+        删除 job_listings 的非唯一二级索引，返回重建所需的索引定义
+        （唯一索引保留，供 LOAD DATA ... REPLACE 按指纹去重）
+        :return: [(索引名, 是否唯一, [列定义, ...]), ...]
+        """
+        cursor.execute("SHOW INDEX FROM job_listings")
+        columns = [desc[0] for desc in cursor.description]
+        indexes = {}
+        for row in cursor.fetchall():
+            info = dict(zip(columns, row))
+            if info['Key_name'] == 'PRIMARY' or not int(info['Non_unique']):
+                continue
+            column = f"`{info['Column_name']}`"
+            if info.get('Sub_part'):
+                column += f"({info['Sub_part']})"
+            entry = indexes.setdefault(info['Key_name'], [not int(info['Non_unique']), {}])
+            entry[1][int(info['Seq_in_index'])] = column
+        definitions = [(name, unique, [cols[i] for i in sorted(cols)])
+                       for name, (unique, cols) in indexes.items()]
+        if definitions:
+            cursor.execute("ALTER TABLE job_listings " +
+                           ", ".join(f"DROP INDEX `{name}`" for name, _, _ in definitions))
+        return definitions
+
+    # 重建二级索引
+    def _rebuild_indexes(self, cursor, definitions):
+        if definitions:
+            cursor.execute("ALTER TABLE job_listings " + ", ".join(
+                f"ADD {'UNIQUE ' if unique else ''}INDEX `{name}` ({', '.join(cols)})"
+                for name, unique, cols in definitions
+            ))
+
+    @staticmethod
+    def _parse_tsv_field(field):
+        """还原 _tsv_field 写出的字段（\\N 为 None）"""
+        if field == '\\N':
+            return None
+        return _TSV_ESCAPE.sub(lambda m: TSV_ESCAPES.get(m.group(1), m.group(1)), field)
+
+    def _iter_tsv_records(self, tsv_path):
+        """逐行读回临时 TSV 文件中的记录（LOAD DATA 被拒绝时回退写入用）"""
+        with open(tsv_path, 'r', encoding='utf-8', newline='') as f:
+            for line in f:
+                fields = line.rstrip('\n').split('\t')
+                yield dict(zip(INSERT_COLUMNS, (self._parse_tsv_field(field) for field in fields)))
 
-    # 修改数据加载逻辑，从配置文件获取路径
-    def main(self):
+    # LOAD DATA LOCAL INFILE 全量重建
+    def load_infile(self, data):
+        """
+        全量重建 job_listings：记录写入临时 TSV 文件后清空表并用 LOAD DATA LOCAL INFILE 导入，
+        导入期间删除非唯一二级索引，导入后重建；指纹重复的记录以 REPLACE 方式保留最后一条。
+        服务器未开启 local_infile 时在清空表之前回退到分批 INSERT（bulk 模式）；
+        导入仍被拒绝（表已清空、生成器已被消费）时读回临时文件以 bulk 模式重新写入
+        :param data: 待存储的数据列表或记录生成器（逐批写入临时文件，不整体驻留内存）
+        :return: 成功写入的条数
+        """
+        start_time = time.time()
+
+        connection = pymysql.connect(**self.db_config, local_infile=True)
+        fd, tsv_path = tempfile.mkstemp(prefix='job_listings_', suffix='.tsv')
+        tsv_written = False  # 临时文件是否已完整写出
         try:
-            # **关键修改：通过config_loader获取文件路径**
-            # 2022年数据
-            file_2022 = self.config_loader.get_data_file(2022)
-            processed_2022 = self.load_and_process_2022_data(file_2022) if file_2022 else []
+            self.ensure_table(connection)
+            with connection.cursor() as cursor:
+                cursor.execute("SHOW VARIABLES LIKE 'local_infile'")
+                row = cursor.fetchone()
+            if not row or str(row[1]).upper() not in ('ON', '1'):
+                print("服务器未开启 local_infile，回退到分批 INSERT 写入")
+                return self._fallback_bulk(connection, data)
+
+            # 写入临时 TSV 文件（入库前一次性解析薪资、计算内容指纹）
+            with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+                fd = None
+                with tqdm(desc="生成导入文件") as pbar:
+                    for batch in self._iter_batches(data, self.batch_size):
+                        self.prepare_records(batch)
+                        f.writelines('\t'.join(self._tsv_field(v) for v in self._record_values(item)) + '\n'
+                                     for item in batch)
+                        pbar.update(len(batch))
+            tsv_written = True
+
+            with connection.cursor() as cursor:
+                cursor.execute("TRUNCATE TABLE job_listings")
+                # 保持 unique_checks 开启，否则 REPLACE 无法可靠识别重复指纹
+                cursor.execute("SET foreign_key_checks = 0")
+                definitions = self._drop_secondary_indexes(cursor)
+                try:
+                    cursor.execute(
+                        f"""LOAD DATA LOCAL INFILE %s REPLACE INTO TABLE job_listings
+                            CHARACTER SET utf8mb4
+                            FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\'
+                            LINES TERMINATED BY '\\n'
+                            ({', '.join(INSERT_COLUMNS)})""",
+                        (tsv_path,)
+                    )
+                    loaded = cursor.rowcount
+                    connection.commit()
+                finally:
+                    print("正在重建索引...")
+                    self._rebuild_indexes(cursor, definitions)
+                    cursor.execute("SET foreign_key_checks = 1")
+        except Error as e:
+            if e.args and e.args[0] in LOCAL_INFILE_ERRORS:
+                # 生成器数据写入临时文件后已被消费，从临时文件读回记录重新写入
+                if tsv_written:
+                    print(f"LOAD DATA LOCAL INFILE 被拒绝（{e}），读回导入文件并回退到分批 INSERT 写入")
+                    return self._fallback_bulk(connection, self._iter_tsv_records(tsv_path))
+                if isinstance(data, list):
+                    print(f"LOAD DATA LOCAL INFILE 被拒绝（{e}），回退到分批 INSERT 写入")
+                    return self._fallback_bulk(connection, data)
+            raise Exception(f"数据库操作失败: {str(e)}")
+        finally:
+            if fd is not None:
+                os.close(fd)
+            os.remove(tsv_path)
+            connection.close()
+
+        elapsed = time.time() - start_time
+        rate = loaded / elapsed if elapsed > 0 else 0
+        print(f"数据导入完成，成功写入 {loaded} 条数据，耗时 {elapsed:.2f} 秒（{rate:.0f} 条/秒）")
+        return loaded
+
+    # local infile 不可用时回退到批量 INSERT
+    def _fallback_bulk(self, connection, data):
+        with connection.cursor() as cursor:
+            cursor.execute("TRUNCATE TABLE job_listings")
+        insert_mode, self.insert_mode = self.insert_mode, 'bulk'
+        try:
+            return self.batch_save_to_database(data)
+        finally:
+            self.insert_mode = insert_mode
+
+    # 按写入模式存储数据
+    def store(self, data):
+        """
+        按配置的写入模式存储数据：infile 模式全量重建，其余模式分批写入
+        :param data: 待存储的数据列表
+        :return: 成功写入的条数
+        """
+        self.failed_batches = 0  # 上一次写入（或 infile 回退）的结果不影响本次判断
+        if self.insert_mode == 'infile':
+            return self.load_infile(data)
+        return self.batch_save_to_database(data)
 
-            # 2023年数据（多个文件）
-            files_2023 = self.config_loader.get_data_file(2023)
-            processed_2023 = [self.load_and_process_2023_data(f) for f in files_2023] if files_2023 else []
-            processed_2023y, processed_2023z = processed_2023 if len(processed_2023) >= 2 else ([], [])
+    # 筛选自上次入库后有变化的数据文件
+    def changed_sources(self, sources=None):
+        """
+        :param sources: [(年份, 文件路径), ...]（默认为配置中的全部数据文件）
+        :return: 清单中没有记录或内容已变化的数据文件
+        """
+        sources = self.data_sources() if sources is None else sources
+        changed = []
+        for year, path in sources:
+            if self.manifest.is_unchanged(path):
+                print(f"{year}年数据文件未变化，跳过: {path}")
+            else:
+                changed.append((year, path))
+        return changed
 
-            # 2024年数据
-            file_2024 = self.config_loader.get_data_file(2024)
-            processed_2024 = self.load_and_process_2024_data(file_2024) if file_2024 else []
+    # 修改数据加载逻辑，从配置文件获取路径
+    def main(self, force=False):
+        """
+        增量入库：只读取内容有变化的数据文件，按指纹 upsert，重复执行结果不变。
+        infile 模式为全量重建，始终读取全部文件
+        :param force: 忽略入库清单，重新读取全部数据文件（如数据库被清空后）
+        """
+        try:
+            # **关键修改：通过config_loader获取文件路径**
+            full_rebuild = force or self.insert_mode == 'infile'
+            if full_rebuild:
+                self.manifest.clear()
+                sources = self.data_sources()
+            else:
+                sources = self.changed_sources()
+            if not sources:
+                print("所有数据文件均未变化，无需入库")
+                return
 
-            # 2025年数据
-            file_2025 = self.config_loader.get_data_file(2025)
-            processed_2025 = self.load_and_process_2025_data(file_2025) if file_2025 else []
+            # 读取前记录各文件状态：入库期间被追加的内容不会被记为已入库
+            snapshots = {path: self.manifest.snapshot(path) for _, path in sources}
 
-            # 合并数据（示例去重逻辑）
-            all_data = processed_2022 + processed_2023y + processed_2023z + processed_2024 + processed_2025
+            # 各年份数据以生成器流式产出，边读取边分批写入数据库
+            self.store(self.iter_all_records(sources=sources))
 
-            # 分批次存储
-            self.batch_save_to_database(all_data, batch_size=1000)
+            # 全部批次写入成功后才更新清单，失败的文件下次重新入库（upsert 保证重复写入无副作用）
+            if self.failed_batches:
+                print(f"{self.failed_batches} 个批次写入失败，入库清单未更新")
+                return
+            for _, path in sources:
+                self.manifest.record(path, snapshots[path], self.source_rows.get(path))
+            self.manifest.save()
 
         except Exception as e:
             print(f"流程执行失败: {str(e)}")
 
+
+# 进程池任务：在子进程中完整解析单个数据文件
+def _load_source(year, path, chunk_size, storage_config):
+    """
+    :param year: 数据年份
+    :param path: 数据文件路径
+    :param chunk_size: 读取时每块行数
+    :param storage_config: data_storage 配置字典
+    :return: 该文件的全部记录
+    """
+    return list(DataStorage.for_parsing(storage_config)._iter_source(year, path, chunk_size))
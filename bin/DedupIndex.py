@@ -0,0 +1,186 @@
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import struct
+from array import array
+from bisect import bisect_left
+
+
+def _job_key(job):
+    """默认去重键：(职位名称, 公司名称)"""
+    return job["职位名称"], job["公司名称"]
+
+
+# 持久化去重索引
+class DedupIndex:
+    """
+    职位去重索引：每个去重键只保存一个 64 位哈希（blake2b），磁盘上为升序排列的 uint64 数组，
+    启动时直接 mmap 映射，无需重新解析 JSONL；查找为二分查找。
+    本次运行新增的键暂存在内存中，save() 时与磁盘数组归并后原子写回
+
+    索引文件格式：文件头 (MAGIC, 已覆盖的数据文件字节数或分段记录数, 哈希个数) + 升序 uint64 数组
+    """
+
+    MAGIC = b'JOBIDX01'
+    HEADER = struct.Struct('<8sQQ')
+
+    def __init__(self, data_file, index_file=None, key_func=_job_key, store=None):
+        """
+        :param data_file: 被索引的 JSONL 数据文件（或分段存储目录）
+        :param index_file: 索引文件路径（默认为 数据文件名.idx）
+        :param key_func: 从一条记录中取去重键的函数
+        :param store: 分段存储（SegmentStore）；给定时按记录号而不是字节数记录已覆盖的数据
+        """
+        self.data_file = data_file
+        self.store = store
+        self.index_file = index_file or f"{data_file}.idx"
+        self.key_func = key_func
+        self._file = None
+        self._mmap = None
+        self._base = ()  # 磁盘上的升序哈希数组（mmap 视图）
+        self._tail = set()  # 本次运行新增、尚未写回的哈希
+        self._covered = 0  # 索引已覆盖的数据文件字节数（分段存储为记录数）
+        self._open()
+
+    @staticmethod
+    def key_hash(key):
+        """将去重键转换为 64 位哈希（字段为 None 时按空字符串处理，如接口返回的 null 公司名）"""
+        text = '\x1f'.join('' if part is None else str(part) for part in key)
+        digest = hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'little')
+
+    def _data_size(self):
+        """数据当前大小：JSONL 文件为字节数，分段存储为记录数"""
+        if self.store is not None:
+            return self.store.size()
+        return os.path.getsize(self.data_file) if os.path.exists(self.data_file) else 0
+
+    def _iter_data(self, offset):
+        """从 offset（字节数或记录号）处开始产出记录"""
+        if self.store is not None:
+            yield from self.store.iter_records(offset)
+            return
+        if not os.path.exists(self.data_file):
+            return
+        with open(self.data_file, 'rb') as f:
+            f.seek(offset)
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+    def _open(self):
+        """映射索引文件；索引不存在、损坏或与数据文件不一致时重建，数据文件有追加时补齐"""
+        data_size = self._data_size()
+        if not self._map_index() or self._covered > data_size:
+            self.rebuild()
+        elif self._covered < data_size:
+            # 上次运行未写回索引（如异常退出），只补扫新增部分
+            added = self._scan(self._covered)
+            print(f"去重索引补齐 {added} 条记录")
+
+    def _map_index(self):
+        """
+        映射已有索引文件
+        :return: 是否映射成功
+        """
+        try:
+            size = os.path.getsize(self.index_file)
+        except OSError:
+            return False
+        if size < self.HEADER.size:
+            return False
+        with open(self.index_file, 'rb') as f:
+            magic, covered, count = self.HEADER.unpack(f.read(self.HEADER.size))
+        if magic != self.MAGIC or size != self.HEADER.size + count * 8:
+            print(f"去重索引 {self.index_file} 已损坏，将重建")
+            return False
+        self._covered = covered
+        if count:
+            self._file = open(self.index_file, 'rb')
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self._base = memoryview(self._mmap)[self.HEADER.size:].cast('Q')
+        return True
+
+    def _unmap(self):
+        """释放 mmap 映射（替换索引文件前必须先释放）"""
+        if isinstance(self._base, memoryview):
+            self._base.release()
+        self._base = ()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _scan(self, offset=0):
+        """
+        从数据文件的 offset 处开始读取记录加入索引
+        :return: 新增的键数
+        """
+        added = 0
+        for record in self._iter_data(offset):
+            try:
+                key = self.key_func(record)
+            except (KeyError, TypeError):  # 缺少字段或不是对象的记录
+                continue
+            if key not in self:
+                self.add(key)
+                added += 1
+        return added
+
+    def rebuild(self):
+        """全量扫描数据文件重建索引"""
+        self._unmap()
+        self._tail = set()
+        self._covered = 0
+        added = self._scan()
+        self.save()
+        print(f"去重索引已重建，共 {added} 条记录")
+
+    def __contains__(self, key):
+        value = self.key_hash(key)
+        if value in self._tail:
+            return True
+        i = bisect_left(self._base, value)
+        return i < len(self._base) and self._base[i] == value
+
+    def add(self, key):
+        """加入一个去重键（调用方需先确认键不存在）"""
+        self._tail.add(self.key_hash(key))
+
+    def __len__(self):
+        return len(self._base) + len(self._tail)
+
+    def save(self):
+        """将新增的哈希与磁盘数组归并后原子写回索引文件，并记录已覆盖的数据文件大小"""
+        covered = self._data_size()
+        if not self._tail and covered == self._covered and os.path.exists(self.index_file):
+            return
+        count = len(self)
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, covered, count))
+            buffer = array('Q')
+            for value in heapq.merge(self._base, sorted(self._tail)):
+                buffer.append(value)
+                if len(buffer) >= 65536:
+                    buffer.tofile(f)
+                    buffer = array('Q')
+            buffer.tofile(f)
+        self._unmap()
+        os.replace(tmp_file, self.index_file)
+        self._tail = set()
+        self._map_index()
+
+    def close(self):
+        """写回索引并释放映射"""
+        self.save()
+        self._unmap()
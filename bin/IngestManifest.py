@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+import time
+
+
+# 数据文件入库清单
+class IngestManifest:
+    """
+    记录已入库数据文件的大小、修改时间和内容哈希，用于增量入库时跳过未变化的文件
+
+    清单以 JSON 保存，结构为 {文件路径: {"size", "mtime", "sha256", "rows", "ingested_at"}}
+    """
+
+    def __init__(self, manifest_file='data/ingest_manifest.json'):
+        """
+        :param manifest_file: 清单文件路径
+        """
+        self.manifest_file = manifest_file
+        self.entries = self._load()
+
+    def _load(self):
+        """读取清单文件，不存在或损坏时返回空清单"""
+        try:
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except ValueError as e:
+            print(f"入库清单解析失败，将重新全量入库: {e}")
+            return {}
+
+    def save(self):
+        """写入清单文件（先写临时文件再替换，避免中途中断写坏清单）"""
+        directory = os.path.dirname(self.manifest_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.manifest_file}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.manifest_file)
+
+    @staticmethod
+    def _tracked_file(path):
+        """实际用于比较的文件：分段存储目录以其 index.json 为准（新增分段时必然更新）"""
+        if os.path.isdir(path):
+            return os.path.join(path, 'index.json')
+        return path
+
+    @staticmethod
+    def file_hash(path, block_size=1 << 20):
+        """分块计算文件内容的 SHA-256"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while block := f.read(block_size):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def is_unchanged(self, path):
+        """
+        判断文件自上次入库后是否未变化
+        大小和修改时间都相同时直接视为未变化；修改时间变化但内容哈希相同时同样视为未变化
+        :param path: 数据文件路径
+        """
+        entry = self.entries.get(path)
+        tracked = self._tracked_file(path)
+        if not entry or not os.path.exists(tracked):
+            return False
+        stat = os.stat(tracked)
+        if stat.st_size != entry.get('size'):
+            return False
+        if stat.st_mtime == entry.get('mtime'):
+            return True
+        if self.file_hash(tracked) == entry.get('sha256'):
+            # 仅修改时间变化（如重新拷贝），刷新记录避免下次再算哈希
+            entry['mtime'] = stat.st_mtime
+            return True
+        return False
+
+    def snapshot(self, path):
+        """
+        在读取文件前记录其大小、修改时间和内容哈希，入库成功后以此更新清单：
+        读取期间文件被追加写入时，清单中的记录与文件不一致，下次会重新入库新增的部分
+        :param path: 数据文件路径
+        :return: {"size", "mtime", "sha256"}，文件不存在时返回 None
+        """
+        tracked = self._tracked_file(path)
+        try:
+            stat = os.stat(tracked)
+            sha256 = self.file_hash(tracked)
+        except FileNotFoundError:
+            return None
+        return {'size': stat.st_size, 'mtime': stat.st_mtime, 'sha256': sha256}
+
+    def record(self, path, snapshot, rows=None):
+        """
+        记录文件已成功入库
+        :param path: 数据文件路径
+        :param snapshot: 读取前由 snapshot() 取得的文件状态，为 None 时不记录
+        :param rows: 该文件产出的记录数
+        """
+        if snapshot is None:
+            return
+        self.entries[path] = dict(snapshot, rows=rows, ingested_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+
+    def clear(self):
+        """清空清单（全量重建时使用）"""
+        self.entries = {}
@@ -1,19 +1,83 @@
+import math
 import random
 import threading
 from queue import Queue
 import requests
+from requests.adapters import HTTPAdapter
 import time
 import json
+import os
+
+from bin.AdaptiveController import AdaptiveController
+from bin.CrawlCheckpoint import CrawlCheckpoint
+from bin.CrawlerMetrics import CrawlerMetrics
+from bin.CrawlScheduler import WorkStealingQueue, HostRateLimiter
+from bin.DedupIndex import DedupIndex
+from bin.JobWriter import JobWriter
+from bin.SegmentStore import SegmentStore
+
+# 需要重试的 HTTP 状态码（限流与服务端临时错误）
+TRANSIENT_STATUS = {429, 500, 502, 503, 504}
+
+
 # 数据获取模块
 class JobDataCollector:
-    def __init__(self, output_file='jobs_data.jsonl', city_code='736', max_workers=5):
+    # 职位搜索接口及请求头
+    API_URL = 'https://fe-api.zhaopin.com/c/i/search/positions'
+    HEADERS = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+
+    def __init__(self, output_file='jobs_data.jsonl', city_code='736', max_workers=5, base_url=None,
+                 max_retries=3, backoff_base=1.0, backoff_max=30.0, timeout=10, checkpoint_file=None,
+                 writer_batch_size=50, writer_buffer_size=1 << 20, fsync_interval=5.0, storage='jsonl',
+                 segment_records=5000, codec='auto', adaptive=None, host_rate=0, host_burst=None,
+                 metrics=None):
         """
         初始化数据采集器
 
         :param output_file: 输出文件名
         :param city_code: 城市代码(默认736)
         :param max_workers: 最大线程数
+        :param base_url: 职位搜索接口地址（默认 API_URL，测试时可指向本地桩服务）
+        :param max_retries: 超时、连接错误、429/5xx 等临时错误的最大重试次数
+        :param backoff_base: 指数退避基数（秒），第 n 次重试最多等待 backoff_base * 2^n 秒
+        :param backoff_max: 单次退避等待上限（秒）
+        :param timeout: 单次请求超时时间（秒）
+        :param checkpoint_file: 断点文件路径（默认为 输出文件名.checkpoint.json）
+        :param writer_batch_size: 写入线程每批最多合并的页数
+        :param writer_buffer_size: 输出文件写缓冲区大小（字节）
+        :param fsync_interval: 输出文件 fsync 间隔（秒）
+        :param storage: 输出格式 jsonl（单个 JSONL 文件）/ segments（output_file 为目录，写入压缩分段）
+        :param segment_records: segments 格式下每个分段的记录数
+        :param codec: segments 格式的压缩方式 gzip / zstd / auto
+        :param adaptive: 自适应并发配置（AdaptiveController 参数，另可含 enabled）；启用后按延迟和错误率
+                         动态调整并发数与请求间隔，取代固定的 1~3 秒随机等待，max_workers 作为默认并发上限
+        :param host_rate: 每个主机每秒请求数（所有线程共享的令牌桶），> 0 时同样取代固定的随机等待
+        :param host_burst: 按主机限速的令牌桶容量（允许的突发请求数）
+        :param metrics: 采集指标配置（CrawlerMetrics 参数：prom_file、http_port 等），不配置时只在内存中统计
         """
+        self.api_url = base_url or self.API_URL
+        self.controller = None
+        if adaptive and adaptive.get('enabled', True):
+            options = {key: value for key, value in adaptive.items() if key != 'enabled'}
+            options.setdefault('max_concurrency', max_workers)
+            self.controller = AdaptiveController(**options)
+        self.metrics = CrawlerMetrics(**(metrics or {}))
+        self.rate_limiter = HostRateLimiter(host_rate, host_burst) if host_rate > 0 else None
+        self.store = SegmentStore(output_file, segment_records, codec) if storage == 'segments' else None
+        self.writer_options = {
+            'batch_size': writer_batch_size,
+            'buffer_size': writer_buffer_size,
+            'fsync_interval': fsync_interval,
+        }
+        self.writer = None  # 采集期间的写入线程（JobWriter）
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self._local = threading.local()  # 每个工作线程各自持有一个长连接会话
+        self._sessions = []
         self.base_json_data = {
             'S_SOU_WORK_CITY': city_code,
             'order': 4,
@@ -22,33 +86,35 @@ class JobDataCollector:
             'eventScenario': 'pcSearchedSouSearch',
             'anonymous': 1,
         }
+        self.city_code = city_code
         self.output_file = output_file
-        self.existing_jobs = set()  # 用于去重的集合
+        self.existing_jobs = None  # 去重索引（DedupIndex），在 _init_output_file 中加载
         self.max_workers = max_workers
         self.lock = threading.Lock()  # 线程锁
-        self.job_queue = Queue()  # 职位队列
+        self.job_queue = Queue()  # 任务队列：(城市, 职位, None) 为单元任务，(城市, 职位, 页码) 为单页任务
         self.page_queue = Queue()  # 页码队列
+        self.title_state = {}  # 已拆分为单页任务的 (城市, 职位) 单元 -> 待完成页数、已爬页数/条数、是否有页失败
         self._init_output_file()
+        self.checkpoint = CrawlCheckpoint(checkpoint_file or f"{output_file}.checkpoint.json", legacy_city=city_code)
         self.stats = {
             'total_jobs': 0,
             'success_jobs': 0,
             'failed_jobs': 0,
+            'requests': 0,  # 请求次数（含重试）
+            'retries': 0,  # 重试次数
+            'failed_requests': 0,  # 失败的请求次数
+            'latency_total': 0.0,  # 请求总耗时（秒）
+            'latency_max': 0.0,  # 最长单次请求耗时（秒）
             'start_time': time.time()
         }
 
     def _init_output_file(self):
-        """初始化输出文件"""
-        try:
-            # 尝试读取已有数据建立去重集合
-            with open(self.output_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    job = json.loads(line.strip())
-                    job_key = (job["职位名称"], job["公司名称"])
-                    self.existing_jobs.add(job_key)
-        except FileNotFoundError:
+        """初始化输出文件，并加载持久化的去重索引（无需重新解析已有数据）"""
+        if self.store is None and not os.path.exists(self.output_file):
             # 文件不存在则创建
             with open(self.output_file, 'w', encoding='utf-8') as f:
                 pass
+        self.existing_jobs = DedupIndex(self.output_file, store=self.store)
 
     def _extract_job_info(self, job_item, title):
         """提取职位信息并添加搜索职位字段"""
@@ -84,126 +150,445 @@ class JobDataCollector:
         }
         return job_info
 
-    def _save_unique_jobs(self, job_infos):
-        """线程安全的存储去重后的职位数据"""
+    def _save_unique_jobs(self, job_infos, on_written=None):
+        """
+        存储去重后的职位数据：采集期间交给写入线程（不阻塞），否则直接写入
+        :param job_infos: 职位信息列表
+        :param on_written: 数据写入后调用的回调，参数为实际写入（去重后）的条数
+        """
+        if self.writer is not None:
+            self.writer.submit(job_infos, on_written)
+            return
+        written = 0
         with self.lock:
-            with open(self.output_file, 'a', encoding='utf-8') as f:
+            with (self.store.writer() if self.store else open(self.output_file, 'a', encoding='utf-8')) as f:
                 for job in job_infos:
                     job_key = (job["职位名称"], job["公司名称"])
                     if job_key not in self.existing_jobs:
                         self.existing_jobs.add(job_key)
                         f.write(json.dumps(job, ensure_ascii=False) + '\n')
                         self.stats['success_jobs'] += 1
+                        written += 1
+        self.metrics.observe_written(len(job_infos), written)
+        if on_written:
+            on_written(written)
+
+    def _start_writer(self):
+        """启动写入线程"""
+        self.writer = JobWriter(self.output_file, self.existing_jobs, self.stats, self.lock, store=self.store,
+                                metrics=self.metrics, **self.writer_options)
+        self.writer.start()
+
+    def _stop_writer(self):
+        """
+        写完剩余数据后结束写入线程
+        :return: 是否全部写入成功
+        """
+        writer, self.writer = self.writer, None
+        try:
+            writer.close()
+            return True
+        except Exception as e:
+            print(f"写入线程异常，部分数据未写入: {str(e)}")
+            return False
 
-    def _fetch_page(self, title, page):
-        """获取单页数据"""
+    def _page_payload(self, city, title, page):
+        """构造单页请求参数"""
         json_data = self.base_json_data.copy()
+        json_data['S_SOU_WORK_CITY'] = city
         json_data['S_SOU_FULL_INDEX'] = title
         json_data['pageIndex'] = page
+        return json_data
+
+    def _get_session(self):
+        """获取当前线程的会话（首次调用时创建），同一线程的请求复用 TCP/TLS 连接"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            session.headers.update(self.HEADERS)
+            self._local.session = session
+            with self.lock:
+                self._sessions.append(session)
+        return session
 
+    def _close_sessions(self):
+        """关闭所有线程创建的会话"""
+        with self.lock:
+            sessions, self._sessions = self._sessions, []
+        for session in sessions:
+            session.close()
+        self._local = threading.local()
+
+    @staticmethod
+    def _is_transient(error):
+        """判断请求异常是否为可重试的临时错误"""
+        if isinstance(error, (requests.ConnectionError, requests.Timeout)):
+            return True
+        response = getattr(error, 'response', None)
+        return isinstance(error, requests.HTTPError) and response is not None \
+            and response.status_code in TRANSIENT_STATUS
+
+    def _backoff_delay(self, attempt, retry_after=None):
+        """
+        计算第 attempt 次重试前的等待时间：指数退避 + 全抖动，服务端给出 Retry-After 时优先使用
+        :param attempt: 已失败的次数（从 0 开始）
+        :param retry_after: 响应头中的 Retry-After（秒）
+        """
         try:
-            response = requests.post(
-                'https://fe-api.zhaopin.com/c/i/search/positions',
-                json=json_data,
-                headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                },
-                timeout=10
-            )
-            response.raise_for_status()
-            data = response.json()
-            items = data.get("data", {}).get("list", [])
-
-            if not items:
-                return None
-
-            job_infos = []
-            for item in items:
-                job_info = self._extract_job_info(item, title)
-                job_infos.append(job_info)
-
-            return job_infos
+            if retry_after is not None:
+                return min(float(retry_after), self.backoff_max)
+        except ValueError:
+            pass
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
 
-        except Exception as e:
-            print(f"请求异常（{title} 第 {page} 页）：{str(e)}")
+    def _record_request(self, latency, failed=False, retried=False, nbytes=0):
+        """记录单次请求的耗时、结果及响应字节数"""
+        self.metrics.observe_request(latency, nbytes, failed, retried)
+        with self.lock:
+            self.stats['requests'] += 1
+            self.stats['latency_total'] += latency
+            self.stats['latency_max'] = max(self.stats['latency_max'], latency)
+            if failed:
+                self.stats['failed_requests'] += 1
+            if retried:
+                self.stats['retries'] += 1
+
+    def _post_with_retry(self, city, title, page):
+        """
+        请求单页数据，临时错误按指数退避重试
+        :return: 响应 JSON
+        :raises requests.RequestException: 非临时错误，或重试次数用尽
+        """
+        for attempt in range(self.max_retries + 1):
+            # 先按主机取得令牌再占用并发名额，限速等待期间不占用
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(self.api_url)
+            if self.controller is not None:
+                self.controller.acquire()
+            error = None
+            start = time.perf_counter()
+            try:
+                response = self._get_session().post(self.api_url, json=self._page_payload(city, title, page),
+                                                    timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+                nbytes = len(response.content)
+            except requests.RequestException as e:
+                error = e
+            finally:
+                latency = time.perf_counter() - start
+                # 先归还并发名额，退避等待期间不占用
+                if self.controller is not None:
+                    self.controller.release(latency, error is not None and self._is_transient(error))
+
+            if error is None:
+                self._record_request(latency, nbytes=nbytes)
+                return data
+            retry = self._is_transient(error) and attempt < self.max_retries
+            self._record_request(latency, failed=True, retried=retry)
+            if not retry:
+                raise error
+            response = getattr(error, 'response', None)
+            delay = self._backoff_delay(attempt, response.headers.get('Retry-After') if response is not None else None)
+            print(f"请求异常（{self._cell_key(city, title)} 第 {page} 页）：{str(error)}，{delay:.1f} 秒后重试"
+                  f"({attempt + 1}/{self.max_retries})")
+            time.sleep(delay)
+
+    def _total_pages(self, data):
+        """
+        从响应中读取职位总条数并换算为总页数
+        :return: 总页数；响应中没有总条数时返回 None
+        """
+        body = data.get("data") or {}
+        total = body.get("count") or body.get("numFound")
+        if not isinstance(total, int) or total <= 0:
             return None
+        return math.ceil(total / self.base_json_data['pageSize'])
 
-    def _process_job_title(self, title):
-        """处理单个职位名称的爬取任务"""
-        print(f"\n开始爬取职位: {title}")
+    def _parse_page(self, data, title):
+        """
+        解析单页响应
+        :return: (职位信息列表（该页没有数据时为 None）, 总页数（未知时为 None）)
+        """
+        items = data.get("data", {}).get("list", [])
+        if not items:
+            return None, self._total_pages(data)
+        return [self._extract_job_info(item, title) for item in items], self._total_pages(data)
+
+    def _fetch_page(self, city, title, page):
+        """
+        获取单页数据
+        :return: (职位信息列表, 总页数)；该页确实没有数据时列表为 None，响应中没有总条数时总页数为 None
+        :raises requests.RequestException: 请求失败（重试后仍失败），由调用方记为该单元爬取失败
+        """
+        try:
+            data = self._post_with_retry(city, title, page)
+        except requests.RequestException as e:
+            print(f"请求失败（{self._cell_key(city, title)} 第 {page} 页）：{str(e)}")
+            raise
+        return self._parse_page(data, title)
+
+    @staticmethod
+    def _cell_key(city, title):
+        """(城市, 职位) 单元的标识，用作断点和进度的键"""
+        return f"{city}:{title}"
+
+    def _throttle(self):
+        """没有自适应并发和按主机限速时，每页之间随机等待 1~3 秒控制爬取速度"""
+        if self.controller is None and self.rate_limiter is None:
+            time.sleep(random.uniform(1, 3))
+
+    def _mark_done(self, key):
+        """所有页面写入后再记录单元已爬完（经写入线程排队，保证在各页数据之后执行）"""
+        self.metrics.finish_cell(key)
+        self._save_unique_jobs([], on_written=lambda _: self.checkpoint.mark_done(key))
+
+    def _set_total_pages(self, key, total_pages):
+        """记录单元的总页数（断点和指标）"""
+        self.metrics.set_total_pages(key, total_pages)
+        self.checkpoint.set_total_pages(key, total_pages)
+
+    def _process_job_title(self, city, title, worker=None):
+        """
+        处理一个 (城市, 职位) 单元：请求第一页得到总页数后，把其余页拆成单页任务放入当前线程的任务队列，
+        空闲线程可从中窃取；响应中没有总条数时退回逐页顺序爬取
+        :param worker: 当前工作线程编号
+        """
+        key = self._cell_key(city, title)
+        progress = self.checkpoint.get(key)
+        if progress['done']:
+            print(f"\n{key} 已在上次运行中爬完（{len(progress['pages'])} 页，{progress['count']} 条），跳过")
+            return
+        total_pages = progress['total_pages']
+        if 1 in progress['pages'] and total_pages:
+            print(f"\n从断点继续爬取: {key}（已完成 {len(progress['pages'])}/{total_pages} 页）")
+        elif 1 in progress['pages']:
+            # 总页数未知，只能从第一个未完成的页继续顺序爬取
+            first_page = self._first_missing_page(progress['pages'])
+            print(f"\n从第 {first_page} 页继续爬取: {key}")
+            self._crawl_sequential(city, title, first_page, progress['count'], progress['pages'])
+            return
+        else:
+            print(f"\n开始爬取: {key}")
+            job_infos, total_pages = self._fetch_page(city, title, 1)
+            if not job_infos:
+                self._mark_done(key)
+                print(f"{key} 没有数据")
+                return
+            if total_pages:
+                self._set_total_pages(key, total_pages)
+            self.metrics.observe_page(key, len(job_infos))
+            self._save_unique_jobs(job_infos, on_written=lambda _, c=len(job_infos):
+                                   self.checkpoint.mark_page(key, 1, c))
+            print(f"正在爬取 {key} 第 1 页，获取 {len(job_infos)} 条，共 {total_pages or '未知'} 页")
+            progress['pages'].add(1)
+            progress['count'] += len(job_infos)
+            if not total_pages:
+                self._crawl_sequential(city, title, 2, progress['count'])
+                return
+
+        remaining = [page for page in range(2, total_pages + 1) if page not in progress['pages']]
+        if not remaining:
+            self._mark_done(key)
+            print(f"{key} 共爬取 {total_pages} 页，{progress['count']} 条数据")
+            return
+        with self.lock:
+            self.title_state[key] = {'pending': len(remaining), 'total_pages': total_pages,
+                                     'pages': len(progress['pages']), 'count': progress['count'],
+                                     'failed': False}
+        # 倒序放入，本线程从队列尾部取任务时按页码顺序爬取
+        for page in reversed(remaining):
+            self.job_queue.put((city, title, page), owner=worker)
+
+    @staticmethod
+    def _first_missing_page(pages):
+        """已完成页码集合之外最小的页码"""
         page = 1
-        total_count = 0
+        while page in pages:
+            page += 1
+        return page
 
+    def _crawl_sequential(self, city, title, page, total_count, done_pages=()):
+        """
+        从第 page 页开始逐页顺序爬取，直到遇到空页
+        :param done_pages: 上次运行中已完成的页码（跳过不再请求）
+        """
+        key = self._cell_key(city, title)
         while True:
-            job_infos = self._fetch_page(title, page)
+            if page in done_pages:
+                page += 1
+                continue
+            self._throttle()
+            job_infos, _ = self._fetch_page(city, title, page)
             if not job_infos:
-                print(f"职位 {title} 共爬取 {page - 1} 页，{total_count} 条数据")
+                self._mark_done(key)
+                print(f"{key} 共爬取 {page - 1} 页，{total_count} 条数据")
                 break
 
-            # 保存去重后的数据
-            self._save_unique_jobs(job_infos)
-
             current_count = len(job_infos)
             total_count += current_count
-            print(f"正在爬取 {title} 第 {page} 页，获取 {current_count} 条，累计 {total_count} 条")
-
+            self.metrics.observe_page(key, current_count)
+            # 保存去重后的数据，写入后再记录断点
+            self._save_unique_jobs(job_infos, on_written=lambda _, p=page, c=current_count:
+                                   self.checkpoint.mark_page(key, p, c))
+            print(f"正在爬取 {key} 第 {page} 页，获取 {current_count} 条，累计 {total_count} 条")
             page += 1
-            time.sleep(random.uniform(1, 3))  # 控制爬取速度
 
-    def _worker(self):
-        """工作线程函数"""
+    def _process_page(self, city, title, page):
+        """爬取拆分出的单页任务"""
+        key = self._cell_key(city, title)
+        self._throttle()
+        job_infos, _ = self._fetch_page(city, title, page)
+        # 空页（总条数在爬取期间减少）同样记为已完成
+        current_count = len(job_infos or [])
+        self.metrics.observe_page(key, current_count)
+        self._save_unique_jobs(job_infos or [], on_written=lambda _, p=page, c=current_count:
+                               self.checkpoint.mark_page(key, p, c))
+        with self.lock:
+            state = self.title_state[key]
+            state['pages'] += 1
+            state['count'] += current_count
+            total_count = state['count']
+        print(f"正在爬取 {key} 第 {page} 页，获取 {current_count} 条，累计 {total_count} 条")
+
+    def _finish_page(self, city, title, failed):
+        """单页任务结束：该单元的所有页都结束后统计结果，全部成功时记录单元已爬完"""
+        key = self._cell_key(city, title)
+        with self.lock:
+            state = self.title_state[key]
+            state['pending'] -= 1
+            state['failed'] = state['failed'] or failed
+            if state['pending']:
+                return
+            if state['failed']:
+                self.stats['failed_jobs'] += 1
+        if state['failed']:
+            self.metrics.finish_cell(key, failed=True)
+        else:
+            self._mark_done(key)
+        print(f"{key} 共爬取 {state['pages']}/{state['total_pages']} 页，{state['count']} 条数据")
+
+    def _worker(self, worker):
+        """
+        工作线程函数：任务为 (城市, 职位, None) 的单元任务或 (城市, 职位, 页码) 的单页任务
+        :param worker: 工作线程编号
+        """
         while True:
-            title = self.job_queue.get()
-            if title is None:  # 结束信号
+            task = self.job_queue.get(worker)
+            if task is None:  # 结束信号
                 self.job_queue.task_done()
                 break
 
+            city, title, page = task
+            if page is None:
+                try:
+                    self._process_job_title(city, title, worker)
+                except Exception as e:
+                    print(f"处理 {self._cell_key(city, title)} 时发生异常: {str(e)}")
+                    self.metrics.finish_cell(self._cell_key(city, title), failed=True)
+                    with self.lock:
+                        self.stats['failed_jobs'] += 1
+                finally:
+                    self.job_queue.task_done()
+                continue
+
+            failed = False
             try:
-                self._process_job_title(title)
+                self._process_page(city, title, page)
             except Exception as e:
-                print(f"处理职位 {title} 时发生异常: {str(e)}")
-                with self.lock:
-                    self.stats['failed_jobs'] += 1
+                # 请求失败的页不记入断点，重新运行时只补爬这些页
+                print(f"处理 {self._cell_key(city, title)} 第 {page} 页时发生异常: {str(e)}")
+                failed = True
             finally:
+                self._finish_page(city, title, failed)
                 self.job_queue.task_done()
 
-    def collect_jobs(self, job_titles):
+    def collect_jobs(self, job_titles, city_codes=None):
         """
-        多线程爬取职位数据
+        多线程爬取 城市 × 职位 的全部单元：所有单元共享一个工作线程池，
+        每个线程有自己的任务队列，空闲时从其他线程的队列窃取任务
 
         :param job_titles: 职位名称列表
+        :param city_codes: 城市代码列表（默认只爬取 city_code）
         """
         print("===== 开始爬取数据 =====")
-        self.stats['total_jobs'] = len(job_titles)
+        cells = [(str(city), title) for city in (city_codes or [self.city_code]) for title in job_titles]
+        self.stats['total_jobs'] = len(cells)
         self.stats['start_time'] = time.time()
+        failed_before = self.stats['failed_jobs']
+        self.metrics.reset()
+        self.metrics.start()
+        self._start_writer()
 
-        # 启动工作线程
+        # 启动工作线程（启用自适应并发时按并发上限启动，实际同时请求数由控制器限制）
+        workers = self.controller.max_concurrency if self.controller else self.max_workers
+        self.job_queue = WorkStealingQueue(workers)
         threads = []
-        for _ in range(self.max_workers):
-            t = threading.Thread(target=self._worker)
+        for worker in range(workers):
+            t = threading.Thread(target=self._worker, args=(worker,))
             t.start()
             threads.append(t)
 
-        # 添加任务到队列
-        for title in job_titles:
-            self.job_queue.put(title)
+        # 添加任务到队列（轮流分配到各线程）
+        for city, title in cells:
+            self.job_queue.put((city, title, None))
 
         # 等待所有任务完成
         self.job_queue.join()
 
         # 发送结束信号
-        for _ in range(self.max_workers):
-            self.job_queue.put(None)
+        for worker in range(workers):
+            self.job_queue.put(None, owner=worker)
 
         # 等待所有线程结束
         for t in threads:
             t.join()
+        self._close_sessions()
+        written = self._stop_writer()
+        self.existing_jobs.save()
+        self._finish_checkpoint(self.stats['failed_jobs'] - failed_before, written)
+        self.metrics.stop()
 
         # 打印统计信息
+        self._print_stats()
+
+    def _finish_checkpoint(self, failed, written=True):
+        """
+        整轮采集结束后处理断点：全部单元成功时删除断点文件，否则把日志合并进断点文件供下次继续
+        :param failed: 本轮失败的单元数
+        :param written: 数据是否全部写入成功
+        """
+        if failed or not written:
+            self.checkpoint.compact()
+        if failed:
+            print(f"{failed} 个单元爬取失败，断点已保存到 {self.checkpoint.checkpoint_file}，重新运行将从断点继续")
+        elif not written:
+            print(f"数据未全部写入，断点已保存到 {self.checkpoint.checkpoint_file}，重新运行将从断点继续")
+        else:
+            self.checkpoint.remove()
+
+    def _print_stats(self):
+        """打印爬取统计信息"""
         elapsed_time = time.time() - self.stats['start_time']
         print(f"\n所有任务完成！数据已保存到: {self.output_file}")
         print(f"统计信息:")
-        print(f"- 总职位数: {self.stats['total_jobs']}")
+        print(f"- 总单元数（城市 × 职位）: {self.stats['total_jobs']}")
         print(f"- 成功爬取: {self.stats['success_jobs']}")
         print(f"- 失败爬取: {self.stats['failed_jobs']}")
+        requests_count = self.stats['requests']
+        avg_latency = self.stats['latency_total'] / requests_count if requests_count else 0
+        print(f"- 请求次数: {requests_count}（重试 {self.stats['retries']} 次，失败 {self.stats['failed_requests']} 次）")
+        print(f"- 请求耗时: 平均 {avg_latency:.2f}秒，最长 {self.stats['latency_max']:.2f}秒")
+        metrics = self.metrics.snapshot()
+        print(f"- 吞吐量: {metrics['pages_per_sec']:.2f} 页/秒，{metrics['records_per_sec']:.1f} 条/秒，"
+              f"下载 {metrics['bytes_downloaded'] / 1024 / 1024:.1f} MB，去重命中率 {metrics['dedup_hit_rate']:.1%}")
+        if isinstance(self.job_queue, WorkStealingQueue):
+            print(f"- 任务窃取: {self.job_queue.steals} 次")
+        if self.controller is not None:
+            state = self.controller.snapshot()
+            print(f"- 自适应并发: 当前并发 {state['concurrency']}，请求间隔 {state['delay']:.2f}秒，"
+                  f"p95 {state['p95']:.2f}秒，错误率 {state['error_rate']:.1%}，共调整 {state['adjustments']} 次")
         print(f"- 耗时: {elapsed_time:.2f}秒")
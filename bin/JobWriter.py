@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+import time
+from queue import Queue, Empty
+
+_STOP = object()  # 结束信号
+
+
+# 职位数据写入线程
+class JobWriter(threading.Thread):
+    """
+    单写入线程：采集线程把每页结果放入队列后立即返回，由本线程批量去重、写入输出文件。
+    输出文件在整个采集期间保持打开（大缓冲区），每批写完 flush 到操作系统，
+    并按 fsync_interval 定期 fsync 落盘
+    """
+
+    def __init__(self, output_file, dedup_index, stats, stats_lock, batch_size=50,
+                 buffer_size=1 << 20, fsync_interval=5.0, store=None, metrics=None):
+        """
+        :param output_file: 输出文件（JSONL，追加写入）
+        :param dedup_index: 去重索引（只在本线程中访问）
+        :param stats: 采集统计字典，写入成功的条数累加到 stats['success_jobs']
+        :param stats_lock: 保护 stats 的锁
+        :param batch_size: 每批最多合并的页数
+        :param buffer_size: 文件写缓冲区大小（字节）
+        :param fsync_interval: fsync 间隔（秒），<= 0 表示每批都 fsync
+        :param store: 分段存储（SegmentStore）；给定时写入压缩分段而不是 output_file
+        :param metrics: 采集指标（CrawlerMetrics），记录去重前后的条数
+        """
+        super().__init__(name='JobWriter', daemon=True)
+        self.output_file = output_file
+        self.dedup_index = dedup_index
+        self.stats = stats
+        self.stats_lock = stats_lock
+        self.batch_size = batch_size
+        self.buffer_size = buffer_size
+        self.fsync_interval = fsync_interval
+        self.store = store
+        self.metrics = metrics
+        self.queue = Queue()
+        self.error = None  # 写入线程中发生的异常
+
+    def submit(self, job_infos, on_written=None):
+        """
+        提交一页职位数据（不阻塞）
+        :param job_infos: 职位信息列表
+        :param on_written: 该页写入并 flush 后在写入线程中调用的回调，参数为实际写入（去重后）的条数
+        """
+        self.queue.put((job_infos, on_written))
+
+    def close(self):
+        """写完队列中剩余数据后结束线程，写入出错时抛出异常"""
+        self.queue.put(_STOP)
+        self.join()
+        if self.error is not None:
+            raise self.error
+
+    def _write_jobs(self, f, job_infos):
+        """去重后写入一页数据，返回实际写入条数"""
+        written = 0
+        for job in job_infos:
+            job_key = (job["职位名称"], job["公司名称"])
+            if job_key not in self.dedup_index:
+                self.dedup_index.add(job_key)
+                f.write(json.dumps(job, ensure_ascii=False) + '\n')
+                written += 1
+        return written
+
+    def _next_batch(self, timeout):
+        """取出一批队列项：阻塞等待第一项，其余不等待"""
+        try:
+            batch = [self.queue.get(timeout=timeout)]
+        except Empty:
+            return []
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self.queue.get_nowait())
+            except Empty:
+                break
+        return batch
+
+    def _open_output(self):
+        """打开输出：分段存储的写入器，或以大缓冲区追加打开的 JSONL 文件"""
+        if self.store is not None:
+            return self.store.writer()
+        return open(self.output_file, 'a', encoding='utf-8', buffering=self.buffer_size)
+
+    @staticmethod
+    def _sync(f):
+        """将已 flush 的数据 fsync 落盘"""
+        if hasattr(f, 'sync'):
+            f.sync()
+        else:
+            os.fsync(f.fileno())
+
+    def run(self):
+        try:
+            with self._open_output() as f:
+                last_sync = time.monotonic()
+                dirty = False  # 上次 fsync 后是否有新写入
+                stop = False
+                while not stop:
+                    batch = self._next_batch(self.fsync_interval if self.fsync_interval > 0 else None)
+                    callbacks = []
+                    total = 0
+                    for entry in batch:
+                        if entry is _STOP:
+                            stop = True
+                            continue
+                        job_infos, on_written = entry
+                        written = self._write_jobs(f, job_infos)
+                        total += written
+                        if self.metrics is not None:
+                            self.metrics.observe_written(len(job_infos), written)
+                        if on_written:
+                            callbacks.append((on_written, written))
+                    f.flush()
+                    dirty = dirty or total > 0
+                    if dirty and (stop or time.monotonic() - last_sync >= self.fsync_interval):
+                        self._sync(f)
+                        last_sync = time.monotonic()
+                        dirty = False
+                    if total:
+                        with self.stats_lock:
+                            self.stats['success_jobs'] += total
+                    # 数据写入后再执行回调（如记录断点），保证断点不会超前于数据
+                    for on_written, written in callbacks:
+                        on_written(written)
+        except Exception as e:
+            print(f"职位数据写入失败: {str(e)}")
+            self.error = e
@@ -0,0 +1,442 @@
+import atexit
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+# 预设参数
+WORK_DAYS_PER_MONTH = 21.75  # 月平均工作日
+WORK_HOURS_PER_DAY = 8  # 每日工作时长
+
+# 薪资单位换算
+UNIT_MULTIPLIER = {'万': 10000, '千': 1000}
+
+# 规则中用到的正则表达式（模块加载时一次性编译）
+_HOURLY = re.compile(r'(\d+\.?\d*)元/小时')
+_HOUR_RANGE = re.compile(r'(\d+\.?\d*)-(\d+\.?\d*)元/时')
+_HOUR = re.compile(r'(\d+\.?\d*)元/时')
+_DAILY = re.compile(r'(\d+\.?\d*)元/天')
+_DAY_RANGE_SEARCH = re.compile(r'\d+-\d+元/天')
+_DAY_RANGE = re.compile(r'(\d+\.?\d*)-(\d+\.?\d*)元/天')
+_MONTH_ABOVE = re.compile(r'(\d+\.?\d*)(万|千)以上/月')
+_YEAR_ABOVE = re.compile(r'(\d+\.?\d*)(万|千)以上/年')
+_BONUS = re.compile(r'(\d+)薪')
+_YUAN_BONUS_SEARCH = re.compile(r'\d+-\d+元·\d+薪')
+_YUAN_RANGE_PREFIX = re.compile(r'(\d+)-(\d+)元')
+_MONTH_RANGE = re.compile(r'^([\d.]+)-([\d.]+)(万|千)/月')
+_YUAN_MONTH_RANGE_SEARCH = re.compile(r'\d+-\d+元/月')
+_YUAN_MONTH_RANGE = re.compile(r'(\d+)-(\d+)元/月')
+_YUAN_RANGE_SEARCH = re.compile(r'\d+-\d+元')
+_WAN_SEARCH = re.compile(r'\d+万')
+_WAN = re.compile(r'(\d+)万')
+_YUAN_SEARCH = re.compile(r'\d+元')
+_YUAN = re.compile(r'(\d+)元')
+_YUAN_LIMIT_SEARCH = re.compile(r'\d+元(以下|以上)')
+_YUAN_LIMIT = re.compile(r'(\d+)元(以下|以上)')
+_YEAR_RANGE = re.compile(r'^([\d.]+)-([\d.]+)(万|千)/年')
+_RANGE_NO_TIME = re.compile(r'^([\d.]+)-([\d.]+)(万|千)(?!/)')
+_K_RANGE = re.compile(r'^(\d+\.?\d*)-(\d+\.?\d*)K$')
+_DIFF_UNIT_RANGE = re.compile(r'^(\d+\.?\d*)(千)-(\d+\.?\d*)(万)$')
+_LIMIT = re.compile(r'^([\d.]+)(万|千)(以下|以上)/月')
+
+
+# 解析规则版本：修改规则时递增，已落盘的解析缓存随之失效
+RULES_VERSION = 1
+
+
+def _rules_fingerprint():
+    """
+    计算解析规则的指纹（规则版本 + 本模块源码的哈希），规则或换算参数有任何改动时都会变化
+    :return: 指纹字符串；读取不到源码时只使用规则版本
+    """
+    try:
+        with open(__file__, 'rb') as f:
+            digest = hashlib.sha1(f.read()).hexdigest()[:16]
+    except OSError:
+        return str(RULES_VERSION)
+    return f"{RULES_VERSION}-{digest}"
+
+
+# 缓存未命中标记（区分"未缓存"与"缓存结果为 None"）
+_MISSING = object()
+
+
+class SalaryCache:
+    """
+    有界 LRU 薪资解析缓存，键为去除首尾空白后的原始薪资字符串，
+    值为 (最低月薪, 最高月薪, 折算月薪) 三元组或 None
+
+    可选落盘：配置 cache_file 后启动时自动加载，进程退出时自动保存；
+    文件中记录解析规则版本，与当前版本不一致时整体丢弃，避免沿用旧规则的解析结果
+    """
+
+    def __init__(self, max_size=4096, cache_file=None, rules_version=None):
+        """
+        :param max_size: 最大缓存条目数
+        :param cache_file: 缓存持久化文件路径（JSON），为空则不落盘
+        :param rules_version: 解析规则版本，加载时与文件中记录的版本比对
+        """
+        self.max_size = max_size
+        self.rules_version = rules_version
+        self.cache_file = None
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self._atexit_registered = False
+        if cache_file:
+            self.configure(cache_file=cache_file)
+
+    def configure(self, max_size=None, cache_file=None):
+        """
+        调整缓存容量或持久化文件，设置文件后立即加载并在退出时保存
+        :param max_size: 最大缓存条目数
+        :param cache_file: 缓存持久化文件路径
+        """
+        if max_size:
+            self.max_size = max_size
+            self._evict()
+        if cache_file and cache_file != self.cache_file:
+            self.cache_file = cache_file
+            self.load()
+            if not self._atexit_registered:
+                atexit.register(self.save)
+                self._atexit_registered = True
+
+    def get(self, key):
+        """查询缓存，命中时将条目移到最近使用端；未命中返回 _MISSING"""
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return _MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """写入缓存，超出容量时淘汰最久未使用的条目"""
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def clear(self):
+        """清空缓存及统计"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """
+        获取缓存统计信息
+        :return: 包含命中数、未命中数、命中率及当前大小的字典
+        """
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'size': len(self._data),
+            'max_size': self.max_size,
+        }
+
+    def load(self):
+        """从持久化文件加载缓存，文件不存在、损坏或规则版本不一致时忽略"""
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"薪资缓存文件读取失败，忽略: {e}")
+            return
+        # 文件结构为 {"rules_version": 规则版本, "entries": {薪资字符串: 解析结果}}，旧版缓存没有版本，一并丢弃
+        if not isinstance(data, dict) or data.get('rules_version') != self.rules_version:
+            logging.info(f"薪资解析规则已变化，丢弃旧缓存: {self.cache_file}")
+            return
+        entries = data.get('entries') or {}
+        with self._lock:
+            for key, value in entries.items():
+                # JSON 中三元组保存为列表，其余格式（旧版缓存）直接丢弃
+                if value is None:
+                    self._data[key] = None
+                elif isinstance(value, list) and len(value) == 3:
+                    self._data[key] = tuple(value)
+            self._evict()
+        logging.info(f"已加载 {len(self._data)} 条薪资解析缓存: {self.cache_file}")
+
+    def save(self):
+        """将缓存写入持久化文件（先写临时文件再替换，避免写坏）"""
+        if not self.cache_file:
+            return
+        with self._lock:
+            entries = dict(self._data)
+        directory = os.path.dirname(self.cache_file)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_file = f"{self.cache_file}.tmp"
+        try:
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'rules_version': self.rules_version, 'entries': entries}, f, ensure_ascii=False)
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logging.warning(f"薪资缓存文件保存失败: {e}")
+
+
+class SalaryParser:
+    """
+    薪资解析引擎：将各种格式的薪资字符串转换为月薪数值
+
+    解析规则集中在 self.rules 分发表中，按优先级从高到低排列，每条规则为
+    (guard, pattern, convert) 三元组：
+        guard:   前置条件 callable(salary_str) -> bool，None 表示无条件
+        pattern: 预编译正则，对字符串执行 match，None 表示直接把字符串交给 convert
+        convert: 转换函数，接收 match 对象（或字符串），
+                 返回 (最低月薪, 最高月薪, 折算月薪) 或 None（继续尝试下一条规则）；
+                 "以上"/"以下" 这类单边薪资缺失的一端为 None
+
+    解析结果缓存在 self.cache（SalaryCache）中，跨调用复用
+    """
+
+    def __init__(self, cache_size=4096, cache_file=None):
+        """
+        :param cache_size: 解析缓存最大条目数
+        :param cache_file: 解析缓存持久化文件路径，为空则不落盘
+        """
+        self.cache = SalaryCache(cache_size, cache_file, rules_version=_rules_fingerprint())
+        hourly = WORK_HOURS_PER_DAY * WORK_DAYS_PER_MONTH
+        self.rules = [
+            # 1. 时薪（如"21元/小时"）
+            (lambda s: '元/小时' in s, _HOURLY,
+             lambda m: _point(round(float(m.group(1)) * WORK_HOURS_PER_DAY * WORK_DAYS_PER_MONTH, 2))),
+            # 时薪范围（如"10-25元/时"）
+            (lambda s: '元/时' in s and _HOUR_RANGE.search(s) is not None, _HOUR_RANGE,
+             lambda m: (float(m.group(1)) * hourly, float(m.group(2)) * hourly,
+                        round((float(m.group(1)) + float(m.group(2))) / 2
+                              * WORK_HOURS_PER_DAY * WORK_DAYS_PER_MONTH, 2))),
+            # 单个金额时薪（如"300元/时"）
+            (lambda s: '元/时' in s and _HOUR_RANGE.search(s) is None, _HOUR,
+             lambda m: _point(round(float(m.group(1)) * WORK_HOURS_PER_DAY * WORK_DAYS_PER_MONTH, 2))),
+            # 2. 日薪（如"200元/天"）
+            (lambda s: '元/天' in s, _DAILY,
+             lambda m: _point(float(m.group(1)) * WORK_DAYS_PER_MONTH)),
+            # 日薪范围（如"60-100元/天"）
+            (_DAY_RANGE_SEARCH.search, _DAY_RANGE,
+             lambda m: (float(m.group(1)) * WORK_DAYS_PER_MONTH, float(m.group(2)) * WORK_DAYS_PER_MONTH,
+                        (float(m.group(1)) + float(m.group(2))) / 2 * WORK_DAYS_PER_MONTH)),
+            # 3. 特殊月薪（如"10万以上/月"）
+            (lambda s: '以上/月' in s, _MONTH_ABOVE,
+             lambda m: _above(float(m.group(1)) * UNIT_MULTIPLIER[m.group(2)])),
+            # 特殊年薪（如"100万以上/年"）
+            (lambda s: '以上/年' in s, _YEAR_ABOVE,
+             lambda m: _above(float(m.group(1)) * UNIT_MULTIPLIER[m.group(2)] / 12)),
+            # 4. 带年终奖的复合格式（如"1.5-2.5万·13薪"）
+            (lambda s: '·' in s, None, self._parse_bonus),
+            # 带年终奖且单位为元的格式（如"8000-16000元·13薪"）
+            (_YUAN_BONUS_SEARCH.search, None, self._parse_yuan_bonus),
+            # 5. 带时间单位的范围薪资（如"1.1-1.8万/月"）
+            (None, _MONTH_RANGE, self._unit_range),
+            # 月薪范围（如"10000-15000元/月"）
+            (_YUAN_MONTH_RANGE_SEARCH.search, _YUAN_MONTH_RANGE, _yuan_range),
+            # 无时间单位且单位为元的薪资范围（如"6000-10000元"）
+            (_YUAN_RANGE_SEARCH.search, _YUAN_RANGE_PREFIX, _yuan_range),
+            # 固定金额，单位为"万"（如"1万"）
+            (_WAN_SEARCH.search, _WAN,
+             lambda m: _point(float(m.group(1)) * 10000)),
+            # 固定金额，单位为"元"（如"5000元"），与"万"互斥
+            (lambda s: _WAN_SEARCH.search(s) is None and _YUAN_SEARCH.search(s) is not None, _YUAN,
+             lambda m: _point(float(m.group(1)))),
+            # 带有上下限描述的固定金额（如"1000元以下"）
+            (_YUAN_LIMIT_SEARCH.search, _YUAN_LIMIT,
+             lambda m: _limit(float(m.group(1)), m.group(2))),
+            # 6. 按年计算的范围薪资（如"15-25万/年"）
+            (None, _YEAR_RANGE, self._year_range),
+            # 7. 无时间单位的范围薪资（如"1.5-3万"）
+            (None, _RANGE_NO_TIME, self._unit_range),
+            # 以K为单位的薪资范围（如"3-4K"）
+            (None, _K_RANGE,
+             lambda m: _range(float(m.group(1)) * 1000, float(m.group(2)) * 1000)),
+            # 不同单位的范围薪资（如"8千-1.6万"）
+            (None, _DIFF_UNIT_RANGE,
+             lambda m: _range(float(m.group(1)) * 1000, float(m.group(3)) * 10000)),
+            # 8. 上下限薪资（如"1.5千以下/月"）
+            (None, _LIMIT,
+             lambda m: _limit(float(m.group(1)) * UNIT_MULTIPLIER[m.group(2)], m.group(3))),
+        ]
+
+    @staticmethod
+    def _unit_range(match):
+        """(起始值, 结束值, 单位) 形式的月薪范围"""
+        lower, upper, unit = match.groups()
+        multiplier = UNIT_MULTIPLIER[unit]
+        return _range(float(lower) * multiplier, float(upper) * multiplier)
+
+    @staticmethod
+    def _year_range(match):
+        """
+        (起始值, 结束值, 单位) 形式的年薪范围，折算为月薪
+        最低/最高月薪为年薪上下限除以 12；折算月薪沿用旧版算法 (下限 + 上限) / 12（即年薪中值的两倍除以 12），
+        因此会大于最高月薪，两者不可互相推算
+        """
+        lower, upper, unit = match.groups()
+        multiplier = UNIT_MULTIPLIER[unit]
+        lower, upper = float(lower) * multiplier, float(upper) * multiplier
+        return lower / 12, upper / 12, (lower + upper) / 12
+
+    def _parse_bonus(self, salary_str):
+        """处理"主体薪资·N薪"格式，主体部分递归解析"""
+        parts = salary_str.split('·')
+        if len(parts) == 2 and '薪' in parts[1]:
+            main_salary = self._parse(parts[0])
+            if main_salary is not None:
+                if bonus_match := _BONUS.match(parts[1]):
+                    return _scale(main_salary, int(bonus_match.group(1)))
+        return None
+
+    def _parse_yuan_bonus(self, salary_str):
+        """处理"8000-16000元·13薪"格式"""
+        parts = salary_str.split('·')
+        if len(parts) == 2 and '薪' in parts[1]:
+            if match := _YUAN_RANGE_PREFIX.match(parts[0]):
+                if bonus_match := _BONUS.match(parts[1]):
+                    return _scale(_yuan_range(match), int(bonus_match.group(1)))
+        return None
+
+    def _parse(self, salary_str):
+        """按分发表顺序依次尝试规则，返回第一个成功的 (最低, 最高, 折算) 月薪三元组"""
+        for guard, pattern, convert in self.rules:
+            if guard is not None and not guard(salary_str):
+                continue
+            if pattern is None:
+                value = convert(salary_str)
+            else:
+                match = pattern.match(salary_str)
+                value = convert(match) if match else None
+            if value is not None:
+                return value
+        return None
+
+    def parse_range(self, salary_str):
+        """
+        解析薪资格式，得到月薪范围及折算月薪
+        :param salary_str: 薪资格式字符串
+        :return: (最低月薪, 最高月薪, 折算月薪) 或 None（无法解析时）；
+                 折算月薪与 parse() 的返回值一致（沿用旧版算法），通常位于最低与最高月薪之间，
+                 但年薪范围（如"15-25万/年"）的折算月薪为 (下限 + 上限) / 12，大于最高月薪
+        """
+        # 空值处理
+        if isinstance(salary_str, float) and math.isnan(salary_str):
+            return None
+        salary_str = str(salary_str).strip()
+        if salary_str == 'nan' or salary_str == "" or salary_str == "面议":
+            return None
+
+        value = self.cache.get(salary_str)
+        if value is not _MISSING:
+            return value
+
+        try:
+            value = self._parse(salary_str)
+        except ValueError:
+            # 形如"1..5万"的数值无法转换
+            value = None
+        if value is None:
+            logging.warning(f"无法识别的薪资格式: {salary_str}")
+        self.cache.put(salary_str, value)
+        return value
+
+    def parse(self, salary_str):
+        """
+        解析薪资格式，将各种格式的薪资转换为月薪数值
+        :param salary_str: 薪资格式字符串
+        :return: 月薪数值或 None（无法解析时）
+        """
+        value = self.parse_range(salary_str)
+        return None if value is None else value[2]
+
+    def parse_salaries(self, salaries):
+        """
+        批量解析薪资，相同的薪资字符串只解析一次
+        :param salaries: 薪资字符串的可迭代对象
+        :return: numpy float 数组，无法解析的位置为 NaN
+        """
+        memo = {}
+        values = []
+        for salary_str in salaries:
+            try:
+                value = memo[salary_str]
+            except KeyError:
+                value = self.parse(salary_str)
+                value = np.nan if value is None else value
+                memo[salary_str] = value
+            except TypeError:
+                # 不可哈希的输入不参与去重
+                value = self.parse(salary_str)
+                value = np.nan if value is None else value
+            values.append(value)
+        return np.array(values, dtype=float)
+
+
+def _point(value):
+    """固定金额：最低、最高及折算月薪相同"""
+    return value, value, value
+
+
+def _range(lower, upper):
+    """月薪范围：折算月薪取上下限平均值"""
+    return lower, upper, (lower + upper) / 2
+
+
+def _yuan_range(match):
+    """以元为单位的 (起始值, 结束值) 月薪范围"""
+    lower, upper = float(match.group(1)), float(match.group(2))
+    return lower, upper, (lower + upper) / 2
+
+
+def _above(value):
+    """"以上"薪资：只有下限"""
+    return value, None, value
+
+
+def _limit(value, direction):
+    """带"以下"/"以上"限定的薪资，折算月薪按 0.8 / 1.2 估值"""
+    if direction == '以下':
+        return None, value, value * 0.8
+    return value, None, value * 1.2
+
+
+def _scale(salary, months):
+    """按年终奖薪数（如13薪）将月薪三元组折算为平均月薪"""
+    return tuple(None if v is None else v * months / 12 for v in salary)
+
+
+# 模块级默认解析器
+default_parser = SalaryParser()
+
+
+def parse_salary(salary_str):
+    """使用默认解析器解析单个薪资字符串"""
+    return default_parser.parse(salary_str)
+
+
+def parse_salary_range(salary_str):
+    """使用默认解析器解析单个薪资字符串，返回 (最低月薪, 最高月薪, 折算月薪) 或 None"""
+    return default_parser.parse_range(salary_str)
+
+
+def parse_salaries(salaries):
+    """使用默认解析器批量解析薪资，返回 numpy float 数组（无法解析为 NaN）"""
+    return default_parser.parse_salaries(salaries)
@@ -0,0 +1,250 @@
+import gzip
+import io
+import json
+import os
+from bisect import bisect_right
+
+try:
+    import zstandard
+except ImportError:  # 未安装 zstandard 时使用 gzip 压缩
+    zstandard = None
+
+# 各压缩格式的分段文件扩展名
+SEGMENT_EXTENSIONS = {'gzip': '.jsonl.gz', 'zstd': '.jsonl.zst'}
+
+# 读取被截断的分段时可能出现的异常
+_TRUNCATED_ERRORS = (EOFError, OSError, ValueError) + ((zstandard.ZstdError,) if zstandard else ())
+
+
+class _SegmentFile:
+    """
+    新建的压缩分段：text 为文本写入流，raw 为底层文件。
+    text.flush() 时压缩数据同步刷新到底层文件，保证已写入部分可读
+    """
+
+    def __init__(self, full_path, codec):
+        self.raw = open(full_path, 'wb')
+        if codec == 'zstd':
+            compressed = zstandard.ZstdCompressor().stream_writer(self.raw, closefd=False)
+        else:
+            compressed = gzip.GzipFile(fileobj=self.raw, mode='wb')
+        self.text = io.TextIOWrapper(compressed, encoding='utf-8')
+
+    def close(self):
+        self.text.close()
+        self.raw.close()
+
+
+# 分段压缩存储
+class SegmentStore:
+    """
+    采集结果的分段压缩存储：一个目录下若干压缩 JSONL 分段（每段最多 segment_records 条），
+    index.json 记录每段的文件名、起始记录号、记录数和大小。
+    读取方可按记录号直接定位到分段，也可按分段跳过或并行读取
+    """
+
+    INDEX_FILE = 'index.json'
+
+    def __init__(self, path, segment_records=5000, codec='auto', recover=True):
+        """
+        :param path: 存储目录
+        :param segment_records: 每个分段最多记录数
+        :param codec: 压缩格式 gzip / zstd / auto（已安装 zstandard 时用 zstd，否则 gzip）
+        :param recover: 是否恢复未登记的分段（只读方应传 False，避免与写入方冲突）
+        """
+        if codec == 'auto':
+            codec = 'zstd' if zstandard is not None else 'gzip'
+        if codec not in SEGMENT_EXTENSIONS:
+            raise ValueError(f"不支持的压缩格式: {codec}")
+        if codec == 'zstd' and zstandard is None:
+            raise ImportError("zstd 压缩需要安装 zstandard：pip install zstandard")
+        self.path = path
+        self.segment_records = segment_records
+        self.codec = codec
+        os.makedirs(path, exist_ok=True)
+        self.segments = self._load_index()
+        if recover:
+            self._recover()
+
+    @classmethod
+    def is_store(cls, path):
+        """判断路径是否为分段存储目录"""
+        return os.path.isdir(path) and os.path.exists(os.path.join(path, cls.INDEX_FILE))
+
+    @property
+    def index_path(self):
+        return os.path.join(self.path, self.INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)['segments']
+        except FileNotFoundError:
+            return []
+
+    def _save_index(self):
+        """原子写入分段索引"""
+        tmp_file = f"{self.index_path}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({'segments': self.segments}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.index_path)
+
+    def _recover(self):
+        """
+        处理未登记到索引的分段（写入过程中异常退出留下的）：读出其中完整的行，
+        重新压缩为正常结束的分段并登记；没有完整数据的直接删除
+        """
+        listed = {segment['file'] for segment in self.segments}
+        for name in sorted(os.listdir(self.path)):
+            if not name.startswith('seg-') or name in listed or name.endswith('.tmp'):
+                continue
+            lines = self._read_partial(name)
+            if not lines:
+                os.remove(os.path.join(self.path, name))
+                continue
+            tmp_file = os.path.join(self.path, f"{name}.tmp")
+            codec = 'zstd' if name.endswith(SEGMENT_EXTENSIONS['zstd']) else 'gzip'
+            segment = _SegmentFile(tmp_file, codec)
+            segment.text.writelines(lines)
+            segment.close()
+            os.replace(tmp_file, os.path.join(self.path, name))
+            self._register(name, len(lines))
+            print(f"已恢复未完成的分段 {name}，共 {len(lines)} 条")
+        if not os.path.exists(self.index_path):
+            self._save_index()
+
+    def _read_partial(self, name):
+        """尽可能读出分段中完整的行（最后一行不完整或压缩流被截断时丢弃）"""
+        lines = []
+        try:
+            with self._open_read(name) as f:
+                for line in f:
+                    if not line.endswith('\n'):
+                        break
+                    lines.append(line)
+        except _TRUNCATED_ERRORS:
+            pass
+        return lines
+
+    def _open_read(self, name):
+        """以文本方式打开分段读取"""
+        full_path = os.path.join(self.path, name)
+        if name.endswith(SEGMENT_EXTENSIONS['zstd']):
+            if zstandard is None:
+                raise ImportError("读取 zstd 分段需要安装 zstandard：pip install zstandard")
+            return zstandard.open(full_path, 'rt', encoding='utf-8')
+        return gzip.open(full_path, 'rt', encoding='utf-8')
+
+    def _next_name(self):
+        """生成下一个分段文件名"""
+        numbers = [int(name[4:10]) for name in os.listdir(self.path)
+                   if name.startswith('seg-') and name[4:10].isdigit()]
+        return f"seg-{max(numbers, default=0) + 1:06d}{SEGMENT_EXTENSIONS[self.codec]}"
+
+    def _register(self, name, records):
+        """登记一个已写完的分段"""
+        self.segments.append({
+            'file': name,
+            'start': self.size(),
+            'records': records,
+            'bytes': os.path.getsize(os.path.join(self.path, name)),
+        })
+        self._save_index()
+
+    def size(self):
+        """已登记的记录总数"""
+        if not self.segments:
+            return 0
+        last = self.segments[-1]
+        return last['start'] + last['records']
+
+    def iter_lines(self, start=0):
+        """
+        从第 start 条记录开始按顺序产出 JSON 行，跳过 start 之前的整个分段
+        :param start: 起始记录号（从 0 开始）
+        """
+        starts = [segment['start'] for segment in self.segments]
+        first = max(bisect_right(starts, start) - 1, 0)
+        for segment in self.segments[first:]:
+            skip = max(start - segment['start'], 0)
+            yield from self.iter_segment(segment, skip)
+
+    def iter_segment(self, segment, skip=0):
+        """
+        产出单个分段中的 JSON 行（可供多进程按分段并行读取）
+        :param segment: self.segments 中的一项
+        :param skip: 跳过该分段开头的行数
+        """
+        with self._open_read(segment['file']) as f:
+            for i, line in enumerate(f):
+                if i >= skip:
+                    yield line.rstrip('\n')
+
+    def iter_records(self, start=0):
+        """从第 start 条记录开始产出解析后的记录"""
+        for line in self.iter_lines(start):
+            if line:
+                yield json.loads(line)
+
+    def writer(self):
+        """创建分段写入器（每次打开写入器从新分段开始）"""
+        return SegmentWriter(self)
+
+
+# 分段写入器
+class SegmentWriter:
+    """
+    按文件接口（write / flush / sync / close）写入分段存储，
+    当前分段写满 segment_records 条后关闭并登记，后续写入自动开启新分段
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._segment = None  # 当前分段（_SegmentFile）
+        self._name = None
+        self._records = 0
+
+    def _open_segment(self):
+        self._name = self.store._next_name()
+        self._segment = _SegmentFile(os.path.join(self.store.path, self._name), self.store.codec)
+        self._records = 0
+
+    def _finish_segment(self):
+        """关闭当前分段并登记到索引"""
+        self._segment.close()
+        self._segment = None
+        if self._records:
+            self.store._register(self._name, self._records)
+        else:
+            os.remove(os.path.join(self.store.path, self._name))
+
+    def write(self, text):
+        """写入一行或多行 JSON（须以换行结尾）"""
+        if self._segment is None:
+            self._open_segment()
+        self._segment.text.write(text)
+        self._records += text.count('\n')
+        if self._records >= self.store.segment_records:
+            self._finish_segment()
+
+    def flush(self):
+        """将已写入的数据压缩刷新到文件（已刷新部分在异常退出后可恢复）"""
+        if self._segment is not None:
+            self._segment.text.flush()
+            self._segment.raw.flush()
+
+    def sync(self):
+        """刷新并 fsync 当前分段"""
+        if self._segment is not None:
+            self.flush()
+            os.fsync(self._segment.raw.fileno())
+
+    def close(self):
+        if self._segment is not None:
+            self._finish_segment()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
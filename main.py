@@ -1,4 +1,5 @@
 import tkinter as tk
+from collections import Counter
 from bin.DataAnalyzer import DataAnalyzer
 from bin.DataAnalyzerApp import DataAnalyzerApp
 from bin.JobDataCollector import JobDataCollector
@@ -13,21 +14,57 @@ class RecruitmentAnalysis:
         self.config_loader = config_loader
         self.db_config = config_loader.db_config
         self.positions = config_loader.positions
+        self.city_codes = config_loader.collector_config.get('city_codes') or None
 
         # 配置日志
         self.logger = config_loader.setup_logging(__name__)
         self.logger.info("招聘数据分析系统初始化完成")
 
         # 初始化模块
-        self.collector = JobDataCollector(output_file='data/jobs_data.jsonl')
-        self.storage = DataStorage()
+        self.collector = self._create_collector(config_loader.collector_config)
+        self.storage = DataStorage(config_loader)
         self.analyzer = DataAnalyzer(config_loader)
 
+    @staticmethod
+    def _create_collector(collector_config):
+        """按配置创建数据采集器（thread: 多线程；async: asyncio + aiohttp）"""
+        output_file = collector_config.get('output_file', 'data/jobs_data.jsonl')
+        city_code = str(collector_config.get('city_code', '736'))
+        common_options = {
+            'timeout': collector_config.get('timeout', 10),
+            'max_retries': collector_config.get('max_retries', 3),
+            'backoff_base': collector_config.get('backoff_base', 1.0),
+            'backoff_max': collector_config.get('backoff_max', 30.0),
+            'writer_batch_size': collector_config.get('writer_batch_size', 50),
+            'writer_buffer_size': collector_config.get('writer_buffer_size', 1 << 20),
+            'fsync_interval': collector_config.get('fsync_interval', 5.0),
+            'storage': collector_config.get('storage', 'jsonl'),
+            'segment_records': collector_config.get('segment_records', 5000),
+            'codec': collector_config.get('codec', 'auto'),
+            'metrics': collector_config.get('metrics'),
+        }
+        if collector_config.get('engine', 'thread') == 'async':
+            from bin.AsyncJobDataCollector import AsyncJobDataCollector
+            return AsyncJobDataCollector(
+                output_file=output_file,
+                city_code=city_code,
+                concurrency=collector_config.get('concurrency', 8),
+                rate=collector_config.get('rate', 2.0),
+                burst=collector_config.get('burst'),
+                prefetch_pages=collector_config.get('prefetch_pages', 2),
+                **common_options
+            )
+        return JobDataCollector(output_file=output_file, city_code=city_code,
+                                max_workers=collector_config.get('max_workers', 5),
+                                adaptive=collector_config.get('adaptive'),
+                                host_rate=collector_config.get('host_rate', 0),
+                                host_burst=collector_config.get('host_burst'), **common_options)
+
     def collect_data(self, refresh=False):
         """收集数据"""
         if refresh:
             self.logger.info(f"开始收集{self.positions}职位数据")
-            self.collector.collect_jobs(self.positions)
+            self.collector.collect_jobs(self.positions, self.city_codes)
             self.logger.info("数据收集完成")
         else:
             self.logger.info("使用已有数据，跳过收集步骤")
@@ -62,34 +99,30 @@ class RecruitmentAnalysis:
             except Exception as e:
                 self.logger.error(f"{year}年数据处理失败: {str(e)}")
 
-        # 综合分析多年数据
-        word_data = ""
+        # 综合分析多年数据（复用按年份缓存的数据快照，不再重复查询）
+        word_counts = Counter()
         salary_data = []
-        city_data = []
+        province_counts = Counter()
         for year in years:
             try:
-                field_data = self.analyzer.get_field_from_db(year)
-                word_data += field_data
-                salarys = self.analyzer.get_salary_data(year)
-                salary_data.extend(salarys)
-                data = self.analyzer.get_data_from_db(year)
-                # print(type(data))
-                processed_data = self.analyzer.process_data(data)
-                city_data.extend(processed_data)
-
-                # 绘制薪资分布图
+                snapshot = self.analyzer.get_year_snapshot(year)
+                word_counts.update(snapshot.word_counts)
+                salary_data.extend(snapshot.salaries)
+                for province, openings in snapshot.provinces:
+                    province_counts[province] += openings
             except Exception as e:
                 self.logger.error(f"获取{year}年数据失败: {str(e)}")
 
         # 生成综合图表
         try:
-            if word_data:
-                words = self.analyzer.perform_word_segmentation(word_data)
+            if word_counts:
+                words = self.analyzer.top_words(word_counts)
                 self.analyzer.generate_wordcloud(words, f"2022-2025_wordcloud.png")
             if salary_data:
                 self.analyzer.plot_salary_distribution(salary_data, year="2022-2025")
-            if city_data:
-                self.analyzer.generate_province_recruitment_map(city_data, year, f"result/heatmap/all.html")
+            if province_counts:
+                self.analyzer.generate_province_recruitment_map(list(province_counts.items()), year,
+                                                                f"result/heatmap/all.html")
             self.logger.info("数据分析完成")
         except Exception as e:
             self.logger.error(f"生成综合图表失败: {str(e)}")
@@ -123,4 +156,7 @@ if __name__ == "__main__":
     analyzer.analyze_data(perform_analysis=ANALYZE_DATA)
 
     # 启动图形界面
-    analyzer.run_gui()
\ No newline at end of file
+    try:
+        analyzer.run_gui()
+    finally:
+        config_loader.close_db_pool()
\ No newline at end of file
@@ -0,0 +1,133 @@
+"""
+职位采集基准测试（离线，不访问真实接口）
+
+启动本地桩服务（scripts/stub_search_api.py，独立进程，不计入采集器 CPU），
+让采集器对其完成一轮完整采集，报告每秒页数、每页 CPU 时间、请求/重试次数等
+
+用法（在项目根目录执行）:
+    # 对比不同线程数（每个职位 20 页，响应延迟 50ms，2% 的 503）
+    python scripts/benchmark_crawler.py --workers 1 4 8 --pages 20 --latency 0.05 --error-rate 0.02
+    # 异步采集器、多城市
+    python scripts/benchmark_crawler.py --engine async --workers 16 --cities 530 538
+    # 使用已启动的桩服务
+    python scripts/benchmark_crawler.py --url http://127.0.0.1:18080/
+"""
+import argparse
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from bin.JobDataCollector import JobDataCollector  # noqa: E402
+
+
+@contextlib.contextmanager
+def stub_server(args):
+    """以子进程启动桩服务，产出其地址"""
+    command = [sys.executable, os.path.join(ROOT, 'scripts', 'stub_search_api.py'), '--port', '0',
+               '--pages', str(args.pages), '--latency', str(args.latency), '--jitter', str(args.jitter),
+               '--error-rate', str(args.error_rate), '--throttle-rate', str(args.throttle_rate),
+               '--dup-rate', str(args.dup_rate)]
+    if args.responses:
+        command += ['--responses', args.responses]
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, text=True, encoding='utf-8')
+    try:
+        line = process.stdout.readline()  # 桩服务已启动: http://host:port/
+        if 'http://' not in line:
+            raise RuntimeError(f"桩服务启动失败: {line}")
+        yield line[line.index('http://'):].strip()
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def create_collector(args, workers, output_file):
+    """按参数创建采集器，base_url 指向桩服务"""
+    options = {
+        'output_file': output_file,
+        'base_url': args.base_url,
+        'timeout': args.timeout,
+        'max_retries': args.max_retries,
+        'backoff_base': args.backoff_base,
+        'storage': args.storage,
+    }
+    if args.engine == 'async':
+        from bin.AsyncJobDataCollector import AsyncJobDataCollector
+        return AsyncJobDataCollector(concurrency=workers, rate=args.host_rate, burst=args.host_rate, **options)
+    adaptive = {'enabled': True, 'max_concurrency': workers, 'initial_delay': 0.0} if args.adaptive else None
+    return JobDataCollector(max_workers=workers, adaptive=adaptive, host_rate=args.host_rate,
+                            host_burst=args.host_rate, **options)
+
+
+def run_once(args, workers, titles):
+    """完成一轮采集，返回指标"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_file = os.path.join(tmp_dir, 'jobs' if args.storage == 'segments' else 'jobs.jsonl')
+        output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with output:
+            collector = create_collector(args, workers, output_file)
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            collector.collect_jobs(titles, args.cities)
+            wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+        snapshot = collector.metrics.snapshot()
+        collector.existing_jobs.close()
+    pages = snapshot['pages']
+    return {
+        'wall': wall,
+        'cpu': cpu,
+        'pages': pages,
+        'records': snapshot['records_written'],
+        'requests': snapshot['requests'],
+        'retries': snapshot['retries'],
+        'failed': collector.stats['failed_jobs'],
+        'pages_per_sec': pages / wall if wall else 0.0,
+        'cpu_ms_per_page': cpu * 1000 / pages if pages else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="职位采集基准测试（本地桩服务）")
+    parser.add_argument("--engine", choices=["thread", "async"], default="thread")
+    parser.add_argument("--workers", type=int, nargs="+", default=[5],
+                        help="测试的线程数（async 模式为并发数）")
+    parser.add_argument("--titles", type=int, default=5, help="职位数")
+    parser.add_argument("--cities", nargs="+", default=["736"], help="城市代码列表")
+    parser.add_argument("--pages", type=int, default=10, help="每个职位的页数")
+    parser.add_argument("--latency", type=float, default=0.05, help="桩服务固定响应延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.02, help="桩服务随机附加延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="桩服务返回 503 的比例")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="桩服务返回 429 的比例")
+    parser.add_argument("--dup-rate", type=float, default=0.0, help="条目重复的比例")
+    parser.add_argument("--responses", help="录制的响应文件（JSONL），交给桩服务回放")
+    parser.add_argument("--url", help="使用已启动的桩服务，不再自动启动")
+    parser.add_argument("--host-rate", type=float, default=200.0,
+                        help="每秒请求数上限（thread 模式按主机限速，async 模式为令牌桶速率）")
+    parser.add_argument("--adaptive", action="store_true", help="thread 模式启用自适应并发")
+    parser.add_argument("--storage", choices=["jsonl", "segments"], default="jsonl")
+    parser.add_argument("--timeout", type=float, default=10)
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--backoff-base", type=float, default=0.1)
+    parser.add_argument("--verbose", action="store_true", help="输出采集器的逐页日志")
+    args = parser.parse_args()
+
+    titles = [f"基准职位{i + 1}" for i in range(args.titles)]
+    server = contextlib.nullcontext(args.url) if args.url else stub_server(args)
+    with server as base_url:
+        args.base_url = base_url
+        print(f"桩服务: {base_url}，{args.engine} 模式，{len(args.cities)} 个城市 × {len(titles)} 个职位，"
+              f"每个职位 {args.pages} 页")
+        for workers in args.workers:
+            result = run_once(args, workers, titles)
+            print(f"并发 {workers}: {result['pages']} 页 / {result['records']} 条，耗时 {result['wall']:.2f} 秒，"
+                  f"{result['pages_per_sec']:.1f} 页/秒，CPU {result['cpu_ms_per_page']:.2f} 毫秒/页，"
+                  f"请求 {result['requests']} 次（重试 {result['retries']} 次），失败单元 {result['failed']}")
+
+
+if __name__ == "__main__":
+    main()
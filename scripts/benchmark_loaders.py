@@ -0,0 +1,98 @@
+"""
+年份数据加载基准测试
+
+用法（在项目根目录执行）:
+    # 对比逐行 iterrows 处理与按列向量化处理的耗时（默认读取配置中的 2022 年数据文件）
+    python scripts/benchmark_loaders.py [CSV文件路径] [--repeat 3]
+    # 对比顺序解析与多进程并行解析全部配置数据文件的耗时（不写数据库）
+    python scripts/benchmark_loaders.py --all --workers 1 4 8
+"""
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bin.ConfigLoader import ConfigLoader  # noqa: E402
+from bin.DataStorage import DataStorage  # noqa: E402
+
+
+def load_2022_rowwise(storage, csv_file):
+    """旧版逐行处理逻辑（iterrows + 逐行 clean_text），作为对照基线"""
+    df = pd.read_csv(csv_file)
+    return [{
+        "job_title": str(row.get("岗位名称", "")),
+        "company_name": str(row.get("公司名称", "")),
+        "salary_range": str(row.get("薪资", "")),
+        "location": str(row.get("城市", "")),
+        "openings": "1",
+        "requirements": storage.clean_text(str(row.get('职位详情', '')) + str(row.get('基本要求', ''))),
+        "search_keyword": str(row.get("公司行业", "")),
+        "data_year": 2022
+    } for _, row in df.iterrows()]
+
+
+def best_of(func, repeat):
+    """执行 repeat 次，返回最短耗时及最后一次结果"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def benchmark_workers(storage, worker_counts, repeat):
+    """解析全部配置数据文件（不写数据库），对比不同解析进程数的耗时"""
+    sources = []
+    for year, path in storage.data_sources():
+        if os.path.exists(path):
+            sources.append((year, path))
+            print(f"{year}: {path}")
+        else:
+            print(f"{year}: {path}（不存在，跳过）")
+    baseline = None
+    for workers in worker_counts:
+        elapsed, count = best_of(
+            lambda: sum(1 for _ in storage.iter_all_records(workers=workers, sources=sources)), repeat)
+        baseline = baseline or elapsed
+        print(f"进程数 {workers}: {count} 条记录，耗时 {elapsed:.3f} 秒（相对首项 {baseline / elapsed:.1f}x）")
+
+
+def main():
+    config_loader = ConfigLoader()
+    parser = argparse.ArgumentParser(description="年份数据加载基准测试")
+    parser.add_argument("csv_file", nargs="?", default=config_loader.get_data_file(2022),
+                        help="2022 年格式的 CSV 文件路径")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数（取最快一次）")
+    parser.add_argument("--all", action="store_true", help="解析全部配置数据文件，对比不同进程数")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="--all 模式下测试的解析进程数")
+    args = parser.parse_args()
+
+    storage = DataStorage(config_loader)
+    if args.all:
+        benchmark_workers(storage, args.workers, args.repeat)
+        return
+
+    size_mb = os.path.getsize(args.csv_file) / 1024 / 1024
+    print(f"数据文件: {args.csv_file}（{size_mb:.1f} MB）")
+
+    rowwise_time, rowwise = best_of(lambda: load_2022_rowwise(storage, args.csv_file), args.repeat)
+    vector_time, vectorized = best_of(lambda: storage.load_and_process_2022_data(args.csv_file), args.repeat)
+
+    print(f"记录数: {len(vectorized)}")
+    print(f"逐行处理: {rowwise_time:.3f} 秒")
+    print(f"向量化处理: {vector_time:.3f} 秒")
+    print(f"加速比: {rowwise_time / vector_time:.1f}x")
+    consistent = rowwise == vectorized
+    print(f"结果一致: {consistent}")
+    if not consistent:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+职位搜索接口本地桩服务（离线测试与基准测试用）
+
+按 JobDataCollector 的请求格式（POST JSON：S_SOU_FULL_INDEX / S_SOU_WORK_CITY / pageIndex / pageSize）
+返回与 fe-api.zhaopin.com 相同结构的响应，可配置延迟、错误率和每个职位的页数。
+职位条目默认按固定格式合成；指定 --responses 时以录制的真实响应（每行一个完整响应 JSON）为模板回放
+
+用法（在项目根目录执行）:
+    python scripts/stub_search_api.py --port 18080 --pages 20 --latency 0.05 --error-rate 0.02
+    # 指定部分职位的页数，并回放录制的响应
+    python scripts/stub_search_api.py --title-pages 软件开发=80 测试工程师=5 --responses data/recorded.jsonl
+采集器的 base_url 指向 http://127.0.0.1:18080/ 即可
+"""
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def _seed(*parts):
+    """由请求参数得到稳定的随机种子（同一页每次返回相同数据）"""
+    return zlib.crc32('\x1f'.join(str(part) for part in parts).encode('utf-8'))
+
+
+def synthetic_item(city, title, page, index, rng, dup_rate):
+    """
+    合成一条职位条目（字段与真实接口一致）
+    :param dup_rate: 条目与其他页重复（相同职位名称和公司）的比例，用于产生去重命中
+    """
+    if rng.random() < dup_rate:
+        key = f"{title}-重复-{rng.randrange(50)}"
+    else:
+        key = f"{city}-{title}-{page}-{index}"
+    return {
+        "name": f"{title}（{key}）",
+        "companyName": f"公司{zlib.crc32(key.encode('utf-8')) % 100000}",
+        "salary60": f"{rng.randrange(5, 30)}千-{rng.randrange(30, 60)}千",
+        "workCity": city,
+        "cityDistrict": "海淀区",
+        "streetName": "中关村",
+        "workingExp": rng.choice(["经验不限", "1-3年", "3-5年", "5-10年"]),
+        "education": rng.choice(["大专", "本科", "硕士"]),
+        "recruitNumber": rng.randrange(1, 10),
+        "subJobTypeLevelName": title,
+        "propertyName": rng.choice(["民营", "国企", "外商独资"]),
+        "companySize": rng.choice(["20-99人", "100-299人", "1000-9999人"]),
+        "industryName": "计算机软件",
+        "welfareTagList": ["五险一金", "带薪年假"],
+        "skillLabel": [{"value": "Python"}, {"value": "Linux"}],
+        "jobSummary": "负责相关系统的设计、开发与维护。\n熟悉常用开发工具，具备良好的沟通能力。",
+        "jobSkillTags": [{"name": "软件开发"}],
+        "publishTime": "2025-05-20 10:00:00",
+        "positionUrl": f"http://jobs.example.com/{key}.htm",
+        "companyUrl": "http://company.example.com/",
+        "subways": [{"lineName": "4号线", "stationName": "中关村", "distance": 500}],
+        "industryCompanyTags": [],
+    }
+
+
+class StubSearchAPI:
+    """桩服务的响应生成规则"""
+
+    def __init__(self, pages=10, title_pages=None, page_size=20, latency=0.0, jitter=0.0, error_rate=0.0,
+                 throttle_rate=0.0, dup_rate=0.0, responses=None, seed=0):
+        """
+        :param pages: 每个职位的默认页数
+        :param title_pages: {职位: 页数}
+        :param page_size: 每页条数
+        :param latency: 固定响应延迟（秒）
+        :param jitter: 在固定延迟上叠加的随机延迟上限（秒）
+        :param error_rate: 返回 503 的比例
+        :param throttle_rate: 返回 429（带 Retry-After）的比例
+        :param dup_rate: 条目重复的比例
+        :param responses: 录制的响应列表，以其中的条目为模板回放
+        :param seed: 随机种子
+        """
+        self.pages = pages
+        self.title_pages = title_pages or {}
+        self.page_size = page_size
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.dup_rate = dup_rate
+        self.templates = [item for response in responses or [] for item in response.get("data", {}).get("list", [])]
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.stats = {'requests': 0, 'errors': 0, 'throttled': 0}
+        self._rng = random.Random(seed)  # 延迟与错误注入
+
+    def _items(self, city, title, page):
+        rng = random.Random(_seed(self.seed, city, title, page))
+        if not self.templates:
+            return [synthetic_item(city, title, page, i, rng, self.dup_rate) for i in range(self.page_size)]
+        items = []
+        for i in range(self.page_size):
+            item = dict(self.templates[rng.randrange(len(self.templates))])
+            if rng.random() >= self.dup_rate:
+                # 改写名称使不同页的条目互不重复
+                item["name"] = f"{item.get('name', title)}（{city}-{title}-{page}-{i}）"
+            items.append(item)
+        return items
+
+    def handle(self, payload):
+        """
+        处理一次搜索请求
+        :return: (HTTP 状态码, 响应体, 额外响应头)
+        """
+        with self.lock:
+            self.stats['requests'] += 1
+            roll = self._rng.random()
+            delay = self.latency + self._rng.uniform(0, self.jitter)
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.throttle_rate:
+            with self.lock:
+                self.stats['throttled'] += 1
+            return 429, {"code": 429, "message": "too many requests"}, {'Retry-After': '1'}
+        if roll < self.throttle_rate + self.error_rate:
+            with self.lock:
+                self.stats['errors'] += 1
+            return 503, {"code": 503, "message": "service unavailable"}, {}
+
+        title = payload.get('S_SOU_FULL_INDEX', '')
+        city = str(payload.get('S_SOU_WORK_CITY', ''))
+        page = int(payload.get('pageIndex', 1))
+        pages = self.title_pages.get(title, self.pages)
+        items = self._items(city, title, page) if 1 <= page <= pages else []
+        total = pages * self.page_size
+        return 200, {"code": 200, "data": {"count": total, "numFound": total, "list": items}}, {}
+
+
+def make_server(api, host='127.0.0.1', port=18080):
+    """创建桩服务（port 为 0 时随机分配端口）"""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'  # 支持长连接，与真实接口一致
+
+        def do_POST(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            try:
+                payload = json.loads(self.rfile.read(length) or b'{}')
+            except ValueError:
+                self.send_error(400)
+                return
+            status, body, headers = api.handle(payload)
+            data = json.dumps(body, ensure_ascii=False).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass  # 不输出访问日志
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
+
+
+def load_responses(path):
+    """读取录制的响应（JSONL，每行一个完整响应）"""
+    responses = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                responses.append(json.loads(line))
+    return responses
+
+
+def parse_title_pages(values):
+    """解析 职位=页数 形式的参数"""
+    title_pages = {}
+    for value in values or []:
+        title, _, pages = value.rpartition('=')
+        title_pages[title] = int(pages)
+    return title_pages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="职位搜索接口本地桩服务")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=18080)
+    parser.add_argument("--pages", type=int, default=10, help="每个职位的默认页数")
+    parser.add_argument("--title-pages", nargs="*", help="指定职位页数，格式 职位=页数")
+    parser.add_argument("--page-size", type=int, default=20, help="每页条数")
+    parser.add_argument("--latency", type=float, default=0.0, help="固定响应延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="随机附加延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回 503 的比例")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="返回 429 的比例")
+    parser.add_argument("--dup-rate", type=float, default=0.0, help="条目重复的比例")
+    parser.add_argument("--responses", help="录制的响应文件（JSONL），以其中条目为模板回放")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    api = StubSearchAPI(pages=args.pages, title_pages=parse_title_pages(args.title_pages),
+                        page_size=args.page_size, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, throttle_rate=args.throttle_rate, dup_rate=args.dup_rate,
+                        responses=load_responses(args.responses) if args.responses else None, seed=args.seed)
+    server = make_server(api, args.host, args.port)
+    print(f"桩服务已启动: http://{args.host}:{server.server_port}/", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"请求统计: {api.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,25 @@
-import pandas as pd
+"""
+将 城市映射.csv 及 config.yaml 中 city_resolver.overrides 的映射写入数据库 city_mapping 表
+
+分析和入库已直接使用 bin/CityResolver.py 解析省份（不再依赖该表），此脚本仅供需要在 SQL 中关联映射的场景使用。
+被截断的名称（如 "哈尔"、"石家"）由 CityResolver 按前缀自动识别，无需再手工补充。
+
+用法（在项目根目录执行）:
+    python scripts/城市映射.py
+"""
+import os
+import sys
+
 import pymysql
-from bin.ConfigLoader import ConfigLoader  # 导入配置加载器
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bin.ConfigLoader import ConfigLoader  # noqa: E402  导入配置加载器
 
 # 加载配置
 config_loader = ConfigLoader()
 db_config = config_loader.db_config
+resolver = config_loader.get_city_resolver()
 
 # 创建数据库连接
 connection = pymysql.connect(
@@ -15,77 +30,6 @@ connection = pymysql.connect(
     charset=db_config['charset']
 )
 
-# 手动定义未正确映射的数据到省份的映射关系
-unmapped_mapping = {
-    "潜江": "湖北省",
-    "海宁": "浙江省",
-    "襄阳": "湖北省",
-    "澄迈": "海南省",
-    "昆山": "江苏省",
-    "仙桃": "湖北省",
-    "张家港": "江苏省",
-    "常熟": "江苏省",
-    "太仓": "江苏省",
-    "呼和": "内蒙古自治区",
-    "哈尔": "黑龙江省",
-    "石家": "河北省",
-    "连云": "江苏省",
-    "乌鲁": "新疆维吾尔自治区",
-    "驻马": "河南省",
-    "乐东黎族自治县": "海南省",
-    "陵水黎族自治县": "海南省",
-    "马鞍": "安徽省",
-    "秦皇": "河北省",
-    "齐齐": "黑龙江省",
-    "昌吉": "新疆维吾尔自治区",
-    "文昌": "海南省",
-    "日喀则": "西藏自治区",
-    "阿克苏": "新疆维吾尔自治区",
-    "西双版纳": "云南省",
-    "阿勒泰": "新疆维吾尔自治区",
-    "巴音郭楞": "新疆维吾尔自治区",
-    "济源市": "河南省",
-    "大理": "云南省",
-    "万宁": "海南省",
-    "哈密": "新疆维吾尔自治区",
-    "五家渠市": "新疆维吾尔自治区",
-    "阿坝": "四川省",
-    "林芝": "西藏自治区",
-    "琼海": "海南省",
-    "儋州": "海南省",
-    "和田": "新疆维吾尔自治区",
-    "凉山": "四川省",
-    "黔南": "贵州省",
-    "黔东南": "贵州省",
-    "海西": "青海省",
-    "德宏": "云南省",
-    "延边": "吉林省",
-    "怒江": "云南省",
-    "克孜勒苏柯尔克孜": "新疆维吾尔自治区",
-    "甘孜": "四川省",
-    "鄂尔": "内蒙古自治区",
-    "昌都": "西藏自治区",
-    "红河": "云南省",
-    "平顶": "河南省",
-    "临夏": "甘肃省",
-    "克拉": "新疆维吾尔自治区",
-    "昌吉": "新疆维吾尔自治区",
-    "昌江": "海南省",
-    "毕节": "贵州省",
-    "琼海": "海南省",
-    "儋州": "海南省",
-    "和田": "新疆维吾尔自治区",
-    "阿克苏": "新疆维吾尔自治区",
-    "阿勒泰": "新疆维吾尔自治区",
-    "巴音郭楞": "新疆维吾尔自治区",
-    "大理": "云南省",
-    "万宁": "海南省",
-    "哈密": "新疆维吾尔自治区",
-    "五家渠市": "新疆维吾尔自治区",
-    "阿坝": "四川省",
-    "林芝": "西藏自治区"
-}
-
 try:
     with connection.cursor() as cursor:
         # 创建 city_mapping 表
@@ -96,37 +40,21 @@ try:
         )
         """
         cursor.execute(create_table_sql)
+        cursor.execute("DELETE FROM city_mapping")
 
-        # 使用 pandas 读取 CSV 文件
-        df = pd.read_csv('城市映射.csv', header=None)
-
-        # 处理数据，假设数据格式为 'short_name: full_name'
-        df[['short_name', 'full_name']] = df[0].str.split(':', expand=True)
-        df['short_name'] = df['short_name'].str.strip()
-        df['full_name'] = df['full_name'].str.strip()
-
-        # 去除市
-        df['short_name'] = df['short_name'].str.replace('市', '')
-
-        # 额外添加数据
-        extra_data = [(key, value) for key, value in unmapped_mapping.items()]
-        for short_name, full_name in extra_data:
-            insert_sql = "INSERT INTO city_mapping (short_name, full_name) VALUES (%s, %s)"
-            cursor.execute(insert_sql, (short_name, full_name))
-
-        # 逐行插入数据到数据库
-        for index, row in df.iterrows():
-            insert_sql = "INSERT INTO city_mapping (short_name, full_name) VALUES (%s, %s)"
-            cursor.execute(insert_sql, (row['short_name'], row['full_name']))
+        # 简称（去掉"市"）与全称都写入，一条语句批量插入
+        rows = {}
+        for name, province in resolver.entries.items():
+            rows.setdefault(name.replace('市', '') or name, province)
+            rows.setdefault(name, province)
+        cursor.executemany("INSERT INTO city_mapping (short_name, full_name) VALUES (%s, %s)", list(rows.items()))
 
     # 提交事务
     connection.commit()
-    print("表创建成功，数据插入成功")
-except FileNotFoundError:
-    print("CSV 文件未找到")
+    print(f"表创建成功，写入 {len(rows)} 条映射")
 except Exception as e:
     print(f"发生错误: {e}")
     connection.rollback()
 finally:
     # 关闭连接
-    connection.close()
\ No newline at end of file
+    connection.close()
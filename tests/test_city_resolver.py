@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+from bin.CityResolver import CityResolver, normalize_location
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAPPING_FILE = os.path.join(ROOT, 'scripts', '城市映射.csv')
+
+
+@pytest.fixture(scope='module')
+def resolver():
+    return CityResolver.from_file(MAPPING_FILE, overrides={'昆山': '江苏省', '襄阳': '湖北省'})
+
+
+@pytest.mark.parametrize('location, province', [
+    # 原始工作地点（城市-区县）
+    ('广州-天河区', '广东省'),
+    ('深圳-南山区', '广东省'),
+    ('杭州·西湖', '浙江省'),
+    ('成都-高新区', '四川省'),
+    ('哈尔滨·南岗', '黑龙江省'),
+    ('北京-海淀区', '北京市'),
+    ('延边-延吉', '吉林省'),
+    ('石家庄市长安区', '河北省'),
+    # 只有城市名
+    ('广州', '广东省'),
+    ('兴安', '内蒙古自治区'),
+    ('大理', '云南省'),
+    ('吉林', '吉林省'),
+    # 被截断的名称
+    ('哈尔', '黑龙江省'),
+    ('石家', '河北省'),
+    ('克孜勒苏柯尔克孜', '新疆维吾尔自治区'),
+    # 省份及其简称
+    ('海南', '海南省'),
+    ('广西', '广西壮族自治区'),
+    # overrides
+    ('昆山-花桥', '江苏省'),
+    ('襄阳·樊城', '湖北省'),
+])
+def test_resolve_raw_locations(resolver, location, province):
+    assert resolver.resolve(location) == province
+
+
+@pytest.mark.parametrize('location', ['全国', '其他', 'nan', '', None, '张家', '火星-基地'])
+def test_unresolvable_locations(resolver, location):
+    assert resolver.resolve(location) is None
+
+
+def test_resolve_many_and_cache(resolver):
+    before = resolver.stats()['hits']
+    assert resolver.resolve_many(['广州-天河区', '广州-天河区', '全国']) == ['广东省', '广东省', None]
+    assert resolver.stats()['hits'] >= before + 1
+
+
+def test_override_replaces_existing_name():
+    resolver = CityResolver({'测试市': '甲省'})
+    resolver.add('测试市', '乙省')
+    assert resolver.resolve('测试市-一区') == '乙省'
+    assert resolver.resolve('测试') == '乙省'
+
+
+def test_normalize_location():
+    assert normalize_location('北京-海淀区') == '北京'
+    assert normalize_location('上海·浦东') == '上海'
+    assert normalize_location('全国') is None
+    assert normalize_location('nan') is None
@@ -0,0 +1,84 @@
+import io
+
+import pandas as pd
+import pytest
+
+from bin.DataStorage import DataStorage
+from scripts.benchmark_loaders import load_2022_rowwise
+
+TEXT_FIELDS = ('job_title', 'company_name', 'salary_range', 'location', 'requirements', 'search_keyword')
+
+CSV_2022 = (
+    "岗位名称,公司名称,薪资,城市,职位详情,基本要求,公司行业\n"
+    "Java开发,甲公司,1-2万/月,广州,负责后端开发,本科,互联网\n"
+    "测试工程师,,,深圳,,三年经验,\n"
+    "运维,乙公司,8-10K,,熟悉Linux,,通信\n"
+)
+
+CSV_2023 = (
+    "名称,名称3,sal,d,关键词,int\n"
+    "Java开发,甲公司,1-1.5万,广州 天河,\"Java\nSpring\",计算机软件 互联网\n"
+    "测试工程师,,,,,\n"
+    ",乙公司,8千-1万,深圳,,通信\n"
+)
+
+CSV_2024 = (
+    "职业名称,公司名称,薪资,地址,资历,学历要求,职业简介,公司类型\n"
+    "Java开发,甲公司,15-25K·13薪,广州天河区,3-5年,本科,后端开发,民营\n"
+    "测试工程师,,,,,大专,,\n"
+)
+
+
+@pytest.fixture(scope='module')
+def storage():
+    return DataStorage.for_parsing({})
+
+
+def read_csv(text):
+    return pd.read_csv(io.StringIO(text))
+
+
+def assert_text_fields(records):
+    for record in records:
+        for field in TEXT_FIELDS:
+            assert isinstance(record[field], str), (field, record[field])
+
+
+def test_2022_frame_with_empty_cells(storage):
+    records = storage._process_2022_frame(read_csv(CSV_2022))
+    assert_text_fields(records)
+    # 与旧版 str(row.get(...)) 一致：空单元格转为 'nan'，拼接后的要求文本不丢失
+    assert records[1]['company_name'] == 'nan'
+    assert records[1]['requirements'] == 'nan三年经验'
+    assert records[2]['requirements'] == '熟悉Linuxnan'
+    assert records[0]['requirements'] == '负责后端开发本科'
+
+
+def test_2022_frame_matches_rowwise_baseline(storage, tmp_path):
+    csv_file = tmp_path / '2022.csv'
+    csv_file.write_text(CSV_2022, encoding='utf-8')
+    assert storage.load_and_process_2022_data(str(csv_file)) == load_2022_rowwise(storage, str(csv_file))
+
+
+def test_2023_frame_with_empty_cells(storage):
+    records = storage._process_2023_frame(read_csv(CSV_2023))
+    assert_text_fields(records)
+    assert records[0]['requirements'] == 'Java, Spring, 行业: 计算机软件'
+    assert records[0]['location'] == '广州'
+    assert records[1] == {
+        'job_title': '测试工程师', 'company_name': '', 'salary_range': '', 'location': '', 'openings': 1,
+        'requirements': '', 'search_keyword': '', 'data_year': 2023,
+    }
+    assert records[2]['job_title'] == ''
+    assert records[2]['requirements'] == ', 行业: 通信'
+
+
+def test_2024_frame_with_empty_cells(storage):
+    records = storage._process_2024_frame(read_csv(CSV_2024))
+    assert_text_fields(records)
+    assert records[0]['salary_range'] == '15-25K'
+    assert records[0]['location'] == '广州'
+    assert records[0]['requirements'] == '3-5年|本科|后端开发'
+    assert records[1]['company_name'] == ''
+    assert records[1]['salary_range'] == ''
+    assert records[1]['requirements'] == '|大专|'
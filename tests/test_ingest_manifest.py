@@ -0,0 +1,42 @@
+from bin.DataStorage import DataStorage
+from bin.IngestManifest import IngestManifest
+
+
+def test_rows_appended_during_ingest_are_not_marked_ingested(tmp_path):
+    data_file = tmp_path / 'jobs.jsonl'
+    data_file.write_text('{"a": 1}\n', encoding='utf-8')
+    manifest = IngestManifest(str(tmp_path / 'manifest.json'))
+
+    snapshot = manifest.snapshot(str(data_file))
+    # 入库过程中采集器继续追加
+    with open(data_file, 'a', encoding='utf-8') as f:
+        f.write('{"a": 2}\n')
+    manifest.record(str(data_file), snapshot, rows=1)
+    manifest.save()
+
+    reloaded = IngestManifest(manifest.manifest_file)
+    assert reloaded.entries[str(data_file)]['rows'] == 1
+    assert not reloaded.is_unchanged(str(data_file))
+
+
+def test_unchanged_file_is_skipped(tmp_path):
+    data_file = tmp_path / 'jobs.jsonl'
+    data_file.write_text('{"a": 1}\n', encoding='utf-8')
+    manifest = IngestManifest(str(tmp_path / 'manifest.json'))
+    manifest.record(str(data_file), manifest.snapshot(str(data_file)), rows=1)
+    assert manifest.is_unchanged(str(data_file))
+
+
+def test_missing_file_is_not_recorded(tmp_path):
+    manifest = IngestManifest(str(tmp_path / 'manifest.json'))
+    path = str(tmp_path / 'missing.jsonl')
+    manifest.record(path, manifest.snapshot(path))
+    assert path not in manifest.entries
+
+
+def test_store_resets_failed_batches():
+    storage = DataStorage.for_parsing({'insert_mode': 'infile'})
+    storage.failed_batches = 3  # 上一次写入遗留的失败批次
+    storage.load_infile = lambda data: len(data)
+    assert storage.store([{}, {}]) == 2
+    assert storage.failed_batches == 0
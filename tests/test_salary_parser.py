@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from bin.SalaryParser import SalaryParser
+
+# (薪资字符串, (最低月薪, 最高月薪, 折算月薪))，每类规则至少一条
+RANGE_CASES = [
+    # 时薪
+    ('21元/小时', (3654.0, 3654.0, 3654.0)),
+    ('10-25元/时', (1740.0, 4350.0, 3045.0)),
+    ('300元/时', (52200.0, 52200.0, 52200.0)),
+    # 日薪
+    ('200元/天', (4350.0, 4350.0, 4350.0)),
+    ('60-100元/天', (1305.0, 2175.0, 1740.0)),
+    # 以上
+    ('10万以上/月', (100000.0, None, 100000.0)),
+    ('100万以上/年', (83333.33, None, 83333.33)),
+    # 年终奖
+    ('1.5-2.5万·13薪', (16250.0, 27083.33, 21666.67)),
+    ('8000-16000元·13薪', (8666.67, 17333.33, 13000.0)),
+    ('15-25K·14薪', (17500.0, 29166.67, 23333.33)),
+    # 月薪范围
+    ('1.1-1.8万/月', (11000.0, 18000.0, 14500.0)),
+    ('10000-15000元/月', (10000.0, 15000.0, 12500.0)),
+    ('6000-10000元', (6000.0, 10000.0, 8000.0)),
+    # 固定金额（"1000元以下"先命中固定金额规则，与旧版一致）
+    ('1万', (10000.0, 10000.0, 10000.0)),
+    ('5000元', (5000.0, 5000.0, 5000.0)),
+    ('1000元以下', (1000.0, 1000.0, 1000.0)),
+    # 年薪范围：折算月薪沿用旧版 (下限 + 上限) / 12
+    ('15-25万/年', (12500.0, 20833.33, 33333.33)),
+    # 无时间单位的范围
+    ('1.5-3万', (15000.0, 30000.0, 22500.0)),
+    ('3-4K', (3000.0, 4000.0, 3500.0)),
+    ('8千-1.6万', (8000.0, 16000.0, 12000.0)),
+    # 上下限
+    ('1.5千以下/月', (None, 1500.0, 1200.0)),
+]
+
+UNPARSEABLE = ['面议', '', '  ', 'nan', float('nan'), None, '薪资待遇优厚', '1..5万/月']
+
+
+@pytest.fixture
+def parser():
+    return SalaryParser()
+
+
+def rounded(value):
+    return None if value is None else tuple(None if v is None else round(v, 2) for v in value)
+
+
+@pytest.mark.parametrize('salary, expected', RANGE_CASES)
+def test_parse_range(parser, salary, expected):
+    assert rounded(parser.parse_range(salary)) == expected
+
+
+@pytest.mark.parametrize('salary, expected', RANGE_CASES)
+def test_monthly_within_range(parser, salary, expected):
+    lower, upper, monthly = parser.parse_range(salary)
+    if salary.endswith('/年') and lower is not None and upper is not None:
+        # 年薪范围的折算月薪按旧版算法大于最高月薪（见 SalaryParser._year_range）
+        assert monthly > upper
+        return
+    assert lower is None or lower <= monthly
+    assert upper is None or monthly <= upper
+
+
+@pytest.mark.parametrize('salary', UNPARSEABLE)
+def test_parse_range_unparseable(parser, salary):
+    assert parser.parse_range(salary) is None
+
+
+# (薪资字符串, 折算月薪)：与旧版 DataAnalyzer.parse_salary 的结果一致，None 表示无法解析
+PARSE_CASES = [
+    # K 范围
+    ('3-4K', 3500.0),
+    ('15-25K', 20000.0),
+    # 万/千 范围
+    ('1.1-1.8万/月', 14500.0),
+    ('1.5-3万', 22500.0),
+    ('6-8千', 7000.0),
+    ('6-8千/月', 7000.0),
+    # 不同单位
+    ('8千-1.6万', 12000.0),
+    # 元
+    ('10000-15000元/月', 12500.0),
+    ('6000-10000元', 8000.0),
+    ('5000元', 5000.0),
+    ('1万', 10000.0),
+    # 年薪
+    ('15-25万/年', 400000 / 12),
+    ('100万以上/年', 1000000 / 12),
+    # 日薪/时薪
+    ('200元/天', 4350.0),
+    ('60-100元/天', 1740.0),
+    ('21元/小时', 3654.0),
+    ('10-25元/时', 3045.0),
+    # 年终奖、以上/以下
+    ('1.5-2.5万·13薪', 20000 * 13 / 12),
+    ('8000-16000元·13薪', 13000.0),
+    ('10万以上/月', 100000.0),
+    ('1.5千以下/月', 1200.0),
+] + [(salary, None) for salary in UNPARSEABLE]
+
+
+@pytest.mark.parametrize('salary, expected', PARSE_CASES)
+def test_parse(parser, salary, expected):
+    assert parser.parse(salary) == (None if expected is None else pytest.approx(expected))
+
+
+def test_parse_salaries(parser):
+    salaries = [salary for salary, _ in PARSE_CASES]
+    expected = [np.nan if value is None else value for _, value in PARSE_CASES]
+    result = parser.parse_salaries(salaries + salaries)  # 重复项走批内去重
+    np.testing.assert_allclose(result, expected + expected)
+
+
+def test_parse_salaries_empty(parser):
+    assert parser.parse_salaries([]).shape == (0,)